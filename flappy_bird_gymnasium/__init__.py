@@ -23,22 +23,33 @@
 # ==============================================================================
 
 """ Registers the gymnasium environments and exports the `gymnasium.make` function.
+
+The environment classes (and pygame) are only imported when first used, either
+through `gymnasium.make` or by accessing them as attributes of this package.
 """
 # Silencing pygame:
 import os
+from typing import TYPE_CHECKING
 
 # Registering environments:
 from gymnasium.envs.registration import register
 
-# Exporting envs:
-from flappy_bird_gymnasium.envs.flappy_bird_env_rgb import FlappyBirdEnvRGB
-from flappy_bird_gymnasium.envs.flappy_bird_env_simple import FlappyBirdEnvSimple
+from flappy_bird_gymnasium import envs
+
+if TYPE_CHECKING:
+    from flappy_bird_gymnasium.envs import (
+        FlappyBirdEnvRGB,
+        FlappyBirdEnvSimple,
+        FlappyBirdSharedMemoryVectorEnv,
+        FlappyBirdVectorEnv,
+    )
 
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "hide"
 
 register(
     id="FlappyBird-v0",
     entry_point="flappy_bird_gymnasium:FlappyBirdEnvSimple",
+    vector_entry_point="flappy_bird_gymnasium:FlappyBirdVectorEnv",
 )
 
 register(
@@ -46,8 +57,23 @@ register(
     entry_point="flappy_bird_gymnasium:FlappyBirdEnvRGB",
 )
 
+# `FlappyBird-rgb-v0`, vectorized by worker processes drawing into shared memory:
+register(
+    id="FlappyBird-rgb-shared-v0",
+    entry_point="flappy_bird_gymnasium:FlappyBirdEnvRGB",
+    vector_entry_point="flappy_bird_gymnasium:FlappyBirdSharedMemoryVectorEnv",
+)
+
 # Main names:
-__all__ = [
-    FlappyBirdEnvRGB.__name__,
-    FlappyBirdEnvSimple.__name__,
-]
+__all__ = list(envs.__all__)
+
+
+def __getattr__(name: str):
+    # Exporting envs:
+    if name in envs.__all__:
+        return getattr(envs, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
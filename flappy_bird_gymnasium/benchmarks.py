@@ -0,0 +1,378 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Benchmarks of the environments' throughput, latency and memory usage.
+
+The results are plain dictionaries, which can be saved as JSON and compared
+against the results of a previous run (a baseline) to detect performance
+regressions. The environments are benchmarked without the wrappers added by
+`gymnasium.make()` (their `unwrapped` versions), so only the code of this
+package is measured.
+"""
+
+import functools
+import json
+import platform
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import gymnasium
+import numpy as np
+
+#: Version of the format of the benchmarks' results.
+VERSION = 1
+
+#: Screen sizes of the environments benchmarked.
+SCREEN_SIZES = ((288, 512), (576, 1024))
+
+#: Numbers of sub-environments of the vector environments benchmarked.
+NUM_ENVS = (1, 16, 256, 1024)
+
+#: Default maximum relative slowdown (or memory increase) tolerated when
+#: comparing results against a baseline.
+TOLERANCE = 0.2
+
+# Probability of flapping in each step of the benchmarks:
+_FLAP_PROB = 0.09
+
+
+def _size_str(screen_size: Tuple[int, int]) -> str:
+    return f"{screen_size[0]}x{screen_size[1]}"
+
+
+def _describe(kwargs: Dict[str, Any]) -> str:
+    return " ".join(
+        f"{k}={_size_str(v) if k == 'screen_size' else v}" for k, v in kwargs.items()
+    )
+
+
+def _summarize(
+    name: str, latencies_ns: np.ndarray, items_per_call: int = 1
+) -> Dict[str, Any]:
+    """Summarizes the latencies (in nanoseconds) of a benchmark's calls."""
+    total_s = latencies_ns.sum() / 1e9
+    return {
+        "name": name,
+        "calls": len(latencies_ns),
+        "steps_per_sec": items_per_call * len(latencies_ns) / total_s,
+        "p50_us": float(np.percentile(latencies_ns, 50)) / 1e3,
+        "p99_us": float(np.percentile(latencies_ns, 99)) / 1e3,
+    }
+
+
+def _time_steps(
+    env: gymnasium.Env,
+    num_steps: int,
+    timed: Callable[[], Any],
+    seed: int = 0,
+) -> np.ndarray:
+    """Plays an environment with random actions, timing a call of `timed()`
+    after each step (or the step itself, if `timed` is `None`). The resets
+    aren't timed.
+    """
+    env.reset(seed=seed)
+    actions = (np.random.default_rng(seed).random(num_steps) < _FLAP_PROB).tolist()
+    latencies = np.empty(num_steps, dtype=np.int64)
+    for i, action in enumerate(actions):
+        if timed is None:
+            start = time.perf_counter_ns()
+            terminated = env.step(int(action))[2]
+            latencies[i] = time.perf_counter_ns() - start
+        else:
+            terminated = env.step(int(action))[2]
+            start = time.perf_counter_ns()
+            timed()
+            latencies[i] = time.perf_counter_ns() - start
+
+        if terminated:
+            env.reset()
+    return latencies
+
+
+def bench_step(env_id: str, num_steps: int, **kwargs) -> Dict[str, Any]:
+    """Benchmarks the steps of an environment."""
+    env = gymnasium.make(env_id, audio_on=False, **kwargs).unwrapped
+    latencies = _time_steps(env, num_steps, timed=None)
+    env.close()
+    return _summarize(f"step {env_id} {_describe(kwargs)}".strip(), latencies)
+
+
+def bench_game_logic(num_steps: int, **kwargs) -> Dict[str, Any]:
+    """Benchmarks the steps of the game's logic alone
+    (:meth:`.FlappyBirdLogic.update_state()`), without an environment.
+    """
+    from flappy_bird_gymnasium.envs.game_logic import FlappyBirdLogic
+
+    rng = np.random.default_rng(0)
+    actions = (rng.random(num_steps) < _FLAP_PROB).tolist()
+    game = FlappyBirdLogic(rng, **kwargs)
+    latencies = np.empty(num_steps, dtype=np.int64)
+    for i, action in enumerate(actions):
+        start = time.perf_counter_ns()
+        alive = game.update_state(action)[1]
+        latencies[i] = time.perf_counter_ns() - start
+
+        if not alive:
+            game = FlappyBirdLogic(rng, **kwargs)
+    return _summarize(f"update_state FlappyBirdLogic {_describe(kwargs)}", latencies)
+
+
+def bench_render(num_steps: int, **kwargs) -> Dict[str, Any]:
+    """Benchmarks the rendering of `FlappyBird-v0` in "rgb_array" mode."""
+    env = gymnasium.make(
+        "FlappyBird-v0", audio_on=False, render_mode="rgb_array", **kwargs
+    ).unwrapped
+    latencies = _time_steps(env, num_steps, timed=env.render)
+    env.close()
+    return _summarize(f"render rgb_array {_describe(kwargs)}".strip(), latencies)
+
+
+def bench_reset(env_id: str, num_resets: int, **kwargs) -> Dict[str, Any]:
+    """Benchmarks the resets of an environment."""
+    env = gymnasium.make(env_id, audio_on=False, **kwargs).unwrapped
+    env.reset(seed=0)
+    latencies = np.empty(num_resets, dtype=np.int64)
+    for i in range(num_resets):
+        start = time.perf_counter_ns()
+        env.reset()
+        latencies[i] = time.perf_counter_ns() - start
+    env.close()
+    return _summarize(f"reset {env_id} {_describe(kwargs)}".strip(), latencies)
+
+
+def bench_vector_step(
+    env_id: str, num_envs: int, num_steps: int, **kwargs
+) -> Dict[str, Any]:
+    """Benchmarks the steps of a vector environment. Its throughput is measured
+    in sub-environment steps per second.
+    """
+    envs = gymnasium.make_vec(env_id, num_envs=num_envs, **kwargs)
+    envs.reset(seed=0)
+    rng = np.random.default_rng(0)
+    latencies = np.empty(num_steps, dtype=np.int64)
+    for i in range(num_steps):
+        actions = (rng.random(num_envs) < _FLAP_PROB).astype(np.int64)
+        start = time.perf_counter_ns()
+        envs.step(actions)
+        latencies[i] = time.perf_counter_ns() - start
+    envs.close()
+
+    name = f"vector_step {env_id} {_describe(dict(num_envs=num_envs, **kwargs))}"
+    return _summarize(name, latencies, items_per_call=num_envs)
+
+
+def measure_memory(env_id: str, num_envs: int, **kwargs) -> Dict[str, Any]:
+    """Measures the memory allocated (by Python and NumPy) for each environment,
+    after it's created and reset. The memory shared by all the environments
+    (e.g. the sprites) isn't counted.
+    """
+    make = functools.partial(gymnasium.make, env_id, audio_on=False, **kwargs)
+    make().unwrapped.reset(seed=0)  # loads the shared data
+
+    tracemalloc.start()
+    envs = [make().unwrapped for _ in range(num_envs)]
+    for env in envs:
+        env.reset(seed=0)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    for env in envs:
+        env.close()
+    return {
+        "name": f"memory {env_id} {_describe(kwargs)}".strip(),
+        "bytes_per_env": allocated / num_envs,
+    }
+
+
+def measure_vector_memory(env_id: str, num_envs: int, **kwargs) -> Dict[str, Any]:
+    """Measures the memory allocated for each sub-environment of a vector
+    environment, after it's created and reset.
+    """
+    tracemalloc.start()
+    envs = gymnasium.make_vec(env_id, num_envs=num_envs, **kwargs)
+    envs.reset(seed=0)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    envs.close()
+    name = f"memory {env_id} {_describe(dict(num_envs=num_envs, **kwargs))}"
+    return {"name": name, "bytes_per_env": allocated / num_envs}
+
+
+def run_benchmarks(
+    scale: float = 1.0,
+    screen_sizes: Sequence[Tuple[int, int]] = SCREEN_SIZES,
+    num_envs: Sequence[int] = NUM_ENVS,
+    log: Optional[Callable[[str], Any]] = None,
+) -> Dict[str, Any]:
+    """Runs the benchmark suite.
+
+    Args:
+        scale (float): Multiplies the number of steps (and resets) timed in each
+            benchmark. Smaller values are faster, but less precise.
+        screen_sizes (Sequence[Tuple[int, int]]): Screen sizes benchmarked.
+        num_envs (Sequence[int]): Numbers of sub-environments of the vector
+            environments benchmarked.
+        log (Optional[Callable[[str], Any]]): Called with the name of each
+            benchmark before running it.
+
+    Returns:
+        A dictionary (serializable to JSON) with information about the system
+        and a list of results, each with a unique "name".
+    """
+
+    def count(n):
+        return max(int(n * scale), 10)
+
+    benchmarks = []
+    for size in screen_sizes:
+        benchmarks += [
+            (bench_game_logic, count(50000), dict(screen_size=size)),
+            (bench_step, "FlappyBird-v0", count(20000), dict(screen_size=size)),
+            (bench_reset, "FlappyBird-v0", count(5000), dict(screen_size=size)),
+        ]
+        for backend in ("numpy", "pygame"):
+            kwargs = dict(screen_size=size, render_backend=backend)
+            benchmarks += [
+                (bench_step, "FlappyBird-rgb-v0", count(1000), kwargs),
+                (bench_reset, "FlappyBird-rgb-v0", count(200), kwargs),
+                (bench_render, count(1000), kwargs),
+            ]
+    for n in num_envs:
+        steps = count(max(20000 // n, 200))
+        benchmarks.append((bench_vector_step, "FlappyBird-v0", n, steps, {}))
+    for n in num_envs[:2]:
+        kwargs = dict(render_backend="numpy", num_workers=2)
+        benchmarks.append(
+            (bench_vector_step, "FlappyBird-rgb-shared-v0", n, count(200), kwargs)
+        )
+
+    benchmarks += [
+        (measure_memory, "FlappyBird-v0", 100, {}),
+        (measure_memory, "FlappyBird-rgb-v0", 10, dict(render_backend="numpy")),
+        (measure_vector_memory, "FlappyBird-v0", max(num_envs), {}),
+    ]
+
+    results = []
+    for function, *args, kwargs in benchmarks:
+        if log is not None:
+            log(f"{function.__name__}{tuple(args)} {_describe(kwargs)}")
+        results.append(function(*args, **kwargs))
+
+    return {
+        "version": VERSION,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "scale": scale,
+        "results": results,
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = TOLERANCE
+) -> List[str]:
+    """Compares benchmark results against a baseline.
+
+    Returns:
+        A description of each regression: a benchmark whose throughput dropped,
+        or whose memory per environment grew, by more than `tolerance` (relative
+        to the baseline). Benchmarks missing from one of the runs are ignored.
+    """
+    baseline_results = {r["name"]: r for r in baseline["results"]}
+    regressions = []
+    for result in results["results"]:
+        base = baseline_results.get(result["name"])
+        if base is None:
+            continue
+
+        if "steps_per_sec" in result:
+            ratio = result["steps_per_sec"] / base["steps_per_sec"]
+            if ratio < 1 - tolerance:
+                regressions.append(
+                    f"{result['name']}: {result['steps_per_sec']:,.0f} steps/s, "
+                    f"{1 - ratio:.0%} slower than {base['steps_per_sec']:,.0f}"
+                )
+        else:
+            ratio = result["bytes_per_env"] / max(base["bytes_per_env"], 1)
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{result['name']}: {result['bytes_per_env']:,.0f} bytes/env, "
+                    f"{ratio - 1:.0%} more than {base['bytes_per_env']:,.0f}"
+                )
+    return regressions
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """Formats benchmark results as a table."""
+    lines = [f"{'Benchmark':<68} {'steps/s':>12} {'p50 us':>9} {'p99 us':>9}"]
+    for result in results["results"]:
+        if "steps_per_sec" in result:
+            lines.append(
+                f"{result['name']:<68} {result['steps_per_sec']:>12,.0f} "
+                f"{result['p50_us']:>9.1f} {result['p99_us']:>9.1f}"
+            )
+        else:
+            lines.append(
+                f"{result['name']:<68} {result['bytes_per_env'] / 1024:>9,.1f} KiB/env"
+            )
+    return "\n".join(lines)
+
+
+def bench(
+    output: Optional[str] = None,
+    baseline: Optional[str] = None,
+    quick: bool = False,
+    tolerance: float = TOLERANCE,
+) -> List[str]:
+    """Runs the benchmark suite, printing its results.
+
+    Args:
+        output (Optional[str]): If given, path of a JSON file in which the
+            results are saved.
+        baseline (Optional[str]): If given, path of a JSON file with the results
+            of a previous run, to compare against.
+        quick (bool): If `True`, runs shorter benchmarks.
+        tolerance (float): Maximum relative slowdown tolerated when comparing the
+            results against the baseline.
+
+    Returns:
+        The regressions found in the comparison with the baseline.
+    """
+    results = run_benchmarks(scale=0.1 if quick else 1.0, log=print)
+    print(format_results(results))
+
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    regressions = []
+    if baseline is not None:
+        with open(baseline) as file:
+            regressions = compare(results, json.load(file), tolerance)
+        print(f"{len(regressions)} regression(s) against {baseline}")
+        for regression in regressions:
+            print(f"  {regression}")
+    return regressions
@@ -26,42 +26,67 @@
 """
 
 import argparse
-import time
+import sys
 
-import gymnasium
-import pygame
+from flappy_bird_gymnasium import benchmarks, modes
 
-import flappy_bird_gymnasium
-from tests.test_simple_env_human import play as human_agent_env
-from tests.test_simple_env_random import play as random_agent_env
+#: Game loops run by each execution mode.
+MODES = {
+    "human": modes.play_human,
+    "random": modes.play_random,
+    "dqn": modes.play_dqn,
+    "bench": benchmarks.bench,
+}
 
 
 def _get_args():
     """Parses the command line arguments and returns them."""
     parser = argparse.ArgumentParser(description=__doc__)
 
-    # Argument for the mode of execution (human or random):
+    # Argument for the mode of execution (human, random, dqn or bench):
     parser.add_argument(
         "--mode",
         "-m",
         type=str,
         default="human",
-        choices=["human", "random"],
+        choices=list(MODES),
         help="The execution mode for the game.",
     )
 
+    # Arguments of the bench mode:
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="JSON file in which the benchmarks' results are saved (bench mode).",
+    )
+    parser.add_argument(
+        "--baseline",
+        "-b",
+        type=str,
+        default=None,
+        help="JSON file with previous benchmarks' results to compare against "
+        "(bench mode). Exits with status 1 if there are regressions.",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Runs shorter (less precise) benchmarks (bench mode).",
+    )
+
     return parser.parse_args()
 
 
 def main():
     args = _get_args()
+    if args.mode == "bench":
+        regressions = MODES["bench"](
+            output=args.output, baseline=args.baseline, quick=args.quick
+        )
+        sys.exit(1 if regressions else 0)
 
-    if args.mode == "human":
-        human_agent_env()
-    elif args.mode == "random":
-        random_agent_env()
-    else:
-        print("Invalid mode!")
+    MODES[args.mode]()
 
 
 if __name__ == "__main__":
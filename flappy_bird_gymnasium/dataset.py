@@ -0,0 +1,357 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Streams transitions to disk and reads them back, for offline reinforcement
+learning.
+
+A dataset is a directory with a `manifest.json` file and, for each field of the
+transitions, a sequence of `.npy` shards named `<field>-<shard>.npy`. The
+shards are preallocated with a fixed number of rows and written through
+memory maps of a chunk of rows at a time, so the memory used while writing
+doesn't grow with the dataset. The manifest holds the number of valid rows of
+each shard (the last one is usually not full).
+
+Each row holds a transition: the observation on which an action was taken,
+the action, the reward received, whether the episode terminated or was
+truncated, and the id of the episode. The observation that followed a
+transition is the one in the next row with the same episode id.
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+#: Name of the file describing a dataset.
+MANIFEST_FILE = "manifest.json"
+
+#: Version of the dataset format.
+VERSION = 1
+
+
+def _shard_path(directory: str, name: str, shard: int) -> str:
+    return os.path.join(directory, f"{name}-{shard:05d}.npy")
+
+
+class TrajectoryWriter:
+    """Appends transitions to a dataset stored in memory-mapped `.npy` shards.
+
+    The transitions are added in batches, with one row for each of the
+    `num_envs` environments being played, e.g. for the sub-environments of a
+    vector environment. The writer assigns the episode ids, starting a new
+    episode for an environment after it terminates or is truncated.
+
+    Args:
+        directory (str): Directory in which the dataset is written. It's created
+            if it doesn't exist.
+        obs_shape (Tuple[int, ...]): Shape of an observation.
+        obs_dtype: Data type of the observations.
+        num_envs (int): Number of environments whose transitions are added in
+            each batch.
+        shard_size (int): Number of rows of each shard.
+        chunk_size (int): Number of rows of a shard mapped in memory at a time.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        obs_shape: Tuple[int, ...] = (12,),
+        obs_dtype=np.float64,
+        num_envs: int = 1,
+        shard_size: int = 2**20,
+        chunk_size: int = 2**14,
+    ) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.num_envs = num_envs
+        self.shard_size = shard_size
+        self.chunk_size = min(chunk_size, shard_size)
+
+        self.fields = {
+            "observations": (tuple(obs_shape), np.dtype(obs_dtype)),
+            "actions": ((), np.dtype(np.uint8)),
+            "rewards": ((), np.dtype(np.float32)),
+            "terminated": ((), np.dtype(bool)),
+            "truncated": ((), np.dtype(bool)),
+            "episode_ids": ((), np.dtype(np.uint64)),
+        }
+
+        self._episode_ids = np.arange(num_envs, dtype=np.uint64)
+        self._next_episode_id = num_envs
+
+        self._shard_lengths: List[int] = []
+        self._shard_offsets: Dict[str, int] = {}
+        self._shard_len = 0
+        self._chunks: Dict[str, np.memmap] = {}
+        self._chunk_start = 0
+        self._chunk_end = 0
+        self.num_transitions = 0
+
+    def __enter__(self) -> "TrajectoryWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def add(
+        self,
+        obs: np.ndarray,
+        action: int,
+        reward: float,
+        terminated: bool,
+        truncated: bool = False,
+    ) -> None:
+        """Adds a single transition (only for `num_envs == 1`)."""
+        self.add_batch(
+            np.asarray(obs)[np.newaxis],
+            [action],
+            [reward],
+            [terminated],
+            [truncated],
+        )
+
+    def add_batch(
+        self,
+        obs: np.ndarray,
+        actions: Union[np.ndarray, Sequence[int]],
+        rewards: Union[np.ndarray, Sequence[float]],
+        terminated: Union[np.ndarray, Sequence[bool]],
+        truncated: Union[np.ndarray, Sequence[bool]],
+        mask: Optional[np.ndarray] = None,
+    ) -> None:
+        """Adds a transition for each environment.
+
+        Args:
+            obs (np.ndarray): The observations on which the actions were taken.
+            actions (Union[np.ndarray, Sequence[int]]): The actions taken.
+            rewards (Union[np.ndarray, Sequence[float]]): The rewards received.
+            terminated (Union[np.ndarray, Sequence[bool]]): Whether each
+                episode terminated.
+            truncated (Union[np.ndarray, Sequence[bool]]): Whether each episode
+                was truncated.
+            mask (Optional[np.ndarray]): If given, only the transitions of the
+                environments where it's `True` are added. With vector
+                environments in the "next-step" autoreset mode, this skips the
+                steps in which the environments are reset.
+        """
+        columns = {
+            "observations": obs,
+            "actions": actions,
+            "rewards": rewards,
+            "terminated": terminated,
+            "truncated": truncated,
+            "episode_ids": self._episode_ids,
+        }
+        columns = {
+            name: np.asarray(column, dtype=self.fields[name][1])
+            for name, column in columns.items()
+        }
+        if mask is not None:
+            columns = {name: column[mask] for name, column in columns.items()}
+        self._write(columns)
+
+        done = np.logical_or(terminated, truncated)
+        if mask is not None:
+            done &= mask
+        num_done = np.count_nonzero(done)
+        if num_done:
+            self._episode_ids[done] = np.arange(
+                self._next_episode_id,
+                self._next_episode_id + num_done,
+                dtype=np.uint64,
+            )
+            self._next_episode_id += num_done
+
+    def _write(self, columns: Dict[str, np.ndarray]) -> None:
+        num_rows = len(columns["actions"])
+        pos = 0
+        while pos < num_rows:
+            if self._shard_len == self._chunk_end:
+                if self._shard_len == self.shard_size:
+                    self._close_shard()
+                if self._shard_len == 0:
+                    self._open_shard()
+                self._map_chunk()
+
+            count = min(num_rows - pos, self._chunk_end - self._shard_len)
+            dst = slice(self._shard_len - self._chunk_start, None)
+            dst = slice(dst.start, dst.start + count)
+            src = slice(pos, pos + count)
+            for name, chunk in self._chunks.items():
+                chunk[dst] = columns[name][src]
+
+            pos += count
+            self._shard_len += count
+            self.num_transitions += count
+
+    def _open_shard(self) -> None:
+        shard = len(self._shard_lengths)
+        for name, (shape, dtype) in self.fields.items():
+            # only writes the header (the file is extended without writing it)
+            array = np.lib.format.open_memmap(
+                _shard_path(self.directory, name, shard),
+                mode="w+",
+                dtype=dtype,
+                shape=(self.shard_size, *shape),
+            )
+            self._shard_offsets[name] = array.offset
+            del array
+
+        self._chunk_start = self._chunk_end = 0
+
+    def _map_chunk(self) -> None:
+        self._unmap_chunk()
+        shard = len(self._shard_lengths)
+        num_rows = min(self.chunk_size, self.shard_size - self._shard_len)
+        for name, (shape, dtype) in self.fields.items():
+            row_size = dtype.itemsize * int(np.prod(shape))
+            self._chunks[name] = np.memmap(
+                _shard_path(self.directory, name, shard),
+                dtype=dtype,
+                mode="r+",
+                offset=self._shard_offsets[name] + self._shard_len * row_size,
+                shape=(num_rows, *shape),
+            )
+        self._chunk_start = self._shard_len
+        self._chunk_end = self._shard_len + num_rows
+
+    def _unmap_chunk(self) -> None:
+        # (the written pages are left to the OS to write back, without waiting
+        # for them with `flush()`)
+        self._chunks.clear()
+
+    def _close_shard(self) -> None:
+        self._unmap_chunk()
+        self._shard_lengths.append(self._shard_len)
+        self._shard_len = 0
+        self._chunk_start = self._chunk_end = 0
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "version": VERSION,
+            "fields": {
+                name: {"shape": list(shape), "dtype": dtype.str}
+                for name, (shape, dtype) in self.fields.items()
+            },
+            "shard_size": self.shard_size,
+            "shard_lengths": self._shard_lengths,
+            "num_transitions": sum(self._shard_lengths),
+        }
+
+        # replaces the manifest atomically
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        with open(path + ".tmp", "w") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def close(self) -> None:
+        """Writes the remaining transitions to disk and finishes the manifest."""
+        if self._shard_len > 0:
+            self._close_shard()
+        elif not os.path.exists(os.path.join(self.directory, MANIFEST_FILE)):
+            self._write_manifest()
+
+
+class TrajectoryReader:
+    """Reads a dataset written by :class:`TrajectoryWriter`.
+
+    The shards are memory-mapped (read-only), so opening a dataset doesn't read
+    its transitions, and slices of a shard are views of the files' contents.
+
+    Args:
+        directory (str): Directory of the dataset.
+
+    Attributes:
+        fields (Dict[str, List[np.ndarray]]): The valid rows of each shard, for
+            each field of the transitions.
+    """
+
+    def __init__(self, directory: str) -> None:
+        with open(os.path.join(directory, MANIFEST_FILE)) as file:
+            manifest = json.load(file)
+        if manifest["version"] != VERSION:
+            raise ValueError(
+                f"Unsupported dataset format version {manifest['version']} "
+                f"(expected {VERSION})!"
+            )
+
+        lengths = manifest["shard_lengths"]
+        self._empty = {
+            name: np.empty((0, *field["shape"]), dtype=field["dtype"])
+            for name, field in manifest["fields"].items()
+        }
+        self.fields = {
+            name: [
+                np.load(_shard_path(directory, name, shard), mmap_mode="r")[:length]
+                for shard, length in enumerate(lengths)
+            ]
+            for name in manifest["fields"]
+        }
+        self._starts = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def chunks(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """Yields the transitions in the rows `[start, stop)`, as views of the
+        shards: one dictionary of arrays (one for each field) per shard.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        shard = int(np.searchsorted(self._starts, start, side="right")) - 1
+        while start < stop:
+            shard_start = int(self._starts[shard])
+            shard_stop = min(stop, int(self._starts[shard + 1]))
+            rows = slice(start - shard_start, shard_stop - shard_start)
+            yield {name: shards[shard][rows] for name, shards in self.fields.items()}
+
+            start = shard_stop
+            shard += 1
+
+    def __getitem__(self, index: Union[int, slice]) -> Dict[str, np.ndarray]:
+        """Returns the transition or the transitions (as a dictionary of arrays)
+        at the given index or contiguous slice.
+
+        Slices within a single shard are views of it, while slices across shards
+        are copied into new arrays (see :meth:`.chunks()` to avoid the copy).
+        """
+        if not isinstance(index, slice):
+            index = range(len(self))[index]
+            rows = self[slice(index, index + 1)]
+            return {name: values[0] for name, values in rows.items()}
+
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            raise ValueError("Only slices with a step of 1 are supported!")
+
+        chunks = list(self.chunks(start, max(start, stop)))
+        if len(chunks) == 1:
+            return chunks[0]
+        return {
+            name: np.concatenate([empty, *(chunk[name] for chunk in chunks)])
+            for name, empty in self._empty.items()
+        }
@@ -0,0 +1,176 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" NumPy implementation of the bundled Deep Q Network agent.
+
+The agent is a dueling DQN with two hidden ELU layers, trained with
+TensorFlow. Its weights, originally saved as `assets/model/model.h5`, are also
+bundled as plain NumPy arrays in `assets/model/model.npz`, so the agent runs
+(on whole batches of observations at once) without TensorFlow.
+"""
+
+import os
+from typing import Callable, Optional
+
+import numpy as np
+
+from flappy_bird_gymnasium.envs.flappy_bird_env_vector import FlappyBirdVectorEnv
+from flappy_bird_gymnasium.envs.utils import MODEL_PATH
+
+#: Weights of the bundled agent.
+WEIGHTS_PATH = os.path.join(MODEL_PATH, "model.npz")
+
+# Layers of the network, in order, with their names in the Keras model:
+_LAYERS = (("fc1", "dense"), ("fc2", "dense_1"), ("v", "dense_2"), ("a", "dense_3"))
+
+
+def convert_keras_weights(h5_path: str, npz_path: str) -> None:
+    """Converts the weights of the Keras model saved in `h5_path` (like
+    `assets/model/model.h5`) to a `.npz` file that :class:`DuelingDQN` can load.
+    Requires the `h5py` package.
+    """
+    import h5py
+
+    weights = {}
+    with h5py.File(h5_path, "r") as file:
+        for name, keras_name in _LAYERS:
+            layer = file[keras_name]["dueling_dqn"][keras_name]
+            weights[f"{name}_kernel"] = layer["kernel:0"][()]
+            weights[f"{name}_bias"] = layer["bias:0"][()]
+    np.savez(npz_path, **weights)
+
+
+def _elu(x: np.ndarray) -> np.ndarray:
+    """Applies the ELU activation to `x`, in place."""
+    negative = np.minimum(x, 0)
+    np.expm1(negative, out=negative)
+    np.maximum(x, 0, out=x)
+    x += negative
+    return x
+
+
+class DuelingDQN:
+    """The DQN agent, evaluated with NumPy (in `float32`).
+
+    Calling it with a batch of observations of :class:`.FlappyBirdEnvSimple`
+    (or of :class:`.FlappyBirdVectorEnv`), with shape `(N, 12)`, returns the
+    greedy action for each one of them.
+
+    Args:
+        path (Optional[str]): Path of the `.npz` file with the weights. By
+            default, the bundled agent's ones (:data:`WEIGHTS_PATH`).
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        with np.load(WEIGHTS_PATH if path is None else path) as weights:
+            self._weights = [
+                (
+                    weights[f"{name}_kernel"].astype(np.float32),
+                    weights[f"{name}_bias"].astype(np.float32),
+                )
+                for name, _ in _LAYERS
+            ]
+
+    def q_values(self, obs: np.ndarray) -> np.ndarray:
+        """Returns the Q-values of the actions for a batch of observations
+        (with shape `(N, 2)`) or for a single observation (with shape `(2,)`).
+        """
+        (w1, b1), (w2, b2), (w_v, b_v), (w_a, b_a) = self._weights
+        x = np.asarray(obs, dtype=np.float32)
+        x = _elu(np.matmul(x, w1) + b1)
+        x = _elu(np.matmul(x, w2) + b2)
+        value = np.matmul(x, w_v) + b_v
+        advantages = np.matmul(x, w_a) + b_a
+        return value + (advantages - advantages.mean(axis=-1, keepdims=True))
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        """Returns the greedy actions for a batch of observations (or the
+        greedy action for a single observation).
+        """
+        return self.q_values(obs).argmax(axis=-1)
+
+
+def evaluate(
+    policy: Callable[[np.ndarray], np.ndarray],
+    num_episodes: int = 1000,
+    seed: int = 0,
+    num_envs: int = 256,
+    max_steps: Optional[int] = 10000,
+    **env_kwargs,
+) -> np.ndarray:
+    """Plays seeded episodes of the simple environment, many at once, with a
+    policy that maps a batch of observations to a batch of actions (like
+    :class:`DuelingDQN`).
+
+    The episode `i` is played from a reset with the seed `seed + i`, so its
+    score doesn't depend on the number of sub-environments.
+
+    Args:
+        policy (Callable[[np.ndarray], np.ndarray]): The policy.
+        num_episodes (int): Number of episodes.
+        seed (int): Seed of the first episode.
+        num_envs (int): Number of episodes played at once (the number of
+            sub-environments of the :class:`.FlappyBirdVectorEnv` used).
+        max_steps (Optional[int]): Maximum number of steps of an episode
+            (a good agent can play for very long). If `None`, the episodes
+            only end when the bird dies.
+        **env_kwargs: Keyword arguments of the environment.
+
+    Returns:
+        The score (number of pipes passed) of each episode.
+    """
+    num_envs = min(num_envs, num_episodes)
+    envs = FlappyBirdVectorEnv(num_envs=num_envs, **env_kwargs)
+    scores = np.zeros(num_episodes, dtype=np.int64)
+
+    # Episode played by each sub-environment, and for how many steps:
+    episodes = np.arange(num_envs)
+    steps = np.zeros(num_envs, dtype=np.int64)
+    playing = np.ones(num_envs, dtype=bool)
+    next_episode = num_envs
+
+    obs, _ = envs.reset(seed=seed)
+    while playing.any():
+        obs, _, terminated, _, info = envs.step(policy(obs))
+        steps += 1
+        ended = terminated if max_steps is None else terminated | (steps >= max_steps)
+        ended &= playing
+        if not ended.any():
+            continue
+
+        # The sub-environments start the next episodes (or stop playing)
+        seeds = [None] * num_envs
+        for i in np.flatnonzero(ended).tolist():
+            scores[episodes[i]] = info["score"][i]
+            if next_episode < num_episodes:
+                episodes[i] = next_episode
+                seeds[i] = seed + next_episode
+                next_episode += 1
+            else:
+                playing[i] = False
+        obs, _ = envs.reset(seed=seeds, options={"reset_mask": ended})
+        steps[ended] = 0
+
+    envs.close()
+    return scores
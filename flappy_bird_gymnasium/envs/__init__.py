@@ -21,8 +21,43 @@
 # SOFTWARE.
 # ==============================================================================
 
-""" Exposes the environment class.
+""" Exposes the environment classes.
+
+The classes are imported (along with pygame) the first time they're accessed,
+so importing a single module of this package doesn't load all of them.
 """
 
-from flappy_bird_gymnasium.envs.flappy_bird_env_rgb import FlappyBirdEnvRGB
-from flappy_bird_gymnasium.envs.flappy_bird_env_simple import FlappyBirdEnvSimple
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from flappy_bird_gymnasium.envs.flappy_bird_env_rgb import FlappyBirdEnvRGB
+    from flappy_bird_gymnasium.envs.flappy_bird_env_shared_memory import (
+        FlappyBirdSharedMemoryVectorEnv,
+    )
+    from flappy_bird_gymnasium.envs.flappy_bird_env_simple import FlappyBirdEnvSimple
+    from flappy_bird_gymnasium.envs.flappy_bird_env_vector import FlappyBirdVectorEnv
+
+# Module defining each environment class:
+_ENV_MODULES = {
+    "FlappyBirdEnvRGB": "flappy_bird_env_rgb",
+    "FlappyBirdEnvSimple": "flappy_bird_env_simple",
+    "FlappyBirdSharedMemoryVectorEnv": "flappy_bird_env_shared_memory",
+    "FlappyBirdVectorEnv": "flappy_bird_env_vector",
+}
+
+__all__ = list(_ENV_MODULES)
+
+
+def __getattr__(name: str):
+    if name not in _ENV_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f"{__name__}.{_ENV_MODULES[name]}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,351 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Implements a batched version of the Flappy Bird game's logic.
+
+The state of many independent games is stored in NumPy arrays (one element per
+game), so that all of them can be advanced with a single call. The physics are
+the same as the ones implemented by
+:class:`flappy_bird_gymnasium.envs.game_logic.FlappyBirdLogic`.
+"""
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from flappy_bird_gymnasium.envs.game_logic import (
+    BACKGROUND_WIDTH,
+    BASE_WIDTH,
+    NUM_PIPES,
+    PIPE_HEIGHT,
+    PIPE_VEL_X,
+    PIPE_WIDTH,
+    PLAYER_ACC_Y,
+    PLAYER_FLAP_ACC,
+    PLAYER_FLAP_ROT,
+    PLAYER_HEIGHT,
+    PLAYER_MAX_VEL_Y,
+    PLAYER_ROT_THR,
+    PLAYER_VEL_ROT,
+    PLAYER_WIDTH,
+    FlappyBirdLogic,
+)
+from flappy_bird_gymnasium.envs.hitmasks import PLAYER_MIN_ROT, Hitmasks
+
+#: Sequence of the bird's animation frames.
+PLAYER_IDX_CYCLE = np.array([0, 1, 2, 1])
+
+
+class BatchedFlappyBirdLogic:
+    """Handles the logic of many Flappy Bird games at once.
+
+    Each game's state is stored in a "struct of arrays" layout: every attribute
+    is an array with one element (or one row) per game. A call to
+    :meth:`.update_state()` advances all the games that are alive by one frame.
+    Games that are dead are left untouched until they're reset.
+
+    Every game draws its pipes from its own random number generator. The gaps
+    are drawn in bulk into a buffer that is refilled when exhausted, which
+    yields exactly the same pipes as the ones generated by a
+    :class:`.FlappyBirdLogic` that uses a generator with the same seed.
+
+    Args:
+        np_randoms (Sequence[np.random.Generator]): One random number generator
+            for each game.
+        screen_size (Tuple[int, int]): Tuple with the screen's width and height.
+        pipe_gap_size (int): Space between a lower and an upper pipe.
+        gap_buffer_size (int): Number of pipe gaps drawn from a game's random
+            number generator at once.
+        hitmasks (Optional[Hitmasks]): If given, collisions with the pipes are
+            pixel-perfect, like the ones of a :class:`.FlappyBirdLogic` with
+            the same hitmasks.
+
+    Attributes:
+        num_games (int): Number of games.
+        player_x (int): The players' x position (the same for all the games).
+        player_y (np.ndarray): The players' y positions.
+        player_vel_y (np.ndarray): The players' vertical velocities.
+        player_rot (np.ndarray): The players' rotation angles.
+        player_idx (np.ndarray): Current indices of the birds' animation cycles.
+        base_x (np.ndarray): The bases' x positions.
+        base_y (float): The base/ground's y position (the same for all games).
+        pipes_x (np.ndarray): Array with shape `(num_games, 3)` with the x
+            positions of the pipes. An upper pipe and its lower pipe share the
+            same x position.
+        upper_pipes_y (np.ndarray): Array with shape `(num_games, 3)` with the
+            y positions of the upper pipes.
+        lower_pipes_y (np.ndarray): Array with shape `(num_games, 3)` with the
+            y positions of the lower pipes.
+        score (np.ndarray): Current scores of the players.
+        alive (np.ndarray): Boolean mask with the games that are still running.
+    """
+
+    def __init__(
+        self,
+        np_randoms: Sequence[np.random.Generator],
+        screen_size: Tuple[int, int],
+        pipe_gap_size: int = 100,
+        gap_buffer_size: int = 64,
+        hitmasks: Optional[Hitmasks] = None,
+    ) -> None:
+        self._screen_width = screen_size[0]
+        self._screen_height = screen_size[1]
+        self.num_games = n = len(np_randoms)
+
+        self.player_x = int(self._screen_width * 0.2)
+        self._player_start_y = int((self._screen_height - PLAYER_HEIGHT) / 2)
+
+        self.base_y = self._screen_height * 0.79
+        self._base_shift = BASE_WIDTH - BACKGROUND_WIDTH
+        self._pipe_gap_size = pipe_gap_size
+
+        self._pipes_start_x = np.array(
+            [
+                self._screen_width + 200,
+                self._screen_width + 200 + (self._screen_width / 2),
+                self._screen_width + 200 + self._screen_width,
+            ],
+            dtype=np.float64,
+        )
+        self._pipe_spawn_x = (
+            self._screen_width + PIPE_WIDTH + (self._screen_width * 0.2)
+        )
+        self._gap_high = int(self.base_y * 0.6 - self._pipe_gap_size)
+        self._gap_offset = int(self.base_y * 0.2)
+
+        self._hitmasks = hitmasks
+        self._player_sizes = None
+        if hitmasks is not None:
+            self._player_sizes = hitmasks.player_sizes()
+
+        self.player_y = np.zeros(n, dtype=np.float64)
+        self.player_vel_y = np.zeros(n, dtype=np.int64)
+        self.player_rot = np.zeros(n, dtype=np.int64)
+        self.player_idx = np.zeros(n, dtype=np.int64)
+        self.base_x = np.zeros(n, dtype=np.int64)
+        self.pipes_x = np.zeros((n, NUM_PIPES), dtype=np.float64)
+        self.upper_pipes_y = np.zeros((n, NUM_PIPES), dtype=np.int64)
+        self.lower_pipes_y = np.zeros((n, NUM_PIPES), dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.alive = np.zeros(n, dtype=bool)
+
+        self._player_flapped = np.zeros(n, dtype=bool)
+        self._player_idx_pos = np.zeros(n, dtype=np.int64)
+        self._loop_iter = np.zeros(n, dtype=np.int64)
+
+        self._np_randoms = list(np_randoms)
+        self._gap_buffer_size = gap_buffer_size
+        self._gap_buffer = np.zeros((n, gap_buffer_size), dtype=np.int64)
+        self._gap_ptr = np.zeros(n, dtype=np.int64)
+        for i in range(n):
+            self._refill_gaps(i)
+
+        self._all_games = np.arange(n)
+        self.reset()
+
+    def set_np_random(self, index: int, np_random: np.random.Generator) -> None:
+        """Replaces the random number generator of the game at `index`.
+
+        Any buffered pipe gap drawn from the previous generator is discarded.
+        The new generator is only used for pipes generated after this call,
+        so the game should usually be reset afterwards.
+        """
+        self._np_randoms[index] = np_random
+        self._refill_gaps(index)
+
+    def _refill_gaps(self, index: int) -> None:
+        """Draws a new batch of pipe gaps for the game at `index`."""
+        self._gap_buffer[index] = self._np_randoms[index].integers(
+            0, self._gap_high, size=self._gap_buffer_size
+        )
+        self._gap_ptr[index] = 0
+
+    def _next_gaps(self, indices: np.ndarray) -> np.ndarray:
+        """Returns the y position of the next gap of each game in `indices`.
+
+        The games in `indices` must be unique.
+        """
+        gaps = self._gap_buffer[indices, self._gap_ptr[indices]]
+        self._gap_ptr[indices] += 1
+        for i in indices[self._gap_ptr[indices] == self._gap_buffer_size]:
+            self._refill_gaps(i)
+        return gaps + self._gap_offset
+
+    def _set_pipes(self, indices: np.ndarray, column: int) -> None:
+        """Generates new random pipes for the games in `indices`."""
+        gap_y = self._next_gaps(indices)
+        self.upper_pipes_y[indices, column] = gap_y - PIPE_HEIGHT
+        self.lower_pipes_y[indices, column] = gap_y + self._pipe_gap_size
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """Starts new games.
+
+        Args:
+            mask (Optional[np.ndarray]): Boolean mask with the games to be
+                reset. If `None`, all the games are reset.
+        """
+        indices = self._all_games if mask is None else np.flatnonzero(mask)
+        if len(indices) == 0:
+            return
+
+        self.player_y[indices] = self._player_start_y
+        self.player_vel_y[indices] = -9
+        self.player_rot[indices] = PLAYER_FLAP_ROT
+        self.player_idx[indices] = 0
+        self.base_x[indices] = 0
+        self.pipes_x[indices] = self._pipes_start_x
+        for column in range(NUM_PIPES):
+            self._set_pipes(indices, column)
+        self.score[indices] = 0
+        self.alive[indices] = True
+
+        self._player_flapped[indices] = False
+        self._player_idx_pos[indices] = 0
+        self._loop_iter[indices] = 0
+
+    def check_crash(self) -> np.ndarray:
+        """Returns a boolean mask with the players that collide with the ground
+        (base) or a pipe.
+
+        The overlap test replicates the one of `pygame.Rect.colliderect`, with
+        the positions truncated to integers. With hitmasks, it's done with the
+        bounding boxes of the rotated player sprites, and only the few games in
+        which they overlap a pipe are checked pixel by pixel.
+        """
+        player_y = self.player_y.astype(np.int64)
+        ground = self.player_y + PLAYER_HEIGHT >= self.base_y - 1
+
+        player_width, player_height = PLAYER_WIDTH, PLAYER_HEIGHT
+        if self._hitmasks is not None:
+            visible_rot = np.minimum(self.player_rot, PLAYER_ROT_THR)
+            sizes = self._player_sizes[self.player_idx, visible_rot - PLAYER_MIN_ROT]
+            player_width = sizes[:, 0, np.newaxis]
+            player_height = sizes[:, 1, np.newaxis]
+
+        pipes_x = self.pipes_x.astype(np.int64)
+        overlap_x = (pipes_x < self.player_x + player_width) & (
+            self.player_x < pipes_x + PIPE_WIDTH
+        )
+
+        player_y = player_y[:, np.newaxis]
+        up_collide = (self.upper_pipes_y < player_y + player_height) & (
+            player_y < self.upper_pipes_y + PIPE_HEIGHT
+        )
+        low_collide = (self.lower_pipes_y < player_y + player_height) & (
+            player_y < self.lower_pipes_y + PIPE_HEIGHT
+        )
+        collide = (overlap_x & (up_collide | low_collide)).any(axis=1)
+
+        if self._hitmasks is not None:
+            for i in np.flatnonzero(collide & ~ground & self.alive):
+                collide[i] = self._hitmasks.player_collides(
+                    self.player_idx[i],
+                    self.player_rot[i],
+                    (self.player_x, self.player_y[i]),
+                    zip(self.pipes_x[i], self.upper_pipes_y[i]),
+                    zip(self.pipes_x[i], self.lower_pipes_y[i]),
+                )
+
+        return ground | collide
+
+    def update_state(
+        self, actions: Union[np.ndarray, Sequence[int]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Given the actions taken by the players, updates the games' states.
+
+        Games that are already dead are not updated and yield a reward of 0.
+
+        Args:
+            actions (Union[np.ndarray, Sequence[int]]): The actions taken by
+                the players, one for each game.
+
+        Returns:
+            A tuple with an array with the rewards and a boolean mask with the
+            games in which the player is alive.
+        """
+        actions = np.asarray(actions)
+        active = self.alive
+
+        flap = (
+            active
+            & (actions == FlappyBirdLogic.Actions.FLAP)
+            & (self.player_y > -2 * PLAYER_HEIGHT)
+        )
+        self.player_vel_y[flap] = PLAYER_FLAP_ACC
+        self._player_flapped |= flap
+
+        crashed = active & self.check_crash()
+        running = active & ~crashed
+        self.alive = running
+
+        # check for score
+        player_mid_pos = self.player_x + PLAYER_WIDTH / 2
+        pipes_mid_pos = self.pipes_x + PIPE_WIDTH / 2
+        scored = (
+            (pipes_mid_pos <= player_mid_pos) & (player_mid_pos < pipes_mid_pos + 4)
+        ).sum(axis=1) * running
+        self.score += scored
+
+        reward = np.where(running, 0.1, 0.0)
+        reward[scored > 0] = 1
+        reward[crashed] = -1
+
+        # player_index base_x change
+        step = running.astype(np.int64)
+        anim = running & ((self._loop_iter + 1) % 3 == 0)
+        self.player_idx[anim] = PLAYER_IDX_CYCLE[self._player_idx_pos[anim]]
+        self._player_idx_pos[anim] = (self._player_idx_pos[anim] + 1) % 4
+
+        self._loop_iter = (self._loop_iter + step) % 30
+        self.base_x = np.where(
+            running, -((-self.base_x + 100) % self._base_shift), self.base_x
+        )
+
+        # rotate the player
+        self.player_rot -= PLAYER_VEL_ROT * (running & (self.player_rot > -90))
+
+        # player's movement
+        self.player_vel_y += PLAYER_ACC_Y * (
+            running & (self.player_vel_y < PLAYER_MAX_VEL_Y) & ~self._player_flapped
+        )
+
+        flapped = running & self._player_flapped
+        self._player_flapped &= ~flapped
+        self.player_rot[flapped] = PLAYER_FLAP_ROT
+
+        self.player_y += running * np.minimum(
+            self.player_vel_y, self.base_y - self.player_y - PLAYER_HEIGHT
+        )
+
+        # move pipes to left
+        self.pipes_x += PIPE_VEL_X * running[:, np.newaxis]
+
+        # it is out of the screen
+        for column in range(NUM_PIPES):
+            out = np.flatnonzero(self.pipes_x[:, column] < -PIPE_WIDTH)
+            if len(out) > 0:
+                self.pipes_x[out, column] = self._pipe_spawn_x
+                self._set_pipes(out, column)
+
+        return reward, running
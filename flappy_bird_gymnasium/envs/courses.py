@@ -0,0 +1,109 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Fixed pipe courses, shared by the environments of every process.
+
+A course is the sequence of the y positions of the gaps (of their upper edges)
+between the successive pipes of a game. A set of courses is stored as a 2D
+`int32` array in a `.npy` file, with one course per row, and is memory-mapped
+(read-only) when loaded, so the processes evaluating agents on the same courses
+share a single copy of them, and starting a game on a course draws no random
+numbers.
+"""
+
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+from gymnasium.utils import seeding
+
+from flappy_bird_gymnasium.envs.game_logic import PIPE_HEIGHT, FlappyBirdLogic
+
+# Courses loaded in this process, by the absolute path of their file:
+_COURSES_CACHE: Dict[str, np.ndarray] = {}
+
+
+def generate_courses(
+    num_courses: int,
+    num_pipes: int = 256,
+    seed: int = 0,
+    screen_size: Tuple[int, int] = (288, 512),
+    pipe_gap: int = 100,
+) -> np.ndarray:
+    """Generates random courses.
+
+    The course at index `i` has the same pipes as the game of an environment
+    reset with the seed `seed + i`.
+
+    Args:
+        num_courses (int): Number of courses.
+        num_pipes (int): Number of pipes of each course.
+        seed (int): Seed of the first course.
+        screen_size (Tuple[int, int]): The screen's width and height.
+        pipe_gap (int): Space between a lower and an upper pipe.
+
+    Returns:
+        An `int32` array with shape `(num_courses, num_pipes)`.
+    """
+    courses = np.empty((num_courses, num_pipes), dtype=np.int32)
+    for i in range(num_courses):
+        # the game draws all the gaps at once
+        game = FlappyBirdLogic(
+            np_random=seeding.np_random(seed + i)[0],
+            screen_size=screen_size,
+            pipe_gap_size=pipe_gap,
+            gap_buffer_size=max(num_pipes, 1),
+        )
+        gaps = [y + PIPE_HEIGHT for y in game.upper_pipes_y] + game.gap_buffer
+        courses[i] = gaps[:num_pipes]
+    return courses
+
+
+def save_courses(path: str, courses: np.ndarray) -> None:
+    """Saves courses (see :func:`generate_courses`) to a `.npy` file."""
+    courses = np.asarray(courses, dtype=np.int32)
+    if courses.ndim != 2:
+        raise ValueError(
+            f"The courses must be a 2D array, but they have shape {courses.shape}!"
+        )
+    np.save(path, courses)
+
+
+def load_courses(path: str) -> np.ndarray:
+    """Memory-maps the courses saved in a `.npy` file (only once per process).
+
+    Returns:
+        A read-only `int32` array with one course per row.
+    """
+    path = os.path.abspath(path)
+    if path not in _COURSES_CACHE:
+        courses = np.load(path, mmap_mode="r")
+        if courses.ndim != 2:
+            raise ValueError(
+                f'The courses in "{path}" must be a 2D array, but they have shape '
+                f"{courses.shape}!"
+            )
+        # (a plain array view is faster to index than a memmap)
+        _COURSES_CACHE[path] = np.asarray(courses)
+    return _COURSES_CACHE[path]
@@ -31,8 +31,15 @@ import gymnasium
 import numpy as np
 import pygame
 
-from flappy_bird_gymnasium.envs.game_logic import FlappyBirdLogic
-from flappy_bird_gymnasium.envs.renderer import FlappyBirdRenderer
+from flappy_bird_gymnasium.envs.courses import load_courses
+from flappy_bird_gymnasium.envs.game_logic import FlappyBirdLogic, GameState
+from flappy_bird_gymnasium.envs.hitmasks import get_hitmasks
+from flappy_bird_gymnasium.envs.profiling import (
+    LOGIC_PHASES,
+    RENDERER_PHASES,
+    Profiler,
+)
+from flappy_bird_gymnasium.envs.renderer import FlappyBirdRenderer, frame_shape
 
 
 class FlappyBirdEnvRGB(gymnasium.Env):
@@ -55,6 +62,63 @@ class FlappyBirdEnvRGB(gymnasium.Env):
         background (Optional[str]): Type of background image. The currently
             available types are "day" and "night". If `None`, no background will
             be drawn.
+        render_backend (str): Backend used to draw the frames. Either "pygame"
+            or "numpy" (see :class:`.FlappyBirdRenderer`).
+        incremental_render (bool): If `True`, only the areas of the frames
+            that changed since the previous frame are redrawn (see
+            :class:`.FlappyBirdRenderer`).
+        async_display (bool): If `True`, in "human" render mode, the frames
+            are shown by a separate thread, so :meth:`.render()` never waits
+            for the display. Frames that the display can't keep up with are
+            dropped and counted (see :meth:`.get_display_stats()`).
+        obs_layout (str): Memory layout of the observations: "WHC" (width,
+            height, channels), "HWC" or "CHW".
+        obs_buffer (Optional[np.ndarray]): Preallocated `uint8` array, with the
+            shape of the observation space, in which the observations are
+            written. If given, every call to :meth:`.step()` and
+            :meth:`.reset()` overwrites and returns this same array instead of
+            allocating a new one.
+        preallocate_obs (bool): If `True` and `obs_buffer` is `None`, the
+            environment allocates its own observation buffer, which is then
+            overwritten and returned by every call to :meth:`.step()` and
+            :meth:`.reset()`.
+        obs_size (Optional[Tuple[int, int]]): Width and height of the
+            observations. If given, the observations are rendered straight at
+            this resolution, with sprites scaled once at load time, instead of
+            being downsampled from a full-size frame. The frames returned by
+            :meth:`.render()` keep the screen's size.
+        grayscale_obs (bool): If `True`, the observations have a single
+            grayscale channel instead of three RGB channels.
+        frame_stack (int): Number of consecutive frames in each observation.
+            If greater than 1, the observations have an extra leading axis of
+            this size, ordered from the oldest to the newest frame. The frames
+            are kept in a preallocated ring buffer, so each step draws a
+            single frame and no stacking copies are made. Unless an
+            observation buffer is used, the returned stacks are views of that
+            ring buffer, which are overwritten by the following steps. On
+            :meth:`.reset()`, the whole stack is filled with the first frame.
+        frame_skip (int): Number of game ticks (frames) advanced by each step,
+            all with the step's action. The rewards of the ticks are summed
+            and the step ends early if the bird dies. Only the observation of
+            the last tick is drawn.
+        max_pool_frames (bool): If `True` and `frame_skip` is greater than 1,
+            each observation is the pixel-wise maximum of the last two ticks'
+            frames (which also draws the second to last one).
+        precise_collision (bool): If `True`, the bird only collides with a
+            pipe when the opaque pixels of their sprites overlap, instead of
+            their bounding boxes (see :class:`.Hitmasks`).
+        course_file (Optional[str]): Path of a `.npy` file with fixed courses
+            (see :mod:`.courses`). If given, each game plays one of its courses
+            instead of random pipes: the one with the index passed in the
+            `"course"` option of :meth:`.reset()` or, by default, the one after
+            the previous game's course. The index of the course played is
+            returned in the `"course"` entry of the reset's info dictionary.
+        profile (bool): If `True`, the number of calls and the time spent in
+            each phase of the game (its logic, the observations and the
+            rendering) are measured (see :class:`.Profiler`). The measurements of
+            the current episode are returned by :meth:`.get_profile()` and, in
+            the episode's last step, in the "profile" entry of the info
+            dictionary.
     """
 
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 30}
@@ -68,12 +132,72 @@ class FlappyBirdEnvRGB(gymnasium.Env):
         pipe_color: str = "green",
         render_mode=None,
         background: Optional[str] = None,
+        render_backend: str = "pygame",
+        obs_layout: str = "WHC",
+        obs_buffer: Optional[np.ndarray] = None,
+        preallocate_obs: bool = False,
+        obs_size: Optional[Tuple[int, int]] = None,
+        grayscale_obs: bool = False,
+        incremental_render: bool = False,
+        async_display: bool = False,
+        frame_stack: int = 1,
+        frame_skip: int = 1,
+        max_pool_frames: bool = False,
+        precise_collision: bool = False,
+        course_file: Optional[str] = None,
+        profile: bool = False,
     ) -> None:
+        if frame_stack < 1:
+            raise ValueError(
+                f"The number of stacked frames must be positive, got {frame_stack}!"
+            )
+        if frame_skip < 1:
+            raise ValueError(
+                f"The number of skipped frames must be positive, got {frame_skip}!"
+            )
+
+        obs_frame_shape = frame_shape(
+            screen_size if obs_size is None else obs_size,
+            obs_layout,
+            channels=1 if grayscale_obs else 3,
+        )
         self.action_space = gymnasium.spaces.Discrete(2)
-        self.observation_space = gymnasium.spaces.Box(0, 255, [*screen_size, 3])
+        self.observation_space = gymnasium.spaces.Box(
+            0,
+            255,
+            obs_frame_shape if frame_stack == 1 else (frame_stack, *obs_frame_shape),
+            dtype=np.uint8,
+        )
 
         self._screen_size = screen_size
         self._pipe_gap = pipe_gap
+        self._obs_layout = obs_layout
+        self._hitmasks = None
+        if precise_collision:
+            self._hitmasks = get_hitmasks(bird_color, pipe_color)
+
+        self._courses = None
+        self._course_idx = 0
+        if course_file is not None:
+            self._courses = load_courses(course_file)
+
+        if obs_buffer is None and preallocate_obs:
+            obs_buffer = np.empty(self.observation_space.shape, dtype=np.uint8)
+        self._obs_buffer = obs_buffer
+
+        # Ring buffer with every frame written twice, at `i` and `i + k`, so the
+        # last `k` frames are always the contiguous slice `[i + 1, i + k]`
+        self._frame_stack = frame_stack
+        self._frames = None
+        self._frame_idx = 0
+        if frame_stack > 1:
+            self._frames = np.empty((2 * frame_stack, *obs_frame_shape), dtype=np.uint8)
+
+        # The second to last frame of each step is drawn here when max-pooling
+        self._frame_skip = frame_skip
+        self._pool_frame = None
+        if max_pool_frames and frame_skip > 1:
+            self._pool_frame = np.empty(obs_frame_shape, dtype=np.uint8)
 
         assert render_mode is None or render_mode in self.metadata["render_modes"]
         self.render_mode = render_mode
@@ -85,25 +209,150 @@ class FlappyBirdEnvRGB(gymnasium.Env):
             bird_color=bird_color,
             pipe_color=pipe_color,
             background=background,
+            render_backend=render_backend,
+            incremental=incremental_render,
+            async_display=async_display,
         )
 
-    def _get_observation(self):
-        self.renderer.draw_surface(show_score=False)
-        return pygame.surfarray.array3d(self.renderer.surface)
+        # The observations are drawn by a second renderer if they don't look
+        # like the rendered frames
+        self._obs_renderer = self.renderer
+        if obs_size is not None or grayscale_obs:
+            self._obs_renderer = FlappyBirdRenderer(
+                screen_size=self._screen_size,
+                audio_on=False,
+                bird_color=bird_color,
+                pipe_color=pipe_color,
+                background=background,
+                render_backend=render_backend,
+                frame_size=obs_size,
+                grayscale=grayscale_obs,
+                incremental=incremental_render,
+            )
+
+        self._profiler = None
+        self._game_cls = FlappyBirdLogic
+        if profile:
+            self._profiler = Profiler()
+            self._game_cls = self._profiler.subclass(FlappyBirdLogic, LOGIC_PHASES)
+            self._profiler.instrument(self, {"_get_observation": "get_observation"})
+            self._profiler.instrument(self.renderer, RENDERER_PHASES, "renderer.")
+            if self._obs_renderer is not self.renderer:
+                self._profiler.instrument(
+                    self._obs_renderer, RENDERER_PHASES, "obs_renderer."
+                )
+
+    def _draw_observation(
+        self, out: Optional[np.ndarray], max_pool: bool = False
+    ) -> np.ndarray:
+        if out is not None:
+            frame = self._obs_renderer.draw_frame(
+                out, layout=self._obs_layout, show_score=False
+            )
+        else:
+            self._obs_renderer.draw_surface(show_score=False)
+            frame = self._obs_renderer.get_frame(layout=self._obs_layout)
+
+        if max_pool:
+            np.maximum(frame, self._pool_frame, out=frame)
+        return frame
+
+    def _get_observation(
+        self, reset: bool = False, max_pool: bool = False
+    ) -> np.ndarray:
+        if self._frames is None:
+            return self._draw_observation(self._obs_buffer, max_pool)
+
+        k = self._frame_stack
+        i = 0 if reset else (self._frame_idx + 1) % k
+        self._frame_idx = i
+
+        frame = self._draw_observation(self._frames[i], max_pool)
+        if reset:
+            self._frames[1:] = frame
+        else:
+            self._frames[i + k] = frame
+
+        stack = self._frames[slice(i + 1, i + k + 1)]
+        if self._obs_buffer is not None:
+            np.copyto(self._obs_buffer, stack)
+            return self._obs_buffer
+        return stack
 
     def reset(self, seed=None, options=None):
         """Resets the environment (starts a new game)."""
         super().reset(seed=seed)
+        if self._profiler is not None:
+            self._profiler.reset()
+
+        # the pipe gaps drawn by the previous game are used unless reseeded
+        gap_buffer = None
+        if seed is None and self._game is not None:
+            gap_buffer = self._game.gap_buffer
 
-        self._game = FlappyBirdLogic(
+        self._game = self._game_cls(
             np_random=self.np_random,
             screen_size=self._screen_size,
             pipe_gap_size=self._pipe_gap,
+            hitmasks=self._hitmasks,
+            gap_buffer=gap_buffer,
+            course=self._next_course(options),
         )
 
         self.renderer.game = self._game
+        self._obs_renderer.game = self._game
         info = {"score": self._game.score}
-        return self._get_observation(), info
+        if self._courses is not None:
+            info["course"] = (self._course_idx - 1) % len(self._courses)
+        return self._get_observation(reset=True), info
+
+    def _next_course(self, options: Optional[dict]) -> Optional[np.ndarray]:
+        if self._courses is None:
+            return None
+
+        index = self._course_idx
+        if options is not None:
+            index = options.get("course", index)
+        self._course_idx = index + 1
+        return self._courses[index % len(self._courses)]
+
+    def get_profile(self) -> Dict[str, Dict[str, float]]:
+        """Returns the measurements of the phases of the current episode's
+        steps (see :meth:`.Profiler.stats()`), or an empty dictionary if the
+        environment isn't being profiled.
+        """
+        if self._profiler is None:
+            return {}
+        return self._profiler.stats()
+
+    def get_display_stats(self) -> Dict[str, int]:
+        """Returns the number of frames submitted to, presented by and dropped
+        by the display thread (see :meth:`.DisplayPresenter.stats()`), or an
+        empty dictionary if the environment doesn't have one (see
+        `async_display`).
+        """
+        renderer = self.renderer
+        if renderer is None or not renderer.async_display or not renderer.display:
+            return {}
+        return renderer.display.stats()
+
+    def get_state(self) -> GameState:
+        """Returns a snapshot of the current game's state (see
+        :meth:`.FlappyBirdLogic.get_state()`).
+        """
+        return self._game.get_state()
+
+    def set_state(self, state: GameState) -> None:
+        """Restores a snapshot of the state of a game, returned by
+        :meth:`.get_state()`, along with the environment's random number
+        generator. The environment must have been reset before.
+
+        With `frame_stack > 1`, the restored game is drawn and the frame stack
+        is filled with it, as on :meth:`.reset()`.
+        """
+        self._game.set_state(state)
+        if self._frames is not None:
+            self._get_observation(reset=True)
 
     def step(
         self,
@@ -125,9 +374,21 @@ class FlappyBirdEnvRGB(gymnasium.Env):
                 * an info dictionary
         """
         reward, alive = self._game.update_state(action)
-        obs = self._get_observation()
+        max_pool = False
+        for tick in range(1, self._frame_skip):
+            if not alive:
+                break
+            if tick == self._frame_skip - 1 and self._pool_frame is not None:
+                self._draw_observation(self._pool_frame)
+                max_pool = True
+            tick_reward, alive = self._game.update_state(action)
+            reward += tick_reward
+
+        obs = self._get_observation(max_pool=max_pool)
         done = not alive
         info = {"score": self._game.score}
+        if done and self._profiler is not None:
+            info["profile"] = self._profiler.stats()
 
         return obs, reward, done, False, info
 
@@ -147,8 +408,9 @@ class FlappyBirdEnvRGB(gymnasium.Env):
             it's "rgb_array"
         """
         self.renderer.draw_surface(show_score=True)
+        self.renderer.record_frame()
         if self.render_mode == "rgb_array":
-            return pygame.surfarray.array3d(self.renderer.surface)
+            return self.renderer.get_frame()
         else:
             if self.renderer.display is None:
                 self.renderer.make_display()
@@ -158,8 +420,12 @@ class FlappyBirdEnvRGB(gymnasium.Env):
     def close(self):
         """Closes the environment."""
         if self.renderer is not None:
-            pygame.display.quit()
-            pygame.quit()
-            self.renderer = None
+            try:
+                self.renderer.close()
+            finally:
+                pygame.display.quit()
+                pygame.quit()
+                self.renderer = None
+                self._obs_renderer = None
 
         super().close()
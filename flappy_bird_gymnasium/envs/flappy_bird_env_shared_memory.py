@@ -0,0 +1,372 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Implementation of a multiprocess vectorized Flappy Bird gymnasium environment
+that yields RGB-arrays representing the screens of its games as observations.
+"""
+
+import ctypes
+import multiprocessing
+import os
+import traceback
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import gymnasium
+import numpy as np
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+from flappy_bird_gymnasium.envs.flappy_bird_env_rgb import FlappyBirdEnvRGB
+
+
+def _shared_array(ctx, shape: Tuple[int, ...], dtype) -> Tuple[Any, np.ndarray]:
+    """Allocates a shared memory block and returns it with an array view of it."""
+    dtype = np.dtype(dtype)
+    block = ctx.RawArray(ctypes.c_uint8, max(1, int(np.prod(shape)) * dtype.itemsize))
+    return block, _array_view(block, shape, dtype)
+
+
+def _array_view(block, shape: Tuple[int, ...], dtype) -> np.ndarray:
+    """Returns an array view of a shared memory block."""
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape))
+    return np.frombuffer(block, dtype=dtype, count=count).reshape(shape)
+
+
+def _worker(
+    pipe,
+    parent_pipe,
+    env_kwargs: Dict[str, Any],
+    env_slice: slice,
+    blocks: Dict[str, Any],
+    shapes: Dict[str, Tuple[Tuple[int, ...], Any]],
+) -> None:
+    """Runs a group of sub-environments in a worker process.
+
+    The sub-environments draw their observations straight into the shared
+    observations block and read/write their actions, rewards, terminations and
+    scores from/to the other shared blocks. The pipe only carries the commands
+    sent by the parent process and the acknowledgements of the worker.
+    """
+    parent_pipe.close()
+    envs = []
+    try:
+        arrays = {
+            name: _array_view(blocks[name], *shapes[name])[env_slice] for name in blocks
+        }
+        observations = arrays["observations"]
+        actions = arrays["actions"]
+        rewards = arrays["rewards"]
+        terminations = arrays["terminations"]
+        scores = arrays["scores"]
+
+        envs = [
+            FlappyBirdEnvRGB(obs_buffer=observations[i], **env_kwargs)
+            for i in range(len(observations))
+        ]
+        autoreset = np.zeros(len(envs), dtype=bool)
+        pipe.send((True, None))
+
+        while True:
+            command, data = pipe.recv()
+            if command == "step":
+                for i, env in enumerate(envs):
+                    if autoreset[i]:
+                        _, info = env.reset()
+                        rewards[i] = 0
+                        terminations[i] = False
+                    else:
+                        _, reward, terminated, _, info = env.step(actions[i])
+                        rewards[i] = reward
+                        terminations[i] = terminated
+                    scores[i] = info["score"]
+                autoreset[:] = terminations
+            elif command == "reset":
+                seeds, reset_mask = data
+                for i, env in enumerate(envs):
+                    if reset_mask is None or reset_mask[i]:
+                        _, info = env.reset(seed=seeds[i])
+                        scores[i] = info["score"]
+                        autoreset[i] = False
+            elif command == "close":
+                pipe.send((True, None))
+                break
+            else:
+                raise RuntimeError(f'Unknown command "{command}"!')
+            pipe.send((True, None))
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception:
+        pipe.send((False, traceback.format_exc()))
+    finally:
+        for env in envs:
+            env.close()
+        pipe.close()
+
+
+class FlappyBirdSharedMemoryVectorEnv(gymnasium.vector.VectorEnv):
+    """Multiprocess vectorized Flappy Bird environment that yields images.
+
+    The sub-environments are instances of :class:`.FlappyBirdEnvRGB` split
+    among worker processes. All the observations live in a single shared
+    memory block with shape `(num_envs, *single_observation_shape)`, in which
+    each sub-environment draws its frames directly (through its `obs_buffer`),
+    so no frame is ever pickled or sent through a pipe. The actions, rewards,
+    terminations and scores are also kept in shared memory: on each step, the
+    parent process writes the actions, sends a short command to every worker
+    and waits for their acknowledgements.
+
+    Sub-environments whose episode ended are automatically reset on the next
+    call to :meth:`.step()` (the "next-step" autoreset mode of gymnasium's
+    vector environments). This environment doesn't render the games and the
+    sub-environments never play sounds.
+
+    Args:
+        num_envs (int): Number of sub-environments.
+        num_workers (Optional[int]): Number of worker processes. By default,
+            one per CPU core (but no more than `num_envs`).
+        copy (bool): If `True`, :meth:`.step()` and :meth:`.reset()` return a
+            copy of the shared observations. If `False`, they return the shared
+            array itself, which is overwritten by the following steps.
+        context (Optional[str]): Start method of the worker processes (see
+            `multiprocessing.get_context()`). If `None`, the default one is
+            used.
+        **kwargs: Arguments used to create each :class:`.FlappyBirdEnvRGB`.
+            Unless given, the "numpy" render backend is used.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        num_workers: Optional[int] = None,
+        copy: bool = True,
+        context: Optional[str] = None,
+        render_mode: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        if render_mode is not None:
+            raise ValueError(
+                f"{type(self).__name__} doesn't support rendering, but "
+                f'render_mode="{render_mode}" was given!'
+            )
+
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        num_workers = max(1, min(num_workers, num_envs))
+
+        # the observation buffers of the sub-environments are set by the workers
+        env_kwargs = dict(kwargs, audio_on=False)
+        env_kwargs.setdefault("render_backend", "numpy")
+        env_kwargs.pop("obs_buffer", None)
+        env_kwargs.pop("preallocate_obs", None)
+
+        env = FlappyBirdEnvRGB(**env_kwargs)
+        self.single_observation_space = gymnasium.spaces.Box(
+            0, 255, env.observation_space.shape, dtype=np.uint8
+        )
+        self.single_action_space = env.action_space
+        env.close()
+
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self.render_mode = render_mode
+        self.copy = copy
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        ctx = multiprocessing.get_context(context)
+        shapes = {
+            "observations": (
+                (num_envs, *self.single_observation_space.shape),
+                np.uint8,
+            ),
+            "actions": ((num_envs,), np.int64),
+            "rewards": ((num_envs,), np.float64),
+            "terminations": ((num_envs,), np.bool_),
+            "scores": ((num_envs,), np.int64),
+        }
+        blocks = {}
+        for name, (shape, dtype) in shapes.items():
+            blocks[name], array = _shared_array(ctx, shape, dtype)
+            setattr(self, f"_{name}", array)
+
+        self._parent_pipes = []
+        self._processes = []
+        self._bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        for start, stop in zip(self._bounds[:-1], self._bounds[1:]):
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name=f"{type(self).__name__}-worker-{len(self._processes)}",
+                args=(
+                    child_pipe,
+                    parent_pipe,
+                    env_kwargs,
+                    slice(start, stop),
+                    blocks,
+                    shapes,
+                ),
+                daemon=True,
+            )
+            self._parent_pipes.append(parent_pipe)
+            self._processes.append(process)
+            process.start()
+            child_pipe.close()
+
+        self._wait()
+
+    def _send(self, command: str, data: Any = None) -> None:
+        for pipe in self._parent_pipes:
+            pipe.send((command, data))
+
+    def _wait(self) -> None:
+        errors = []
+        for pipe in self._parent_pipes:
+            success, error = pipe.recv()
+            if not success:
+                errors.append(error)
+
+        if errors:
+            self.close(terminate=True)
+            raise RuntimeError(
+                f"{len(errors)} worker(s) of {type(self).__name__} failed:\n"
+                + "\n".join(errors)
+            )
+
+    def _get_observation(self) -> np.ndarray:
+        return self._observations.copy() if self.copy else self._observations
+
+    def _get_info(self) -> Dict[str, np.ndarray]:
+        return {
+            "score": self._scores.copy(),
+            "_score": np.ones(self.num_envs, dtype=bool),
+        }
+
+    def step(
+        self, actions: Union[np.ndarray, Sequence[int]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """Given an action for each sub-environment, updates the games' states.
+
+        Args:
+            actions (Union[np.ndarray, Sequence[int]]): The actions taken by the
+                agents, one for each sub-environment. Zero (0) means
+                "do nothing" and one (1) means "flap".
+
+        Returns:
+            A tuple containing, respectively, the batched observations, rewards,
+            terminations, truncations and info dictionary. Sub-environments that
+            are autoreset in this step yield their initial observation, a
+            reward of 0 and no termination.
+        """
+        self._actions[:] = actions
+        self._send("step")
+        self._wait()
+
+        return (
+            self._get_observation(),
+            self._rewards.copy(),
+            self._terminations.copy(),
+            np.zeros(self.num_envs, dtype=bool),
+            self._get_info(),
+        )
+
+    def reset(
+        self,
+        *,
+        seed: Optional[Union[int, List[Optional[int]]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Resets the sub-environments (starts new games).
+
+        Args:
+            seed (Optional[Union[int, List[Optional[int]]]]): Seeds used to
+                reset the sub-environments. If an `int`, the sub-environment at
+                index `i` is seeded with `seed + i`. If a list, it must contain
+                one seed (or `None`) for each sub-environment.
+            options (Optional[Dict[str, Any]]): If it contains a boolean array
+                under the key "reset_mask", only the sub-environments selected
+                by it are reset.
+
+        Returns:
+            The batched observations and the info dictionary.
+        """
+        if seed is None:
+            seed = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seed = [seed + i for i in range(self.num_envs)]
+        if len(seed) != self.num_envs:
+            raise ValueError(
+                f"If seeds are passed as a list, its length must match "
+                f"num_envs={self.num_envs}, but got length={len(seed)}."
+            )
+
+        reset_mask = None
+        if options is not None and "reset_mask" in options:
+            reset_mask = np.asarray(options["reset_mask"], dtype=bool)
+            if reset_mask.shape != (self.num_envs,):
+                raise ValueError(
+                    f"`options['reset_mask']` must have shape ({self.num_envs},),"
+                    f" got {reset_mask.shape}."
+                )
+
+        for pipe, start, stop in zip(
+            self._parent_pipes, self._bounds[:-1], self._bounds[1:]
+        ):
+            worker_mask = None if reset_mask is None else reset_mask[start:stop]
+            pipe.send(("reset", (seed[start:stop], worker_mask)))
+        self._wait()
+
+        return self._get_observation(), self._get_info()
+
+    def close_extras(self, terminate: bool = False) -> None:
+        """Stops the worker processes.
+
+        Args:
+            terminate (bool): If `True`, the workers are terminated instead of
+                being asked to close their sub-environments.
+        """
+        if not terminate:
+            for pipe in self._parent_pipes:
+                if not pipe.closed:
+                    pipe.send(("close", None))
+            for pipe in self._parent_pipes:
+                if not pipe.closed:
+                    try:
+                        pipe.recv()
+                    except EOFError:
+                        pass
+
+        for process in self._processes:
+            if terminate and process.is_alive():
+                process.terminate()
+        for pipe in self._parent_pipes:
+            pipe.close()
+        for process in self._processes:
+            process.join()
+
+    def __del__(self) -> None:
+        if not getattr(self, "closed", True) and hasattr(self, "_processes"):
+            self.close(terminate=True)
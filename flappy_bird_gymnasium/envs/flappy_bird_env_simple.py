@@ -29,8 +29,8 @@ from typing import Dict, Optional, Tuple, Union
 
 import gymnasium
 import numpy as np
-import pygame
 
+from flappy_bird_gymnasium.envs.courses import load_courses
 from flappy_bird_gymnasium.envs.game_logic import (
     PIPE_HEIGHT,
     PIPE_WIDTH,
@@ -38,8 +38,15 @@ from flappy_bird_gymnasium.envs.game_logic import (
     PLAYER_MAX_VEL_Y,
     PLAYER_WIDTH,
     FlappyBirdLogic,
+    GameState,
+)
+from flappy_bird_gymnasium.envs.hitmasks import get_hitmasks
+from flappy_bird_gymnasium.envs.lidar import Lidar
+from flappy_bird_gymnasium.envs.profiling import (
+    LOGIC_PHASES,
+    RENDERER_PHASES,
+    Profiler,
 )
-from flappy_bird_gymnasium.envs.renderer import FlappyBirdRenderer
 
 
 class FlappyBirdEnvSimple(gymnasium.Env):
@@ -56,10 +63,34 @@ class FlappyBirdEnvSimple(gymnasium.Env):
     by the agent in that step. A score point is obtained every time the bird
     passes a pipe.
 
+    Without a render mode, the environment doesn't create a renderer and
+    doesn't import pygame (unless `precise_collision` is `True`).
+
     Args:
         screen_size (Tuple[int, int]): The screen's width and height.
         normalize_obs (bool): If `True`, the observations will be normalized
             before being returned.
+        obs_dtype (type): Data type of the observations, e.g. `np.float32` to
+            halve their size.
+        obs_buffer (Optional[np.ndarray]): Preallocated array, with the shape
+            of the observation space and `obs_dtype` as its data type, in which
+            the observations are written. If given, every call to
+            :meth:`.step()` and :meth:`.reset()` overwrites and returns this
+            same array instead of allocating a new one.
+        preallocate_obs (bool): If `True` and `obs_buffer` is `None`, the
+            environment allocates its own observation buffer, which is then
+            overwritten and returned by every call to :meth:`.step()` and
+            :meth:`.reset()`.
+        use_lidar (bool): If `True`, the observations are, instead of the
+            features above, the distances from the bird to the obstacles along
+            a fan of rays, as far as the screen's width (see :class:`.Lidar`).
+            If `normalize_obs` is `True`, the distances are divided by the
+            screen's width.
+        lidar_rays (int): Number of rays cast when `use_lidar` is `True`.
+        frame_skip (int): Number of game ticks (frames) advanced by each step,
+            all with the step's action. The rewards of the ticks are summed
+            and the step ends early if the bird dies. Only the observation of
+            the last tick is computed.
         pipe_gap (int): Space between a lower and an upper pipe.
         bird_color (str): Color of the flappy bird. The currently available
             colors are "yellow", "blue" and "red".
@@ -68,6 +99,39 @@ class FlappyBirdEnvSimple(gymnasium.Env):
         background (Optional[str]): Type of background image. The currently
             available types are "day" and "night". If `None`, no background will
             be drawn.
+        render_backend (str): Backend used to draw the frames. Either "pygame"
+            or "numpy" (see :class:`.FlappyBirdRenderer`).
+        incremental_render (bool): If `True`, only the areas of the frames
+            that changed since the previous frame are redrawn (see
+            :class:`.FlappyBirdRenderer`).
+        async_display (bool): If `True`, in "human" render mode, the frames
+            are shown by a separate thread, so :meth:`.render()` never waits
+            for the display. Frames that the display can't keep up with are
+            dropped and counted (see :meth:`.get_display_stats()`).
+        render_layout (str): Memory layout of the frames returned by
+            :meth:`.render()` in "rgb_array" mode: "HWC" (height, width,
+            channels), "WHC" or "CHW".
+        render_buffer (Optional[np.ndarray]): Preallocated `uint8` array in
+            which the frames rendered in "rgb_array" mode are written. If
+            given, every call to :meth:`.render()` overwrites and returns this
+            same array instead of allocating a new one.
+        preallocate_render (bool): If `True` and `render_buffer` is `None`, the
+            environment allocates its own buffer for the rendered frames.
+        precise_collision (bool): If `True`, the bird only collides with a
+            pipe when the opaque pixels of their sprites overlap, instead of
+            their bounding boxes (see :class:`.Hitmasks`).
+        course_file (Optional[str]): Path of a `.npy` file with fixed courses
+            (see :mod:`.courses`). If given, each game plays one of its courses
+            instead of random pipes: the one with the index passed in the
+            `"course"` option of :meth:`.reset()` or, by default, the one after
+            the previous game's course. The index of the course played is
+            returned in the `"course"` entry of the reset's info dictionary.
+        profile (bool): If `True`, the number of calls and the time spent in
+            each phase of the game (its logic, the observations and the
+            rendering) are measured (see :class:`.Profiler`). The measurements of
+            the current episode are returned by :meth:`.get_profile()` and, in
+            the episode's last step, in the "profile" entry of the info
+            dictionary.
     """
 
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 30}
@@ -77,80 +141,168 @@ class FlappyBirdEnvSimple(gymnasium.Env):
         screen_size: Tuple[int, int] = (288, 512),
         audio_on: bool = True,
         normalize_obs: bool = True,
+        obs_dtype: type = np.float64,
+        obs_buffer: Optional[np.ndarray] = None,
+        preallocate_obs: bool = False,
+        use_lidar: bool = False,
+        lidar_rays: int = 180,
+        frame_skip: int = 1,
         pipe_gap: int = 100,
         bird_color: str = "yellow",
         pipe_color: str = "green",
         background: Optional[str] = "day",
         render_mode: Optional[str] = None,
+        render_backend: str = "pygame",
+        render_layout: str = "HWC",
+        render_buffer: Optional[np.ndarray] = None,
+        preallocate_render: bool = False,
+        incremental_render: bool = False,
+        async_display: bool = False,
+        precise_collision: bool = False,
+        course_file: Optional[str] = None,
+        profile: bool = False,
     ) -> None:
+        if frame_skip < 1:
+            raise ValueError(
+                f"The number of skipped frames must be positive, got {frame_skip}!"
+            )
+
         self.action_space = gymnasium.spaces.Discrete(2)
         self.observation_space = gymnasium.spaces.Box(
-            -np.inf, np.inf, shape=(12,), dtype=np.float64
+            -np.inf, np.inf, shape=(12,), dtype=obs_dtype
         )
         self._screen_size = screen_size
-        self._normalize_obs = normalize_obs
+        self._obs_dtype = obs_dtype
+        self._frame_skip = frame_skip
+
+        self._lidar = None
+        if use_lidar:
+            self._lidar = Lidar(num_rays=lidar_rays, max_distance=screen_size[0])
+            self._lidar_scale = screen_size[0] if normalize_obs else 1
+            self.observation_space = gymnasium.spaces.Box(
+                0,
+                screen_size[0] / self._lidar_scale,
+                shape=(lidar_rays,),
+                dtype=obs_dtype,
+            )
+
+        # Divisors of the horizontal positions, vertical positions, vertical
+        # velocity and rotation in the observations
+        self._obs_scales = (1, 1, 1, 1)
+        if normalize_obs:
+            self._obs_scales = (*screen_size, PLAYER_MAX_VEL_Y, 90)
+
+        if obs_buffer is None and preallocate_obs:
+            obs_buffer = np.empty(self.observation_space.shape, dtype=obs_dtype)
+        self._obs_buffer = obs_buffer
         self._pipe_gap = pipe_gap
         self._audio_on = audio_on
+        self._hitmasks = None
+        if precise_collision:
+            self._hitmasks = get_hitmasks(bird_color, pipe_color)
+
+        self._courses = None
+        self._course_idx = 0
+        if course_file is not None:
+            self._courses = load_courses(course_file)
 
         self._game = None
-        self.renderer = FlappyBirdRenderer(
-            screen_size=self._screen_size,
-            audio_on=audio_on,
-            bird_color=bird_color,
-            pipe_color=pipe_color,
-            background=background,
-        )
+        self.renderer = None
+        if render_mode is not None:
+            # pygame is only needed (and imported) when rendering
+            from flappy_bird_gymnasium.envs.renderer import FlappyBirdRenderer
+
+            self.renderer = FlappyBirdRenderer(
+                screen_size=self._screen_size,
+                audio_on=audio_on,
+                bird_color=bird_color,
+                pipe_color=pipe_color,
+                background=background,
+                render_backend=render_backend,
+                incremental=incremental_render,
+                async_display=async_display,
+            )
 
         self._bird_color = bird_color
         self._pipe_color = pipe_color
         self._bg_type = background
         self.render_mode = render_mode
 
-    def _get_observation(self):
-        pipes = []
-        for up_pipe, low_pipe in zip(self._game.upper_pipes, self._game.lower_pipes):
-            # the pipe is behind the screen?
-            if low_pipe["x"] > self._screen_size[0]:
-                pipes.append((self._screen_size[0], 0, self._screen_size[1]))
-            else:
-                pipes.append(
-                    (low_pipe["x"], (up_pipe["y"] + PIPE_HEIGHT), low_pipe["y"])
-                )
+        self._render_layout = render_layout
+        if render_buffer is None and preallocate_render:
+            from flappy_bird_gymnasium.envs.renderer import frame_shape
 
-        pipes = sorted(pipes, key=lambda x: x[0])
-        pos_y = self._game.player_y
-        vel_y = self._game.player_vel_y
-        rot = self._game.player_rot
-
-        if self._normalize_obs:
-            pipes = [
-                (
-                    h / self._screen_size[0],
-                    v1 / self._screen_size[1],
-                    v2 / self._screen_size[1],
-                )
-                for h, v1, v2 in pipes
-            ]
-            pos_y = pos_y / self._screen_size[1]
-            vel_y /= PLAYER_MAX_VEL_Y
-            rot /= 90
-
-        return np.array(
-            [
-                pipes[0][0],  # the last pipe's horizontal position
-                pipes[0][1],  # the last top pipe's vertical position
-                pipes[0][2],  # the last bottom pipe's vertical position
-                pipes[1][0],  # the next pipe's horizontal position
-                pipes[1][1],  # the next top pipe's vertical position
-                pipes[1][2],  # the next bottom pipe's vertical position
-                pipes[2][0],  # the next next pipe's horizontal position
-                pipes[2][1],  # the next next top pipe's vertical position
-                pipes[2][2],  # the next next bottom pipe's vertical position
-                pos_y,  # player's vertical position
-                vel_y,  # player's vertical velocity
-                rot,  # player's rotation
-            ]
+            render_buffer = np.empty(
+                frame_shape(screen_size, render_layout), dtype=np.uint8
+            )
+        self._render_buffer = render_buffer
+
+        self._profiler = None
+        self._game_cls = FlappyBirdLogic
+        if profile:
+            self._profiler = Profiler()
+            self._game_cls = self._profiler.subclass(FlappyBirdLogic, LOGIC_PHASES)
+            self._profiler.instrument(self, {"_get_observation": "get_observation"})
+            if self.renderer is not None:
+                self._profiler.instrument(self.renderer, RENDERER_PHASES, "renderer.")
+
+    def _get_observation(self) -> np.ndarray:
+        if self._lidar is not None:
+            return self._get_lidar_observation()
+
+        game = self._game
+        width, height = self._screen_size
+        x_scale, y_scale, vel_scale, rot_scale = self._obs_scales
+
+        # Pipes behind the screen are reported as (width, 0, height) and the
+        # pipes are sorted (stably) by their horizontal positions
+        pipes_x = game.pipes_x
+        x0 = min(pipes_x[0], width)
+        x1 = min(pipes_x[1], width)
+        x2 = min(pipes_x[2], width)
+        i0, i1, i2 = 0, 1, 2
+        if x1 < x0:
+            i0, i1, x0, x1 = i1, i0, x1, x0
+        if x2 < x1:
+            i1, i2, x1, x2 = i2, i1, x2, x1
+            if x1 < x0:
+                i0, i1, x0, x1 = i1, i0, x1, x0
+
+        upper_y = game.upper_pipes_y
+        lower_y = game.lower_pipes_y
+        hidden = pipes_x[i0] > width, pipes_x[i1] > width, pipes_x[i2] > width
+
+        obs = self._obs_buffer
+        if obs is None:
+            obs = np.empty(12, dtype=self._obs_dtype)
+        obs[...] = (
+            # the last pipe's horizontal position and its top and bottom pipes'
+            # vertical positions
+            x0 / x_scale,
+            0 if hidden[0] else (upper_y[i0] + PIPE_HEIGHT) / y_scale,
+            height / y_scale if hidden[0] else lower_y[i0] / y_scale,
+            # the next pipe's
+            x1 / x_scale,
+            0 if hidden[1] else (upper_y[i1] + PIPE_HEIGHT) / y_scale,
+            height / y_scale if hidden[1] else lower_y[i1] / y_scale,
+            # the next next pipe's
+            x2 / x_scale,
+            0 if hidden[2] else (upper_y[i2] + PIPE_HEIGHT) / y_scale,
+            height / y_scale if hidden[2] else lower_y[i2] / y_scale,
+            game.player_y / y_scale,  # player's vertical position
+            game.player_vel_y / vel_scale,  # player's vertical velocity
+            game.player_rot / rot_scale,  # player's rotation
         )
+        return obs
+
+    def _get_lidar_observation(self) -> np.ndarray:
+        obs = self._obs_buffer
+        if obs is None:
+            obs = np.empty(self.observation_space.shape, dtype=self._obs_dtype)
+        self._lidar.scan(self._game, out=obs)
+        if self._lidar_scale != 1:
+            obs /= self._lidar_scale
+        return obs
 
     def step(
         self,
@@ -174,27 +326,90 @@ class FlappyBirdEnvSimple(gymnasium.Env):
                 * an info dictionary
         """
         reward, alive = self._game.update_state(action)
+        for _ in range(1, self._frame_skip):
+            if not alive:
+                break
+            tick_reward, alive = self._game.update_state(action)
+            reward += tick_reward
+
         obs = self._get_observation()
         done = not alive
         info = {"score": self._game.score}
+        if done and self._profiler is not None:
+            info["profile"] = self._profiler.stats()
 
         return obs, reward, done, False, info
 
     def reset(self, seed=None, options=None):
         """Resets the environment (starts a new game)."""
         super().reset(seed=seed)
+        if self._profiler is not None:
+            self._profiler.reset()
+
+        # the pipe gaps drawn by the previous game are used unless reseeded
+        gap_buffer = None
+        if seed is None and self._game is not None:
+            gap_buffer = self._game.gap_buffer
 
-        self._game = FlappyBirdLogic(
+        self._game = self._game_cls(
             np_random=self.np_random,
             screen_size=self._screen_size,
             pipe_gap_size=self._pipe_gap,
+            hitmasks=self._hitmasks,
+            gap_buffer=gap_buffer,
+            course=self._next_course(options),
         )
         if self.renderer is not None:
             self.renderer.game = self._game
 
         info = {"score": self._game.score}
+        if self._courses is not None:
+            info["course"] = (self._course_idx - 1) % len(self._courses)
         return self._get_observation(), info
 
+    def _next_course(self, options: Optional[dict]) -> Optional[np.ndarray]:
+        if self._courses is None:
+            return None
+
+        index = self._course_idx
+        if options is not None:
+            index = options.get("course", index)
+        self._course_idx = index + 1
+        return self._courses[index % len(self._courses)]
+
+    def get_profile(self) -> Dict[str, Dict[str, float]]:
+        """Returns the measurements of the phases of the current episode's
+        steps (see :meth:`.Profiler.stats()`), or an empty dictionary if the
+        environment isn't being profiled.
+        """
+        if self._profiler is None:
+            return {}
+        return self._profiler.stats()
+
+    def get_display_stats(self) -> Dict[str, int]:
+        """Returns the number of frames submitted to, presented by and dropped
+        by the display thread (see :meth:`.DisplayPresenter.stats()`), or an
+        empty dictionary if the environment doesn't have one (see
+        `async_display`).
+        """
+        renderer = self.renderer
+        if renderer is None or not renderer.async_display or not renderer.display:
+            return {}
+        return renderer.display.stats()
+
+    def get_state(self) -> GameState:
+        """Returns a snapshot of the current game's state (see
+        :meth:`.FlappyBirdLogic.get_state()`).
+        """
+        return self._game.get_state()
+
+    def set_state(self, state: GameState) -> None:
+        """Restores a snapshot of the state of a game, returned by
+        :meth:`.get_state()`, along with the environment's random number
+        generator. The environment must have been reset before.
+        """
+        self._game.set_state(state)
+
     def set_color(self, color):
         if self.renderer is not None:
             self.renderer.set_color(color)
@@ -209,13 +424,20 @@ class FlappyBirdEnvSimple(gymnasium.Env):
                 f'e.g. gym.make("{self.spec.id}", render_mode="rgb_array")'
             )
             return
-        self.renderer.draw_surface(show_score=True)
         if self.render_mode == "rgb_array":
-            return np.transpose(
-                np.array(pygame.surfarray.pixels3d(self.renderer.surface)),
-                axes=(1, 0, 2),
-            )
+            if self._render_buffer is not None:
+                frame = self.renderer.draw_frame(
+                    self._render_buffer, layout=self._render_layout
+                )
+                self.renderer.record_frame(frame, layout=self._render_layout)
+                return frame
+
+            self.renderer.draw_surface(show_score=True)
+            self.renderer.record_frame()
+            return self.renderer.get_frame(layout=self._render_layout)
         else:
+            self.renderer.draw_surface(show_score=True)
+            self.renderer.record_frame()
             if self.renderer.display is None:
                 self.renderer.make_display()
 
@@ -224,6 +446,11 @@ class FlappyBirdEnvSimple(gymnasium.Env):
     def close(self):
         """Closes the environment."""
         if self.renderer is not None:
-            pygame.display.quit()
-            pygame.quit()
+            import pygame
+
+            try:
+                self.renderer.close()
+            finally:
+                pygame.display.quit()
+                pygame.quit()
         super().close()
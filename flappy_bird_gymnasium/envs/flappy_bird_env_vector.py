@@ -0,0 +1,240 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Implementation of a vectorized Flappy Bird gymnasium environment that yields
+simple numerical information about the state of each of its games as
+observations.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import gymnasium
+import numpy as np
+from gymnasium.utils import seeding
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+
+from flappy_bird_gymnasium.envs.batched_game_logic import BatchedFlappyBirdLogic
+from flappy_bird_gymnasium.envs.game_logic import PIPE_HEIGHT, PLAYER_MAX_VEL_Y
+from flappy_bird_gymnasium.envs.hitmasks import get_hitmasks
+
+
+class FlappyBirdVectorEnv(gymnasium.vector.VectorEnv):
+    """Vectorized Flappy Bird environment that yields simple observations.
+
+    All the games are stored in a single :class:`.BatchedFlappyBirdLogic` and
+    stepped together. The observation of each game is the same as the one
+    yielded by :class:`.FlappyBirdEnvSimple`, and the observations of all the
+    games are returned as one array with shape `(num_envs, 12)`.
+
+    Each sub-environment has its own random number generator, so a
+    sub-environment reset with a seed yields the same game as a
+    :class:`.FlappyBirdEnvSimple` reset with that seed. Sub-environments whose
+    episode ended are automatically reset on the next call to :meth:`.step()`
+    (the "next-step" autoreset mode of gymnasium's vector environments).
+
+    This environment doesn't render the games. The arguments related to the
+    rendering are accepted for compatibility with
+    :class:`.FlappyBirdEnvSimple`, but are ignored.
+
+    Args:
+        num_envs (int): Number of sub-environments.
+        screen_size (Tuple[int, int]): The screen's width and height.
+        normalize_obs (bool): If `True`, the observations will be normalized
+            before being returned.
+        obs_dtype (type): Data type of the observations.
+        pipe_gap (int): Space between a lower and an upper pipe.
+        precise_collision (bool): If `True`, the bird only collides with a
+            pipe when the opaque pixels of their sprites overlap, instead of
+            their bounding boxes (see :class:`.Hitmasks`).
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.NEXT_STEP}
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        screen_size: Tuple[int, int] = (288, 512),
+        audio_on: bool = True,
+        normalize_obs: bool = True,
+        obs_dtype: type = np.float64,
+        pipe_gap: int = 100,
+        bird_color: str = "yellow",
+        pipe_color: str = "green",
+        background: Optional[str] = "day",
+        render_mode: Optional[str] = None,
+        precise_collision: bool = False,
+    ) -> None:
+        if render_mode is not None:
+            raise ValueError(
+                f"{type(self).__name__} doesn't support rendering, but "
+                f'render_mode="{render_mode}" was given!'
+            )
+
+        self.num_envs = num_envs
+        self.render_mode = render_mode
+        self.single_action_space = gymnasium.spaces.Discrete(2)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.single_observation_space = gymnasium.spaces.Box(
+            -np.inf, np.inf, shape=(12,), dtype=obs_dtype
+        )
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+
+        self._screen_size = screen_size
+        self._normalize_obs = normalize_obs
+        self._pipe_gap = pipe_gap
+        self._hitmasks = None
+        if precise_collision:
+            self._hitmasks = get_hitmasks(bird_color, pipe_color)
+
+        self._game = BatchedFlappyBirdLogic(
+            np_randoms=[seeding.np_random()[0] for _ in range(num_envs)],
+            screen_size=self._screen_size,
+            pipe_gap_size=self._pipe_gap,
+            hitmasks=self._hitmasks,
+        )
+        self._autoreset_envs = np.zeros(num_envs, dtype=bool)
+        self._rows = np.arange(num_envs)[:, np.newaxis]
+
+    def _get_observation(self) -> np.ndarray:
+        game = self._game
+        screen_width, screen_height = self._screen_size
+
+        # pipes behind the screen are reported as (screen_width, 0, screen_height)
+        hidden = game.pipes_x > screen_width
+        order = np.argsort(game.pipes_x, axis=1, kind="stable")
+        pipes_x = np.where(hidden, screen_width, game.pipes_x)[self._rows, order]
+        upper_y = np.where(hidden, 0, game.upper_pipes_y + PIPE_HEIGHT)[
+            self._rows, order
+        ]
+        lower_y = np.where(hidden, screen_height, game.lower_pipes_y)[self._rows, order]
+
+        obs = np.empty(self.observation_space.shape, dtype=self.observation_space.dtype)
+        obs[:, 0:9:3] = pipes_x
+        obs[:, 1:9:3] = upper_y
+        obs[:, 2:9:3] = lower_y
+        obs[:, 9] = game.player_y
+        obs[:, 10] = game.player_vel_y
+        obs[:, 11] = game.player_rot
+
+        if self._normalize_obs:
+            obs[:, 0:9:3] /= screen_width
+            obs[:, 1:9:3] /= screen_height
+            obs[:, 2:9:3] /= screen_height
+            obs[:, 9] /= screen_height
+            obs[:, 10] /= PLAYER_MAX_VEL_Y
+            obs[:, 11] /= 90
+
+        return obs
+
+    def _get_info(self) -> Dict[str, np.ndarray]:
+        return {
+            "score": self._game.score.copy(),
+            "_score": np.ones(self.num_envs, dtype=bool),
+        }
+
+    def step(
+        self, actions: Union[np.ndarray, Sequence[int]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        """Given an action for each sub-environment, updates the games' states.
+
+        Args:
+            actions (Union[np.ndarray, Sequence[int]]): The actions taken by the
+                agents, one for each sub-environment. Zero (0) means
+                "do nothing" and one (1) means "flap".
+
+        Returns:
+            A tuple containing, respectively, the batched observations, rewards,
+            terminations, truncations and info dictionary. Sub-environments that
+            are autoreset in this step yield their initial observation, a
+            reward of 0 and no termination.
+        """
+        rewards, alive = self._game.update_state(actions)
+        terminations = ~alive
+
+        autoreset = self._autoreset_envs
+        if autoreset.any():
+            self._game.reset(autoreset)
+            terminations[autoreset] = False
+
+        self._autoreset_envs = terminations.copy()
+        truncations = np.zeros(self.num_envs, dtype=bool)
+        return (
+            self._get_observation(),
+            rewards,
+            terminations,
+            truncations,
+            (self._get_info()),
+        )
+
+    def reset(
+        self,
+        *,
+        seed: Optional[Union[int, List[Optional[int]]]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Resets the sub-environments (starts new games).
+
+        Args:
+            seed (Optional[Union[int, List[Optional[int]]]]): Seeds used to
+                reset the sub-environments. If an `int`, the sub-environment at
+                index `i` is seeded with `seed + i`. If a list, it must contain
+                one seed (or `None`) for each sub-environment.
+            options (Optional[Dict[str, Any]]): If it contains a boolean array
+                under the key "reset_mask", only the sub-environments selected
+                by it are reset.
+
+        Returns:
+            The batched observations and the info dictionary.
+        """
+        if seed is None:
+            seed = [None] * self.num_envs
+        elif isinstance(seed, int):
+            seed = [seed + i for i in range(self.num_envs)]
+        if len(seed) != self.num_envs:
+            raise ValueError(
+                f"If seeds are passed as a list, its length must match "
+                f"num_envs={self.num_envs}, but got length={len(seed)}."
+            )
+
+        reset_mask = None
+        if options is not None and "reset_mask" in options:
+            reset_mask = np.asarray(options["reset_mask"], dtype=bool)
+            if reset_mask.shape != (self.num_envs,):
+                raise ValueError(
+                    f"`options['reset_mask']` must have shape ({self.num_envs},),"
+                    f" got {reset_mask.shape}."
+                )
+
+        for i, single_seed in enumerate(seed):
+            if single_seed is not None and (reset_mask is None or reset_mask[i]):
+                self._game.set_np_random(i, seeding.np_random(single_seed)[0])
+
+        self._game.reset(reset_mask)
+        if reset_mask is None:
+            self._autoreset_envs[:] = False
+        else:
+            self._autoreset_envs[reset_mask] = False
+
+        return self._get_observation(), self._get_info()
@@ -31,10 +31,20 @@ released under the MIT license.
 
 
 from enum import IntEnum
-from itertools import cycle
-from typing import Dict, Tuple, Union
-
-import pygame
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from flappy_bird_gymnasium.envs.hitmasks import Hitmasks
 
 ############################ Speed and Acceleration ############################
 PIPE_VEL_X = -4
@@ -44,6 +54,8 @@ PLAYER_MIN_VEL_Y = -8  # min vel along Y, max ascend speed
 
 PLAYER_ACC_Y = 1  # players downward acceleration
 PLAYER_VEL_ROT = 3  # angular speed
+PLAYER_FLAP_ROT = 45  # rotation set on flapping
+PLAYER_ROT_THR = 20  # max rotation at which the player is drawn
 
 PLAYER_FLAP_ACC = -9  # players speed on flapping
 ################################################################################
@@ -63,16 +75,78 @@ BACKGROUND_WIDTH = 288
 BACKGROUND_HEIGHT = 512
 ################################################################################
 
+#: Number of pipes (upper and lower pair) present at any time in a game.
+NUM_PIPES = 3
+
+# Sequence of the bird's animation frames:
+_PLAYER_IDX_CYCLE = (0, 1, 2, 1)
+
+
+class GameState(NamedTuple):
+    """Snapshot of the state of a game, returned by
+    :meth:`.FlappyBirdLogic.get_state()`.
+
+    It has a fixed number of fields, all of them immutable except for
+    `rng_state`, a dictionary with the state of the random number generator's
+    bit generator (see :attr:`numpy.random.BitGenerator.state`). The
+    `gap_buffer` holds the pipe gaps already drawn from the generator, or is
+    `None` if the game plays a fixed course.
+    """
+
+    player_y: float
+    player_vel_y: int
+    player_rot: int
+    player_flapped: bool
+    player_idx: int
+    player_idx_pos: int
+    loop_iter: int
+    base_x: int
+    score: int
+    pipes_x: Tuple[float, ...]
+    upper_pipes_y: Tuple[int, ...]
+    lower_pipes_y: Tuple[int, ...]
+    gap_buffer: Optional[Tuple[int, ...]]
+    gap_ptr: int
+    last_action: Optional[int]
+    sound_cache: Optional[str]
+    rng_state: Dict[str, Any]
+
 
 class FlappyBirdLogic:
     """Handles the logic of the Flappy Bird game.
 
     The implementation of this class is decoupled from the implementation of the
-    game's graphics. This class implements the logical portion of the game.
+    game's graphics. This class implements the logical portion of the game and
+    doesn't depend on pygame.
+
+    The state is kept in slots, and the pipes in fixed-size lists of numbers
+    (one element per upper and lower pair of pipes). Collisions are checked with
+    integer arithmetic, and only against the pipes that are horizontally in
+    front of the player.
+
+    The pipe gaps are drawn from the random number generator in bulk, into a
+    buffer that is refilled when exhausted (which yields the same pipes as
+    drawing them one at a time), or are read from a fixed course (see
+    :mod:`.courses`).
 
     Args:
+        np_random (np.random.Generator): Random number generator used to draw
+            the pipe gaps.
         screen_size (Tuple[int, int]): Tuple with the screen's width and height.
         pipe_gap_size (int): Space between a lower and an upper pipe.
+        hitmasks (Optional[Hitmasks]): If given, the player only collides with
+            a pipe when the opaque pixels of their sprites (as drawn, with the
+            player's rotation) overlap. Otherwise, the collisions are checked
+            with the sprites' bounding boxes.
+        gap_buffer_size (int): Number of pipe gaps drawn from the random number
+            generator at once.
+        gap_buffer (Optional[Sequence[int]]): Pipe gaps already drawn from the
+            random number generator (e.g. the :attr:`.gap_buffer` of a previous
+            game), used before drawing new ones.
+        course (Optional[Sequence[int]]): If given, the y positions of the gaps
+            (of their upper edges) of the successive pipes, used instead of
+            random ones. The course is repeated if the player passes all of its
+            pipes.
 
     Attributes:
         player_x (int): The player's x position.
@@ -80,12 +154,10 @@ class FlappyBirdLogic:
         base_x (int): The base/ground's x position.
         base_y (int): The base/ground's y position.
         score (int): Current score of the player.
-        upper_pipes (List[Dict[str, int]): List with the upper pipes. Each pipe
-            is represented by a dictionary containing two keys: "x" (the pipe's
-            x position) and "y" (the pipe's y position).
-        lower_pipes (List[Dict[str, int]): List with the lower pipes. Each pipe
-            is represented by a dictionary containing two keys: "x" (the pipe's
-            x position) and "y" (the pipe's y position).
+        pipes_x (List[float]): The x positions of the pipes. An upper pipe and
+            its lower pipe share the same x position.
+        upper_pipes_y (List[int]): The y positions of the upper pipes.
+        lower_pipes_y (List[int]): The y positions of the lower pipes.
         player_vel_y (int): The player's vertical velocity.
         player_rot (int): The player's rotation angle.
         last_action (Optional[FlappyBirdLogic.Actions]): The last action taken
@@ -95,8 +167,47 @@ class FlappyBirdLogic:
         player_idx (int): Current index of the bird's animation cycle.
     """
 
+    __slots__ = (
+        "_screen_width",
+        "_screen_height",
+        "player_x",
+        "player_y",
+        "base_x",
+        "base_y",
+        "_base_shift",
+        "score",
+        "_pipe_gap_size",
+        "_gap_high",
+        "_gap_offset",
+        "_pipe_spawn_x",
+        "_np_random",
+        "_gap_buffer_size",
+        "_course",
+        "_gaps",
+        "_gap_ptr",
+        "_hitmasks",
+        "pipes_x",
+        "upper_pipes_y",
+        "lower_pipes_y",
+        "player_vel_y",
+        "player_rot",
+        "last_action",
+        "sound_cache",
+        "_player_flapped",
+        "player_idx",
+        "_player_idx_pos",
+        "_loop_iter",
+    )
+
     def __init__(
-        self, np_random, screen_size: Tuple[int, int], pipe_gap_size: int = 100
+        self,
+        np_random,
+        screen_size: Tuple[int, int],
+        pipe_gap_size: int = 100,
+        hitmasks: Optional["Hitmasks"] = None,
+        gap_buffer_size: int = 64,
+        gap_buffer: Optional[Sequence[int]] = None,
+        course: Optional[Sequence[int]] = None,
     ) -> None:
         self._screen_width = screen_size[0]
         self._screen_height = screen_size[1]
@@ -110,50 +221,42 @@ class FlappyBirdLogic:
 
         self.score = 0
         self._pipe_gap_size = pipe_gap_size
+        self._gap_high = int(self.base_y * 0.6 - self._pipe_gap_size)
+        self._gap_offset = int(self.base_y * 0.2)
+        self._pipe_spawn_x = (
+            self._screen_width + PIPE_WIDTH + (self._screen_width * 0.2)
+        )
 
         self._np_random = np_random
-
-        # Generate 3 new pipes to add to upper_pipes and lower_pipes lists
-        new_pipe1 = self._get_random_pipe()
-        new_pipe2 = self._get_random_pipe()
-        new_pipe3 = self._get_random_pipe()
-
-        # List of upper pipes:
-        self.upper_pipes = [
-            {"x": self._screen_width + 200, "y": new_pipe1[0]["y"]},
-            {
-                "x": self._screen_width + 200 + (self._screen_width / 2),
-                "y": new_pipe2[0]["y"],
-            },
-            {
-                "x": self._screen_width + 200 + self._screen_width,
-                "y": new_pipe3[0]["y"],
-            },
-        ]
-
-        # List of lower pipes:
-        self.lower_pipes = [
-            {"x": self._screen_width + 200, "y": new_pipe1[1]["y"]},
-            {
-                "x": self._screen_width + 200 + (self._screen_width / 2),
-                "y": new_pipe2[1]["y"],
-            },
-            {
-                "x": self._screen_width + 200 + self._screen_width,
-                "y": new_pipe3[1]["y"],
-            },
+        self._hitmasks = hitmasks
+
+        # Gaps of the next pipes:
+        self._gap_buffer_size = gap_buffer_size
+        self._course = course
+        self._gaps = list(gap_buffer or []) if course is None else course
+        self._gap_ptr = 0
+
+        # Generate 3 new pipes:
+        self.pipes_x = [
+            self._screen_width + 200,
+            self._screen_width + 200 + (self._screen_width / 2),
+            self._screen_width + 200 + self._screen_width,
         ]
+        self.upper_pipes_y = [0] * NUM_PIPES
+        self.lower_pipes_y = [0] * NUM_PIPES
+        for i in range(NUM_PIPES):
+            self.upper_pipes_y[i], self.lower_pipes_y[i] = self._get_random_pipe()
 
         # Player's info:
         self.player_vel_y = -9  # player"s velocity along Y
-        self.player_rot = 45  # player"s rotation
+        self.player_rot = PLAYER_FLAP_ROT  # player"s rotation
 
         self.last_action = None
         self.sound_cache = None
 
         self._player_flapped = False
         self.player_idx = 0
-        self._player_idx_gen = cycle([0, 1, 2, 1])
+        self._player_idx_pos = 0
         self._loop_iter = 0
 
     class Actions(IntEnum):
@@ -161,45 +264,154 @@ class FlappyBirdLogic:
 
         IDLE, FLAP = 0, 1
 
-    def _get_random_pipe(self) -> Dict[str, int]:
-        """Returns a randomly generated pipe."""
-        # y of gap between upper and lower pipe
-        gap_y = self._np_random.integers(
-            0, int(self.base_y * 0.6 - self._pipe_gap_size)
+    @property
+    def upper_pipes(self) -> List[Dict[str, float]]:
+        """List with the upper pipes. Each pipe is represented by a new
+        dictionary containing two keys: "x" (the pipe's x position) and "y"
+        (the pipe's y position).
+        """
+        return [{"x": x, "y": y} for x, y in zip(self.pipes_x, self.upper_pipes_y)]
+
+    @property
+    def lower_pipes(self) -> List[Dict[str, float]]:
+        """List with the lower pipes. Each pipe is represented by a new
+        dictionary containing two keys: "x" (the pipe's x position) and "y"
+        (the pipe's y position).
+        """
+        return [{"x": x, "y": y} for x, y in zip(self.pipes_x, self.lower_pipes_y)]
+
+    @property
+    def gap_buffer(self) -> Optional[List[int]]:
+        """The pipe gaps drawn from the random number generator but not used
+        yet, or `None` if the game plays a fixed course.
+        """
+        if self._course is not None:
+            return None
+        return self._gaps[slice(self._gap_ptr, None)]
+
+    def get_state(self) -> GameState:
+        """Returns a snapshot of the game's state.
+
+        The snapshot includes the state of the random number generator, so a
+        game restored from it (see :meth:`.set_state()`) generates the same
+        pipes as this one. The screen size and pipe gap aren't included.
+        """
+        return GameState(
+            self.player_y,
+            self.player_vel_y,
+            self.player_rot,
+            self._player_flapped,
+            self.player_idx,
+            self._player_idx_pos,
+            self._loop_iter,
+            self.base_x,
+            self.score,
+            tuple(self.pipes_x),
+            tuple(self.upper_pipes_y),
+            tuple(self.lower_pipes_y),
+            None if self._course is not None else tuple(self._gaps),
+            self._gap_ptr,
+            self.last_action,
+            self.sound_cache,
+            self._np_random.bit_generator.state,
         )
-        gap_y += int(self.base_y * 0.2)
 
-        pipe_x = self._screen_width + PIPE_WIDTH + (self._screen_width * 0.2)
-        return [
-            {"x": pipe_x, "y": gap_y - PIPE_HEIGHT},  # upper pipe
-            {"x": pipe_x, "y": gap_y + self._pipe_gap_size},  # lower pipe
-        ]
+    def set_state(self, state: GameState) -> None:
+        """Restores a snapshot of the state of a game with the same screen size,
+        pipe gap and course, returned by :meth:`.get_state()`.
+
+        The state of the random number generator is restored as well, in place,
+        so the generator's other users (e.g. an environment sharing it) are
+        affected too.
+        """
+        (
+            self.player_y,
+            self.player_vel_y,
+            self.player_rot,
+            self._player_flapped,
+            self.player_idx,
+            self._player_idx_pos,
+            self._loop_iter,
+            self.base_x,
+            self.score,
+            self.pipes_x[:],
+            self.upper_pipes_y[:],
+            self.lower_pipes_y[:],
+            gap_buffer,
+            self._gap_ptr,
+            self.last_action,
+            self.sound_cache,
+            self._np_random.bit_generator.state,
+        ) = state
+
+        if gap_buffer is not None:
+            self._gaps = list(gap_buffer)
+
+    def _get_random_pipe(self) -> Tuple[int, int]:
+        """Returns the y positions of a randomly generated pair of pipes."""
+        if self._gap_ptr == len(self._gaps):
+            if self._course is None:
+                gaps = self._np_random.integers(
+                    0, self._gap_high, size=self._gap_buffer_size
+                )
+                self._gaps = (gaps + self._gap_offset).tolist()
+            self._gap_ptr = 0
+
+        # y of gap between upper and lower pipe
+        gap_y = int(self._gaps[self._gap_ptr])
+        self._gap_ptr += 1
+        return gap_y - PIPE_HEIGHT, gap_y + self._pipe_gap_size
 
     def check_crash(self) -> bool:
-        """Returns True if player collides with the ground (base) or a pipe."""
+        """Returns True if player collides with the ground (base) or a pipe.
+
+        The positions are truncated to integers, like the ones of the drawn
+        sprites, and a pipe is only checked if it's horizontally in front of
+        the player.
+        """
         # if player crashes into ground
         if self.player_y + PLAYER_HEIGHT >= self.base_y - 1:
             return True
+
+        hitmasks = self._hitmasks
+        if hitmasks is None:
+            player_width, player_height = PLAYER_WIDTH, PLAYER_HEIGHT
         else:
-            player_rect = pygame.Rect(
-                self.player_x, self.player_y, PLAYER_WIDTH, PLAYER_HEIGHT
+            player_mask = hitmasks.player(
+                self.player_idx, min(self.player_rot, PLAYER_ROT_THR)
+            )
+            player_width, player_height = player_mask.shape
+
+        player_x = int(self.player_x)
+        player_y = int(self.player_y)
+        for pipe_x, up_y, low_y in zip(
+            self.pipes_x, self.upper_pipes_y, self.lower_pipes_y
+        ):
+            pipe_x = int(pipe_x)
+            if pipe_x >= player_x + player_width or player_x >= pipe_x + PIPE_WIDTH:
+                continue
+
+            # check collision
+            up_collide = up_y < player_y + player_height and player_y < up_y + (
+                PIPE_HEIGHT
+            )
+            low_collide = low_y < player_y + player_height and player_y < low_y + (
+                PIPE_HEIGHT
             )
 
-            for up_pipe, low_pipe in zip(self.upper_pipes, self.lower_pipes):
-                # upper and lower pipe rects
-                up_pipe_rect = pygame.Rect(
-                    up_pipe["x"], up_pipe["y"], PIPE_WIDTH, PIPE_HEIGHT
+            if hitmasks is not None:
+                # only the opaque pixels of the sprites count
+                up_mask, low_mask = hitmasks.pipe
+                player_pos = (player_x, player_y)
+                up_collide = up_collide and hitmasks.overlap(
+                    player_mask, player_pos, up_mask, (pipe_x, up_y)
                 )
-                low_pipe_rect = pygame.Rect(
-                    low_pipe["x"], low_pipe["y"], PIPE_WIDTH, PIPE_HEIGHT
+                low_collide = low_collide and hitmasks.overlap(
+                    player_mask, player_pos, low_mask, (pipe_x, low_y)
                 )
 
-                # check collision
-                up_collide = player_rect.colliderect(up_pipe_rect)
-                low_collide = player_rect.colliderect(low_pipe_rect)
-
-                if up_collide or low_collide:
-                    return True
+            if up_collide or low_collide:
+                return True
 
         return False
 
@@ -230,8 +442,8 @@ class FlappyBirdLogic:
 
         # check for score
         player_mid_pos = self.player_x + PLAYER_WIDTH / 2
-        for pipe in self.upper_pipes:
-            pipe_mid_pos = pipe["x"] + PIPE_WIDTH / 2
+        for pipe_x in self.pipes_x:
+            pipe_mid_pos = pipe_x + PIPE_WIDTH / 2
             if pipe_mid_pos <= player_mid_pos < pipe_mid_pos + 4:
                 self.score += 1
                 reward = 1  # reward for passed pipe
@@ -239,7 +451,8 @@ class FlappyBirdLogic:
 
         # player_index base_x change
         if (self._loop_iter + 1) % 3 == 0:
-            self.player_idx = next(self._player_idx_gen)
+            self.player_idx = _PLAYER_IDX_CYCLE[self._player_idx_pos]
+            self._player_idx_pos = (self._player_idx_pos + 1) % 4
 
         self._loop_iter = (self._loop_iter + 1) % 30
         self.base_x = -((-self.base_x + 100) % self._base_shift)
@@ -257,23 +470,20 @@ class FlappyBirdLogic:
 
             # more rotation to cover the threshold
             # (calculated in visible rotation)
-            self.player_rot = 45
+            self.player_rot = PLAYER_FLAP_ROT
 
         self.player_y += min(
             self.player_vel_y, self.base_y - self.player_y - PLAYER_HEIGHT
         )
 
         # move pipes to left
-        for up_pipe, low_pipe in zip(self.upper_pipes, self.lower_pipes):
-            up_pipe["x"] += PIPE_VEL_X
-            low_pipe["x"] += PIPE_VEL_X
+        pipes_x = self.pipes_x
+        for i in range(NUM_PIPES):
+            pipes_x[i] += PIPE_VEL_X
 
             # it is out of the screen
-            if up_pipe["x"] < -PIPE_WIDTH:
-                new_up_pipe, new_low_pipe = self._get_random_pipe()
-                up_pipe["x"] = new_up_pipe["x"]
-                up_pipe["y"] = new_up_pipe["y"]
-                low_pipe["x"] = new_low_pipe["x"]
-                low_pipe["y"] = new_low_pipe["y"]
+            if pipes_x[i] < -PIPE_WIDTH:
+                pipes_x[i] = self._pipe_spawn_x
+                self.upper_pipes_y[i], self.lower_pipes_y[i] = self._get_random_pipe()
 
         return reward, True
@@ -0,0 +1,200 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Hitmasks for the pixel-perfect collision detection of the game.
+
+A hitmask is a boolean NumPy array, indexed by `[x, y]` like
+`pygame.surfarray`, that tells which pixels of a sprite are opaque. Two sprites
+collide when the overlapping areas of their hitmasks have an opaque pixel in
+common, which is checked by slicing both masks and AND-ing them.
+"""
+
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from flappy_bird_gymnasium.envs.game_logic import (
+    PLAYER_FLAP_ROT,
+    PLAYER_ROT_THR,
+    PLAYER_VEL_ROT,
+)
+
+#: Minimum rotation angle of the player.
+PLAYER_MIN_ROT = -90
+
+#: Visible rotations that the player can have in the game: its rotation is set
+#: to `PLAYER_FLAP_ROT` when it flaps and decreases by `PLAYER_VEL_ROT` in every
+#: frame, until it's no longer above `PLAYER_MIN_ROT`.
+PLAYER_ROTATIONS = tuple(
+    sorted(
+        {
+            min(rot, PLAYER_ROT_THR)
+            for rot in range(
+                PLAYER_FLAP_ROT, PLAYER_MIN_ROT - PLAYER_VEL_ROT, -PLAYER_VEL_ROT
+            )
+        }
+    )
+)
+
+# Hitmasks returned by `get_hitmasks()`, shared by the whole process:
+_HITMASKS_CACHE = {}
+
+
+def masks_overlap(
+    mask1: np.ndarray,
+    position1: Tuple[int, int],
+    mask2: np.ndarray,
+    position2: Tuple[int, int],
+) -> bool:
+    """Checks if two hitmasks, with their top-left corners placed at the given
+    integer positions, have an opaque pixel in common.
+    """
+    x1, y1 = position1
+    x2, y2 = position2
+    left, right = max(x1, x2), min(x1 + mask1.shape[0], x2 + mask2.shape[0])
+    top, bottom = max(y1, y2), min(y1 + mask1.shape[1], y2 + mask2.shape[1])
+    if left >= right or top >= bottom:
+        return False
+
+    area1 = mask1[slice(left - x1, right - x1), slice(top - y1, bottom - y1)]
+    area2 = mask2[slice(left - x2, right - x2), slice(top - y2, bottom - y2)]
+    return bool((area1 & area2).any())
+
+
+def visible_rotation(player_rot: int) -> int:
+    """Returns the angle by which the player's sprite is drawn rotated."""
+    return min(player_rot, PLAYER_ROT_THR)
+
+
+class Hitmasks:
+    """Hitmasks of the player's and pipes' sprites.
+
+    The player's hitmasks are computed from the sprites rotated like the
+    renderer draws them, so a collision happens only when the drawn sprites
+    overlap. Each rotated hitmask is computed the first time it's needed.
+
+    Args:
+        bird_color (str): Color of the flappy bird.
+        pipe_color (str): Color of the pipes.
+
+    Attributes:
+        pipe (Tuple[np.ndarray, np.ndarray]): Hitmasks of the upper and lower
+            pipes.
+    """
+
+    #: Checks if two hitmasks overlap (see :func:`masks_overlap`).
+    overlap = staticmethod(masks_overlap)
+
+    def __init__(self, bird_color: str = "yellow", pipe_color: str = "green") -> None:
+        # pygame is only needed to load and rotate the sprites
+        import pygame
+
+        from flappy_bird_gymnasium.envs import utils
+
+        self._get_hitmask = utils.get_hitmask
+        self._rotate = pygame.transform.rotate
+
+        images = utils.get_images(bird_color=bird_color, pipe_color=pipe_color)
+        self._player_images = images["player"]
+        self._player: Dict[Tuple[int, int], np.ndarray] = {}
+        self._player_sizes = None
+        self.pipe = tuple(self._get_hitmask(img) for img in images["pipe"])
+
+    def player(self, player_idx: int, visible_rot: int) -> np.ndarray:
+        """Returns the hitmask of the player's animation frame `player_idx`
+        rotated by `visible_rot` degrees.
+        """
+        key = (player_idx, visible_rot)
+        mask = self._player.get(key)
+        if mask is None:
+            mask = self._get_hitmask(
+                self._rotate(self._player_images[player_idx], visible_rot)
+            )
+            self._player[key] = mask
+        return mask
+
+    def player_collides(
+        self,
+        player_idx: int,
+        player_rot: int,
+        player_pos: Tuple[float, float],
+        upper_pipes: Iterable[Tuple[float, float]],
+        lower_pipes: Iterable[Tuple[float, float]],
+    ) -> bool:
+        """Checks if the player's sprite overlaps the sprite of a pipe.
+
+        The positions are truncated to integers, like the ones of the sprites
+        drawn by the renderer.
+
+        Args:
+            player_idx (int): Current index of the bird's animation cycle.
+            player_rot (int): The player's rotation angle.
+            player_pos (Tuple[float, float]): The player's position.
+            upper_pipes (Iterable[Tuple[float, float]]): Positions of the upper
+                pipes.
+            lower_pipes (Iterable[Tuple[float, float]]): Positions of the lower
+                pipes.
+        """
+        player_mask = self.player(player_idx, visible_rotation(player_rot))
+        player_pos = (int(player_pos[0]), int(player_pos[1]))
+
+        for pipe_mask, pipes in zip(self.pipe, (upper_pipes, lower_pipes)):
+            for x, y in pipes:
+                if masks_overlap(player_mask, player_pos, pipe_mask, (int(x), int(y))):
+                    return True
+        return False
+
+    def player_sizes(self) -> np.ndarray:
+        """Returns the sizes of the player's hitmasks.
+
+        Only the hitmasks of the rotations in :data:`PLAYER_ROTATIONS` are
+        computed. The other rotations (which can only be set through a game's
+        state) get the size of a square holding the sprite at any rotation,
+        which is larger than their hitmasks.
+
+        Returns:
+            An array with shape `(3, PLAYER_ROT_THR - PLAYER_MIN_ROT + 1, 2)`
+            with the width and height of the hitmask of each animation frame
+            and visible rotation (offset by :data:`PLAYER_MIN_ROT`).
+        """
+        if self._player_sizes is None:
+            num_rotations = PLAYER_ROT_THR - PLAYER_MIN_ROT + 1
+            sizes = np.empty((len(self._player_images), num_rotations, 2), np.int64)
+            for idx, image in enumerate(self._player_images):
+                sizes[idx] = int(np.ceil(np.hypot(*image.get_size()))) + 1
+                for rot in PLAYER_ROTATIONS:
+                    sizes[idx, rot - PLAYER_MIN_ROT] = self.player(idx, rot).shape
+            self._player_sizes = sizes
+        return self._player_sizes
+
+
+def get_hitmasks(bird_color: str = "yellow", pipe_color: str = "green") -> Hitmasks:
+    """Returns the hitmasks of the given sprites, computing them once per
+    process.
+    """
+    key = (bird_color, pipe_color)
+    hitmasks = _HITMASKS_CACHE.get(key)
+    if hitmasks is None:
+        hitmasks = _HITMASKS_CACHE[key] = Hitmasks(bird_color, pipe_color)
+    return hitmasks
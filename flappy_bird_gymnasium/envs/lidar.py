@@ -0,0 +1,165 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Ray-cast (LIDAR) observations of the game.
+
+A fan of rays is cast from the center of the bird and the distance along each
+ray to the first obstacle it hits (a pipe, the ground or the top of the screen)
+is measured. The distances are computed analytically, for all the rays at once,
+with the slab method: a ray hits an axis-aligned rectangle when the interval in
+which it's between the rectangle's vertical edges overlaps the one in which
+it's between its horizontal edges.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from flappy_bird_gymnasium.envs.game_logic import (
+    NUM_PIPES,
+    PIPE_HEIGHT,
+    PIPE_WIDTH,
+    PLAYER_HEIGHT,
+    PLAYER_WIDTH,
+    FlappyBirdLogic,
+)
+
+# Rows of the distances computed by `Lidar.scan()`: to the pipes' vertical
+# edges, to the upper and the lower pipes' horizontal edges, to the ground or
+# the top of the screen and the maximum distance.
+_X_ROWS = slice(0, NUM_PIPES)
+_Y_ROWS = slice(NUM_PIPES, 3 * NUM_PIPES)
+_PIPE_ROWS = slice(0, 3 * NUM_PIPES)
+_OBSTACLE_ROWS = slice(NUM_PIPES, None)
+_BOUNDARY_ROW = 3 * NUM_PIPES
+_NUM_ROWS = 3 * NUM_PIPES + 2
+
+
+class Lidar:
+    """Casts a fan of rays from the bird and measures their distances to the
+    obstacles.
+
+    The rays are evenly spaced from straight up to straight down, through the
+    direction the bird is flying to (for a field of view of 180 degrees). The
+    fan doesn't turn with the bird's rotation.
+
+    Args:
+        num_rays (int): Number of rays.
+        max_distance (float): Range of the rays. Rays that don't hit anything
+            within it measure this distance.
+        fov (float): Angle, in degrees, between the first and the last rays.
+    """
+
+    def __init__(
+        self, num_rays: int = 180, max_distance: float = 288, fov: float = 180
+    ) -> None:
+        self.num_rays = num_rays
+        self.max_distance = max_distance
+
+        # Directions of the rays (y grows downwards). Rays parallel to an axis
+        # are tilted by a negligible angle, so their distances to the lines
+        # parallel to it are huge instead of infinite (or undefined).
+        angles = np.radians(np.linspace(-fov / 2, fov / 2, num_rays))
+        dir_x, dir_y = np.cos(angles), np.sin(angles)
+        dir_x[dir_x == 0] = 1e-12
+        dir_y[dir_y == 0] = 1e-12
+        inv_x, inv_y = 1 / dir_x, 1 / dir_y
+
+        # The distance along a ray to a line at a distance `d` from the bird's
+        # center (along the line's normal) is `d * inv + offset`, where the
+        # offset moves the nearest edge of the obstacle to the line
+        self._inv = np.zeros((_NUM_ROWS, num_rays))
+        self._inv[_X_ROWS] = inv_x
+        self._inv[_Y_ROWS] = inv_y
+        self._inv[_BOUNDARY_ROW] = inv_y
+        self._offset = np.zeros((_NUM_ROWS, num_rays))
+        self._offset[_X_ROWS] = np.minimum(PIPE_WIDTH * inv_x, 0)
+        self._offset[_Y_ROWS] = np.minimum(PIPE_HEIGHT * inv_y, 0)
+        self._offset[-1] = max_distance
+        self._down = dir_y > 0
+        self._base_y = None
+
+        # Lengths of the rays' intervals between the edges of the pipes
+        self._span = np.empty((3 * NUM_PIPES, num_rays))
+        self._span[_X_ROWS] = np.abs(PIPE_WIDTH * inv_x)
+        self._span[_Y_ROWS] = np.abs(PIPE_HEIGHT * inv_y)
+
+        # Buffers of the computed distances (allocated once). The rays never
+        # exit the ground, the top of the screen or the maximum distance.
+        self._lines = np.empty(_NUM_ROWS)
+        self._lines_column = self._lines[:, np.newaxis]
+        self._enter = np.empty((_NUM_ROWS, num_rays))
+        self._exit = np.empty((3 * NUM_PIPES, num_rays))
+        self._exit_pipes = np.full((_NUM_ROWS - NUM_PIPES, num_rays), np.inf)
+        self._missed = np.empty((_NUM_ROWS - NUM_PIPES, num_rays), dtype=bool)
+
+    def scan(
+        self, game: FlappyBirdLogic, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Returns the distance along each ray to the first obstacle it hits.
+
+        Args:
+            game (FlappyBirdLogic): The game.
+            out (Optional[np.ndarray]): Array, with shape `(num_rays,)`, in
+                which the distances are written. If `None`, a new one is
+                allocated.
+        """
+        if game.base_y != self._base_y:
+            self._base_y = game.base_y
+            self._offset[_BOUNDARY_ROW] = (
+                self._down * game.base_y * self._inv[_BOUNDARY_ROW]
+            )
+
+        center_x = game.player_x + PLAYER_WIDTH / 2
+        center_y = game.player_y + PLAYER_HEIGHT / 2
+        self._lines[:] = (
+            [x - center_x for x in game.pipes_x]
+            + [y - center_y for y in game.upper_pipes_y]
+            + [y - center_y for y in game.lower_pipes_y]
+            + [-center_y, 0]
+        )
+
+        # Distances along the rays to where they enter and exit the slabs
+        # between the pipes' vertical and horizontal edges:
+        enter, exit_ = self._enter, self._exit
+        np.multiply(self._lines_column, self._inv, out=enter)
+        enter += self._offset
+        np.add(enter[_PIPE_ROWS], self._span, out=exit_)
+
+        # The rays hit a pipe, ahead of the bird, when they're in both slabs
+        num_rays = self.num_rays
+        enter_pipes = enter[_Y_ROWS].reshape(2, NUM_PIPES, num_rays)
+        exit_pipes = self._exit_pipes[: 2 * NUM_PIPES]
+        np.maximum(enter_pipes, enter[_X_ROWS], out=enter_pipes)
+        np.minimum(
+            exit_[_Y_ROWS].reshape(2, NUM_PIPES, num_rays),
+            exit_[_X_ROWS],
+            out=exit_pipes.reshape(2, NUM_PIPES, num_rays),
+        )
+        obstacles = enter[_OBSTACLE_ROWS]
+        np.maximum(obstacles, 0, out=obstacles)
+        np.greater(obstacles, self._exit_pipes, out=self._missed)
+        np.copyto(obstacles, np.inf, where=self._missed)
+
+        return np.minimum.reduce(obstacles, axis=0, out=out)
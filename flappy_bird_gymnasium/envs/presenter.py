@@ -0,0 +1,164 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Presentation of the rendered frames on a display, in a separate thread.
+
+A :class:`DisplayPresenter` owns a pygame window and a thread that shows the
+frames handed to it. The frames are passed through a single slot, so a frame
+that wasn't shown yet is replaced by a newer one (and counted as dropped)
+instead of making the caller wait for the display.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pygame
+
+
+class DisplayPresenter:
+    """Shows frames on a pygame window from a dedicated thread.
+
+    :meth:`.submit()` copies a frame and returns immediately: it never waits
+    for the display, whose updates (which may wait for the screen's vertical
+    sync) only block the presenter's thread. Frames are triple buffered: one
+    being written by :meth:`.submit()`, one pending and one being shown.
+
+    The window is created by the presenter's thread, which also handles its
+    events, so the events shouldn't be read by other threads. Some platforms
+    (e.g. macOS) only support windows handled by the main thread. If the
+    thread fails, its exception is raised by the next call to :meth:`.submit()`
+    or :meth:`.close()`.
+
+    Args:
+        frame_size (Tuple[int, int]): Width and height of the frames (and of
+            the window).
+        sounds (Optional[Dict[str, pygame.mixer.Sound]]): Sounds that can be
+            played along with the frames, by name.
+    """
+
+    def __init__(
+        self,
+        frame_size: Tuple[int, int],
+        sounds: Optional[Dict[str, pygame.mixer.Sound]] = None,
+    ) -> None:
+        self.frame_size = tuple(frame_size)
+        self._sounds = {} if sounds is None else sounds
+
+        shape = (*self.frame_size, 3)
+        self._back = np.zeros(shape, dtype=np.uint8)
+        self._pending = np.zeros(shape, dtype=np.uint8)
+        self._front = np.zeros(shape, dtype=np.uint8)
+        self._has_pending = False
+        self._pending_sound: Optional[str] = None
+
+        self.frames_submitted = 0
+        self.frames_presented = 0
+        self.frames_dropped = 0
+
+        self._error = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="flappy-bird-display", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, frame: np.ndarray, sound: Optional[str] = None) -> None:
+        """Hands a frame to the presenter's thread, to be shown as soon as
+        possible (unless a newer frame is submitted before).
+
+        Args:
+            frame (np.ndarray): RGB `uint8` frame, with shape `(width, height,
+                3)` (the layout of `pygame.surfarray`). It's copied, so it can
+                be modified once this method returns.
+            sound (Optional[str]): Name of a sound to play with the frame. It's
+                dropped along with the frame, so the sounds of the frames that
+                weren't shown aren't played in a burst afterwards.
+        """
+        np.copyto(self._back, frame)
+        with self._condition:
+            if self._error is not None:
+                raise RuntimeError("The display failed!") from self._error
+            self._back, self._pending = self._pending, self._back
+            if self._has_pending:
+                self.frames_dropped += 1
+            self._has_pending = True
+            self._pending_sound = sound
+            self.frames_submitted += 1
+            self._condition.notify()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of frames submitted, presented and dropped."""
+        with self._condition:
+            return {
+                "submitted": self.frames_submitted,
+                "presented": self.frames_presented,
+                "dropped": self.frames_dropped,
+            }
+
+    def close(self) -> None:
+        """Stops the presenter's thread (a pending frame isn't shown)."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("The display failed!") from self._error
+
+    def _run(self) -> None:
+        try:
+            self._present_frames()
+        except Exception as error:
+            with self._condition:
+                self._error = error
+
+    def _present_frames(self) -> None:
+        display = pygame.display.set_mode(self.frame_size)
+        while True:
+            with self._condition:
+                if not self._has_pending and not self._closed:
+                    self._condition.wait(timeout=0.05)
+                if self._closed:
+                    return
+                has_frame = self._has_pending
+                if has_frame:
+                    self._front, self._pending = self._pending, self._front
+                    self._has_pending = False
+                    sound, self._pending_sound = self._pending_sound, None
+
+            if not has_frame:
+                # (the window's events are handled while waiting, without
+                # holding the lock)
+                pygame.event.pump()
+                continue
+
+            pygame.surfarray.blit_array(display, self._front)
+            pygame.display.update()
+            pygame.event.pump()
+            if sound in self._sounds:
+                self._sounds[sound].play()
+
+            with self._condition:
+                self.frames_presented += 1
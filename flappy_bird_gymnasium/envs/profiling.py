@@ -0,0 +1,118 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Opt-in instrumentation of the phases of the environments' steps.
+
+A :class:`Profiler` counts the calls of, and the time spent in, functions
+instrumented by it, grouped by phase. The instrumentation is added by wrapping
+the functions only when profiling is enabled, so the code isn't changed (and
+isn't slowed down) otherwise. The time of a phase includes the time of the
+phases nested in it (e.g. "logic.check_crash" is part of "logic.update_state").
+"""
+
+import functools
+import time
+from typing import Callable, Dict, List
+
+#: Methods of :class:`.FlappyBirdRenderer` instrumented, and their phases.
+RENDERER_PHASES = {
+    "draw_surface": "draw_surface",
+    "draw_frame": "draw_frame",
+    "get_frame": "get_frame",
+    "update_display": "update_display",
+}
+
+#: Methods of :class:`.FlappyBirdLogic` instrumented, and their phases.
+LOGIC_PHASES = {
+    "update_state": "logic.update_state",
+    "check_crash": "logic.check_crash",
+}
+
+
+class Profiler:
+    """Accumulates the number of calls and the time spent in each phase."""
+
+    def __init__(self) -> None:
+        # Number of calls and total time (in nanoseconds) of each phase:
+        self._counters: Dict[str, List[int]] = {}
+
+    def wrap(self, function: Callable, phase: str) -> Callable:
+        """Returns a version of `function` that's timed as part of `phase`."""
+        counter = self._counters.setdefault(phase, [0, 0])
+        perf_counter_ns = time.perf_counter_ns
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                counter[0] += 1
+                counter[1] += perf_counter_ns() - start
+
+        return wrapper
+
+    def instrument(
+        self, obj: object, methods: Dict[str, str], prefix: str = ""
+    ) -> None:
+        """Replaces methods of an object with timed versions of them.
+
+        Args:
+            obj (object): The object (it can't use `__slots__`).
+            methods (Dict[str, str]): The phase of each method, by name.
+            prefix (str): Prefix added to the phases' names.
+        """
+        for name, phase in methods.items():
+            setattr(obj, name, self.wrap(getattr(obj, name), prefix + phase))
+
+    def subclass(self, cls: type, methods: Dict[str, str]) -> type:
+        """Returns a subclass of `cls` whose methods are timed. Unlike
+        :meth:`.instrument()`, it works with classes that use `__slots__`.
+
+        Args:
+            cls (type): The class.
+            methods (Dict[str, str]): The phase of each method, by name.
+        """
+        namespace = {"__slots__": ()}
+        for name, phase in methods.items():
+            namespace[name] = self.wrap(getattr(cls, name), phase)
+        return type(f"Profiled{cls.__name__}", (cls,), namespace)
+
+    def reset(self) -> None:
+        """Zeroes the counters of all the phases."""
+        for counter in self._counters.values():
+            counter[0] = counter[1] = 0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Returns, for each phase, its number of calls ("calls"), the total
+        time spent in it ("total_ms") and the mean time of a call ("mean_us").
+        """
+        return {
+            phase: {
+                "calls": calls,
+                "total_ms": total / 1e6,
+                "mean_us": total / calls / 1e3 if calls else 0.0,
+            }
+            for phase, (calls, total) in self._counters.items()
+        }
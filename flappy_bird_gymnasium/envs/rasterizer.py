@@ -0,0 +1,162 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Implements a NumPy rasterizer that composites the game's sprites straight
+into `uint8` arrays.
+
+The sprites are decoded once into alpha-premultiplied arrays. Drawing a frame
+then only involves NumPy slicing, no SDL surface is used.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pygame
+
+#: Weights of the red, green and blue channels in the grayscale conversion (the
+#: ITU-R 601-2 luma transform in 16-bit fixed point, as used by Pillow).
+GRAYSCALE_WEIGHTS = np.array([19595, 38470, 7471], dtype=np.uint32)
+
+#: Backgrounds used to decode the sprites (see :func:`decode_sprite`).
+_DECODE_BLACK = (0, 0, 0)
+_DECODE_WHITE = (255, 255, 255)
+
+
+class Sprite:
+    """A sprite decoded into NumPy arrays.
+
+    The arrays use the same `(width, height)` axes order as
+    `pygame.surfarray`.
+
+    Args:
+        rgb (np.ndarray): Alpha-premultiplied colors of the sprite, with shape
+            `(width, height, 3)`, or `(width, height, 1)` for a grayscale
+            sprite.
+        alpha (Optional[np.ndarray]): Opacity of each pixel, with shape
+            `(width, height, 1)`. If `None`, the sprite is fully opaque.
+
+    Attributes:
+        mask (Optional[np.ndarray]): If the sprite only has fully opaque or
+            fully transparent pixels, a boolean array with its opaque pixels.
+            Otherwise, `None`.
+    """
+
+    __slots__ = ("rgb", "alpha", "mask", "width", "height")
+
+    def __init__(self, rgb: np.ndarray, alpha: Optional[np.ndarray] = None) -> None:
+        self.rgb = rgb
+        self.alpha = alpha
+        self.width, self.height = rgb.shape[:2]
+
+        self.mask = None
+        if alpha is not None and np.isin(alpha, (0, 255)).all():
+            self.mask = np.ascontiguousarray(np.broadcast_to(alpha == 255, rgb.shape))
+
+        for array in (self.rgb, self.alpha, self.mask):
+            if array is not None:
+                array.flags.writeable = False
+
+    def to_grayscale(self) -> "Sprite":
+        """Returns a grayscale copy of this sprite."""
+        return Sprite(to_grayscale(self.rgb), self.alpha)
+
+
+def to_grayscale(rgb: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Converts RGB values to grayscale.
+
+    Args:
+        rgb (np.ndarray): Array whose last axis has the red, green and blue
+            values.
+        out (Optional[np.ndarray]): Array in which the result is written. If
+            `None`, a new array is created.
+
+    Returns:
+        An `uint8` array with the same shape as `rgb`, but with a single
+        channel in its last axis.
+    """
+    luma = (rgb @ GRAYSCALE_WEIGHTS + 0x8000) >> 16
+    if out is None:
+        return luma.astype(np.uint8)[..., np.newaxis]
+    out[..., 0] = luma
+    return out
+
+
+def decode_sprite(surface: pygame.Surface) -> Sprite:
+    """Decodes a pygame surface into a :class:`Sprite`.
+
+    The surface is blitted over a black and over a white 32-bit surface, the
+    same kind of surface the pygame renderer draws on. The result over black is
+    the alpha-premultiplied color of each pixel and the difference between the
+    two results gives its opacity. This makes the decoded sprite follow
+    exactly the blitting rules of pygame (color keys, palettes, etc).
+    """
+    results = []
+    for background in (_DECODE_BLACK, _DECODE_WHITE):
+        target = pygame.Surface(surface.get_size())
+        target.fill(background)
+        target.blit(surface, (0, 0))
+        results.append(pygame.surfarray.array3d(target).astype(np.int16))
+
+    over_black, over_white = results
+    alpha = 255 - (over_white - over_black).max(axis=-1, keepdims=True)
+    rgb = over_black.astype(np.uint8)
+    if (alpha == 255).all():
+        return Sprite(rgb)
+    return Sprite(rgb, alpha.astype(np.uint8))
+
+
+def blit(
+    frame: np.ndarray,
+    sprite: Sprite,
+    position: Tuple[float, float],
+    origin: Tuple[int, int] = (0, 0),
+) -> None:
+    """Draws a sprite on a frame, like `pygame.Surface.blit` does.
+
+    Args:
+        frame (np.ndarray): Array with shape `(width, height, channels)` to
+            draw on.
+        sprite (Sprite): The sprite to be drawn.
+        position (Tuple[float, float]): Position of the sprite's top-left
+            corner. Like in pygame, the coordinates are truncated to integers.
+        origin (Tuple[int, int]): Position of `frame`'s top-left corner, when
+            it's only an area of a larger frame.
+    """
+    x, y = int(position[0]) - origin[0], int(position[1]) - origin[1]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1 = min(x + sprite.width, frame.shape[0])
+    y1 = min(y + sprite.height, frame.shape[1])
+    if x0 >= x1 or y0 >= y1:
+        return
+
+    target = frame[x0:x1, y0:y1]
+    src = (slice(x0 - x, x1 - x), slice(y0 - y, y1 - y))
+    if sprite.alpha is None:
+        target[...] = sprite.rgb[src]
+    elif sprite.mask is not None:
+        np.copyto(target, sprite.rgb[src], where=sprite.mask[src])
+    else:
+        inv_alpha = 255 - sprite.alpha[src].astype(np.uint16)
+        blended = (target * inv_alpha + 127) // 255
+        target[...] = sprite.rgb[src] + blended.astype(np.uint8)
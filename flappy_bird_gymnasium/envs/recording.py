@@ -0,0 +1,429 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Records episodes in a compact binary format and replays them.
+
+A game is fully determined by the seed passed to `reset()` and by the actions
+taken afterwards, so an episode is recorded as:
+
+    * a header with the seed, the number of steps and the environment's id,
+      game-related keyword arguments and course (as JSON);
+    * the actions, packed into bits;
+    * the steps in which the score increased, used as checkpoints to detect
+      replays diverging from the recorded episode.
+
+All the numbers are stored in little-endian byte order.
+"""
+
+import inspect
+import json
+import os
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+
+import gymnasium
+import numpy as np
+from gymnasium.utils import seeding
+
+from flappy_bird_gymnasium.envs.courses import load_courses
+from flappy_bird_gymnasium.envs.game_logic import FlappyBirdLogic, GameState
+from flappy_bird_gymnasium.envs.hitmasks import get_hitmasks
+
+#: Identifies the files of recorded episodes.
+MAGIC = b"FBEP"
+
+#: Version of the recording format.
+VERSION = 1
+
+#: Magic, version, flags, seed, number of steps, number of score checkpoints
+#: and size of the JSON metadata.
+_HEADER = np.dtype(
+    [
+        ("magic", "S4"),
+        ("version", "<u2"),
+        ("flags", "<u2"),
+        ("seed", "<u8"),
+        ("num_steps", "<u4"),
+        ("num_checkpoints", "<u4"),
+        ("metadata_size", "<u4"),
+    ]
+)
+
+# Flag set if the episode ended with the bird's death:
+_TERMINATED = 1
+
+#: Keyword arguments of the environments that are recorded, since they affect
+#: the game or its graphics.
+RECORDED_KWARGS = (
+    "screen_size",
+    "pipe_gap",
+    "bird_color",
+    "pipe_color",
+    "background",
+    "precise_collision",
+    "frame_skip",
+    "course_file",
+)
+
+
+class ReplayDivergenceError(RuntimeError):
+    """Raised when a replayed episode doesn't match its recording."""
+
+
+class EpisodeRecord(NamedTuple):
+    """A recorded episode.
+
+    Attributes:
+        env_id (str): Id of the environment in which the episode was played.
+        env_kwargs (Dict[str, Any]): Keyword arguments of the environment (see
+            :data:`RECORDED_KWARGS`), including the defaults that weren't
+            given.
+        seed (int): Seed passed to the environment's `reset()`.
+        actions (np.ndarray): The actions taken in each step (`uint8`).
+        score_steps (np.ndarray): The steps (0-based) in which the score was
+            increased (`uint32`).
+        terminated (bool): Whether the episode ended with the bird's death.
+        course (Optional[int]): Index of the course played (in the environment's
+            `course_file`), or `None` if the pipes were random.
+    """
+
+    env_id: str
+    env_kwargs: Dict[str, Any]
+    seed: int
+    actions: np.ndarray
+    score_steps: np.ndarray
+    terminated: bool
+    course: Optional[int] = None
+
+    def to_bytes(self) -> bytes:
+        """Encodes the episode in the binary format described in
+        :mod:`.recording`.
+        """
+        metadata = json.dumps(
+            {
+                "env_id": self.env_id,
+                "env_kwargs": self.env_kwargs,
+                "course": self.course,
+            }
+        )
+        metadata = metadata.encode("utf-8")
+
+        header = np.zeros((), dtype=_HEADER)
+        header["magic"] = MAGIC
+        header["version"] = VERSION
+        header["flags"] = _TERMINATED if self.terminated else 0
+        header["seed"] = self.seed
+        header["num_steps"] = len(self.actions)
+        header["num_checkpoints"] = len(self.score_steps)
+        header["metadata_size"] = len(metadata)
+
+        return b"".join(
+            (
+                header.tobytes(),
+                metadata,
+                np.packbits(self.actions, bitorder="little").tobytes(),
+                np.asarray(self.score_steps, dtype="<u4").tobytes(),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EpisodeRecord":
+        """Decodes an episode encoded by :meth:`.to_bytes()`."""
+        header = np.frombuffer(data, dtype=_HEADER, count=1)[0]
+        if header["magic"] != MAGIC:
+            raise ValueError("The data isn't a recorded episode!")
+        if header["version"] != VERSION:
+            raise ValueError(
+                f"Unsupported recording format version {header['version']} "
+                f"(expected {VERSION})!"
+            )
+
+        num_steps = int(header["num_steps"])
+        offset = _HEADER.itemsize + int(header["metadata_size"])
+        metadata = json.loads(data[slice(_HEADER.itemsize, offset)])
+
+        packed_actions = np.frombuffer(
+            data, dtype=np.uint8, count=(num_steps + 7) // 8, offset=offset
+        )
+        actions = np.unpackbits(packed_actions, count=num_steps, bitorder="little")
+        offset += packed_actions.size
+
+        score_steps = np.frombuffer(
+            data, dtype="<u4", count=int(header["num_checkpoints"]), offset=offset
+        )
+        return cls(
+            env_id=metadata["env_id"],
+            env_kwargs=metadata["env_kwargs"],
+            seed=int(header["seed"]),
+            actions=actions,
+            score_steps=score_steps.astype(np.uint32),
+            terminated=bool(header["flags"] & _TERMINATED),
+            course=metadata.get("course"),
+        )
+
+
+def save_episode(record: EpisodeRecord, path: str) -> None:
+    """Writes a recorded episode to a file."""
+    with open(path, "wb") as file:
+        file.write(record.to_bytes())
+
+
+def load_episode(path: str) -> EpisodeRecord:
+    """Reads a recorded episode from a file written by :func:`save_episode`."""
+    with open(path, "rb") as file:
+        return EpisodeRecord.from_bytes(file.read())
+
+
+class EpisodeRecorder(gymnasium.Wrapper):
+    """Records the episodes played in a Flappy Bird environment.
+
+    Every episode is saved, when it ends (or when the environment is reset or
+    closed in the middle of it), to a file named `episode-<n>.fbep` in the
+    given directory. The seeds of the episodes reset without one are drawn
+    from a generator seeded by the last seed given, so the episodes can be
+    replayed.
+
+    Args:
+        env (gymnasium.Env): A `FlappyBird-v0` or `FlappyBird-rgb-v0`
+            environment.
+        directory (str): Directory in which the episodes are saved. It's
+            created if it doesn't exist.
+
+    Attributes:
+        last_record (Optional[EpisodeRecord]): The last saved episode.
+    """
+
+    def __init__(self, env: gymnasium.Env, directory: str) -> None:
+        super().__init__(env)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.last_record = None
+
+        # the spec only holds the arguments given explicitly, so the defaults
+        # of the environment's constructor are recorded too
+        kwargs = {
+            name: param.default
+            for name, param in inspect.signature(
+                type(env.unwrapped).__init__
+            ).parameters.items()
+            if param.default is not param.empty
+        }
+        self._env_id = "" if env.spec is None else env.spec.id
+        if env.spec is not None:
+            kwargs.update(env.spec.kwargs)
+        self._env_kwargs = {k: v for k, v in kwargs.items() if k in RECORDED_KWARGS}
+
+        self._seed_rng = np.random.default_rng()
+        self._episode_id = 0
+        self._seed = None
+        self._course = None
+        self._actions = bytearray()
+        self._score_steps = []
+        self._score = 0
+
+    def reset(self, *, seed: Optional[int] = None, options=None):
+        """Resets the environment, saving the current episode (if any)."""
+        self._save_episode(terminated=False)
+
+        if seed is not None and not 0 <= seed < 2**64:
+            raise ValueError(
+                f"The seeds of recorded episodes must be in [0, 2**64), got {seed}!"
+            )
+        if seed is None:
+            seed = int(self._seed_rng.integers(2**63))
+        else:
+            self._seed_rng = np.random.default_rng(seed)
+        self._seed = seed
+
+        obs, info = self.env.reset(seed=seed, options=options)
+        self._score = info["score"]
+        self._course = info.get("course")
+        return obs, info
+
+    def step(self, action):
+        """Steps the environment, recording the action."""
+        obs, reward, terminated, truncated, info = self.env.step(action)
+
+        self._actions.append(int(action))
+        if info["score"] > self._score:
+            step = len(self._actions) - 1
+            self._score_steps.extend([step] * (info["score"] - self._score))
+            self._score = info["score"]
+
+        if terminated or truncated:
+            self._save_episode(terminated=terminated)
+        return obs, reward, terminated, truncated, info
+
+    def close(self):
+        """Closes the environment, saving the current episode (if any)."""
+        self._save_episode(terminated=False)
+        super().close()
+
+    def _save_episode(self, terminated: bool) -> None:
+        if not self._actions:
+            return
+
+        self.last_record = EpisodeRecord(
+            env_id=self._env_id,
+            env_kwargs=self._env_kwargs,
+            seed=self._seed,
+            actions=np.frombuffer(bytes(self._actions), dtype=np.uint8),
+            score_steps=np.array(self._score_steps, dtype=np.uint32),
+            terminated=terminated,
+            course=self._course,
+        )
+        path = os.path.join(self.directory, f"episode-{self._episode_id}.fbep")
+        save_episode(self.last_record, path)
+
+        self._episode_id += 1
+        self._actions = bytearray()
+        self._score_steps = []
+
+
+class EpisodeReplayer:
+    """Replays a recorded episode, as fast as possible, without creating an
+    environment.
+
+    The game is checked against the recording after every step: if its score
+    doesn't match the recorded checkpoints, or if the bird dies in a different
+    step, a :class:`ReplayDivergenceError` is raised. Each step advances the
+    game by the recorded environment's `frame_skip` ticks. The episodes played
+    on a fixed course are replayed on the same course, loaded from the recorded
+    `course_file`.
+
+    Args:
+        record (EpisodeRecord): The episode to replay.
+    """
+
+    def __init__(self, record: EpisodeRecord) -> None:
+        self.record = record
+        kwargs = record.env_kwargs
+        self._screen_size = tuple(kwargs.get("screen_size", (288, 512)))
+        self._pipe_gap = kwargs.get("pipe_gap", 100)
+        self._bird_color = kwargs.get("bird_color", "yellow")
+        self._pipe_color = kwargs.get("pipe_color", "green")
+        self._background = kwargs.get("background")
+        self._frame_skip = kwargs.get("frame_skip", 1)
+
+        self._course = None
+        if record.course is not None:
+            courses = load_courses(kwargs["course_file"])
+            self._course = courses[record.course]
+
+        self._hitmasks = None
+        if kwargs.get("precise_collision", False):
+            self._hitmasks = get_hitmasks(self._bird_color, self._pipe_color)
+
+    def games(self) -> Iterator[FlappyBirdLogic]:
+        """Replays the episode, yielding its game after the reset and after
+        every step (always the same, updated, object).
+        """
+        record = self.record
+        num_steps = len(record.actions)
+        scores = np.cumsum(np.bincount(record.score_steps, minlength=num_steps))
+
+        game = FlappyBirdLogic(
+            np_random=seeding.np_random(record.seed)[0],
+            screen_size=self._screen_size,
+            pipe_gap_size=self._pipe_gap,
+            hitmasks=self._hitmasks,
+            course=self._course,
+        )
+        yield game
+
+        for step, (action, score) in enumerate(
+            zip(record.actions.tolist(), scores.tolist())
+        ):
+            _, alive = game.update_state(action)
+            for _ in range(1, self._frame_skip):
+                if not alive:
+                    break
+                _, alive = game.update_state(action)
+
+            if game.score != score:
+                raise ReplayDivergenceError(
+                    f"The score in step {step} is {game.score}, but {score} was "
+                    "recorded!"
+                )
+            if not alive and step < num_steps - 1:
+                raise ReplayDivergenceError(
+                    f"The bird died in step {step}, before the end of the "
+                    f"recorded episode ({num_steps} steps)!"
+                )
+            if alive and step == num_steps - 1 and record.terminated:
+                raise ReplayDivergenceError(
+                    f"The bird is alive in the last step ({step}), but it died "
+                    "in the recorded episode!"
+                )
+            yield game
+
+    def states(self) -> Iterator[GameState]:
+        """Replays the episode, yielding a snapshot of the game's state after
+        the reset and after every step.
+        """
+        for game in self.games():
+            yield game.get_state()
+
+    def frames(
+        self,
+        render_backend: str = "numpy",
+        layout: str = "HWC",
+        show_score: bool = True,
+    ) -> Iterator[np.ndarray]:
+        """Replays the episode, drawing a frame after the reset and after every
+        step, with a :class:`.FlappyBirdRenderer`.
+
+        Every frame is drawn into the same array, which is yielded each time.
+        Copy it to keep a frame.
+
+        Args:
+            render_backend (str): Backend used to draw the frames (see
+                :class:`.FlappyBirdRenderer`).
+            layout (str): Memory layout of the frames (see
+                :data:`.FRAME_LAYOUTS`).
+            show_score (bool): Whether to draw the player's score or not.
+        """
+        from flappy_bird_gymnasium.envs.renderer import FlappyBirdRenderer, frame_shape
+
+        renderer = FlappyBirdRenderer(
+            screen_size=self._screen_size,
+            audio_on=False,
+            bird_color=self._bird_color,
+            pipe_color=self._pipe_color,
+            background=self._background,
+            render_backend=render_backend,
+        )
+        frame = np.empty(frame_shape(self._screen_size, layout), dtype=np.uint8)
+        for game in self.games():
+            renderer.game = game
+            yield renderer.draw_frame(frame, layout=layout, show_score=show_score)
+
+    def verify(self) -> int:
+        """Replays the whole episode, checking it against the recording.
+
+        Returns:
+            The final score of the episode.
+        """
+        for game in self.games():
+            pass
+        return game.score
@@ -30,18 +30,62 @@ GitHub repository by `sourahbhv` (https://github.com/sourabhv/FlapPyBird),
 released under the MIT license.
 """
 
-from typing import Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pygame
 
-from flappy_bird_gymnasium.envs import utils
-
-#: Player's rotation threshold.
-PLAYER_ROT_THR = 20
+from flappy_bird_gymnasium.envs import rasterizer, utils
+from flappy_bird_gymnasium.envs.game_logic import PLAYER_ROT_THR
+from flappy_bird_gymnasium.envs.presenter import DisplayPresenter
+from flappy_bird_gymnasium.envs.video import VideoWriter
 
 #: Color to fill the surface's background when no background image was loaded.
 FILL_BACKGROUND_COLOR = (200, 200, 200)
 
+#: Available rendering backends.
+RENDER_BACKENDS = ("pygame", "numpy")
+
+#: Available memory layouts for frames returned as arrays: "WHC" is the
+#: `(width, height, channels)` order of `pygame.surfarray`, "HWC" is the usual
+#: image order and "CHW" is the channels-first order.
+FRAME_LAYOUTS = ("WHC", "HWC", "CHW")
+
+#: Maximum number of rotated (and tinted) player sprites kept in the cache. The
+#: player's visible rotation can take 38 different values and it has 3
+#: animation frames, so this fits all the sprites for two different tints.
+PLAYER_CACHE_SIZE = 256
+
+# Sprites decoded for the "numpy" backend, shared by all the renderers:
+_SPRITES_CACHE = {}
+
+
+def frame_shape(
+    screen_size: Tuple[int, int], layout: str = "WHC", channels: int = 3
+) -> Tuple[int, ...]:
+    """Returns the shape of a frame array with the given layout."""
+    width, height = screen_size
+    if layout == "WHC":
+        return width, height, channels
+    if layout == "HWC":
+        return height, width, channels
+    if layout == "CHW":
+        return channels, height, width
+    raise ValueError(
+        f'Invalid frame layout "{layout}"! The available layouts are: '
+        f"{FRAME_LAYOUTS}."
+    )
+
+
+def _whc_view(array: np.ndarray, layout: str) -> np.ndarray:
+    """Returns a `(width, height, channels)` view of a frame array."""
+    if layout == "WHC":
+        return array
+    if layout == "HWC":
+        return array.transpose(1, 0, 2)
+    return array.transpose(2, 1, 0)
+
 
 class FlappyBirdRenderer:
     """Handles the rendering of the game.
@@ -55,6 +99,30 @@ class FlappyBirdRenderer:
         bird_color (str): Color of the flappy bird.
         pipe_color (str): Color of the pipes.
         background (str): Type of background image.
+        render_backend (str): How frames are drawn. With "pygame", the frames
+            are drawn on a `pygame.Surface` (:attr:`surface`). With "numpy",
+            they're composited straight into a `uint8` array (:attr:`frame`)
+            with the same `(width, height, 3)` layout as `pygame.surfarray`,
+            without using SDL surfaces.
+        frame_size (Optional[Tuple[int, int]]): Width and height of the drawn
+            frames. If different from `screen_size`, the sprites are scaled
+            once when loaded and the game's coordinates are mapped to the
+            frame's resolution, so the frames are drawn straight at that
+            resolution. If `None`, the frames have the screen's size.
+        grayscale (bool): If `True`, the frames returned as arrays have a
+            single grayscale channel. With the "numpy" backend, the sprites are
+            converted to grayscale once and the frames are composited directly
+            in grayscale.
+        incremental (bool): If `True`, :meth:`.draw_surface()` only restores
+            and redraws the areas of the frame that changed since the previous
+            frame (the pipes' strips, the base and the bird's bounding box),
+            and :meth:`.update_display()` only updates those areas of the
+            display.
+        async_display (bool): If `True`, :meth:`.make_display()` creates a
+            :class:`.DisplayPresenter` (stored as :attr:`display`), which shows
+            the frames passed by :meth:`.update_display()` from its own thread,
+            so updating the display never waits for the screen. The frames
+            that the display can't keep up with are dropped (and counted).
     """
 
     def __init__(
@@ -64,19 +132,65 @@ class FlappyBirdRenderer:
         bird_color: str = "yellow",
         pipe_color: str = "green",
         background: Optional[str] = "day",
+        render_backend: str = "pygame",
+        frame_size: Optional[Tuple[int, int]] = None,
+        grayscale: bool = False,
+        incremental: bool = False,
+        async_display: bool = False,
     ) -> None:
+        if render_backend not in RENDER_BACKENDS:
+            raise ValueError(
+                f'Invalid render backend "{render_backend}"! The available '
+                f"backends are: {RENDER_BACKENDS}."
+            )
+
         self._screen_width = screen_size[0]
         self._screen_height = screen_size[1]
 
+        if frame_size is None:
+            frame_size = screen_size
+        self._frame_width = frame_size[0]
+        self._frame_height = frame_size[1]
+        self._scale = None
+        if tuple(frame_size) != tuple(screen_size):
+            self._scale = (
+                self._frame_width / self._screen_width,
+                self._frame_height / self._screen_height,
+            )
+        self.grayscale = grayscale
+        self._channels = 1 if grayscale else 3
+
         self._color = None
         self.display = None
-        self.surface = pygame.Surface(screen_size)
-        self.images = utils.load_images(
-            convert=False,
+        self.async_display = async_display
+        self.recorder = None
+        self.render_backend = render_backend
+        self._images_args = dict(
+            bg_type=background,
             bird_color=bird_color,
             pipe_color=pipe_color,
-            bg_type=background,
+            scale=self._scale,
         )
+        self.images = utils.get_images(**self._images_args)
+
+        if render_backend == "pygame":
+            self.surface = pygame.Surface(frame_size)
+            self.frame = None
+        else:
+            self.surface = None
+            self.frame = np.zeros(
+                (self._frame_width, self._frame_height, self._channels),
+                dtype=np.uint8,
+            )
+            self._sprites = self._get_sprites()
+
+        self._player_cache = OrderedDict()
+
+        self.incremental = incremental
+        self._drawn_game = None
+        self._drawn_objects = None
+        self._display_rects = None
+
         self.audio_on = audio_on
         self._audio_queue = []
         if audio_on:
@@ -90,19 +204,203 @@ class FlappyBirdRenderer:
 
         Required for drawing images on the screen.
         """
-        self.display = pygame.display.set_mode(
-            (self._screen_width, self._screen_height)
+        if self.async_display:
+            self.display = DisplayPresenter(
+                (self._frame_width, self._frame_height),
+                sounds=self.sounds if self.audio_on else None,
+            )
+            return
+
+        self.display = pygame.display.set_mode((self._frame_width, self._frame_height))
+        self.images = utils.get_images(converted=True, **self._images_args)
+
+        # The cached sprites were made from the unconverted images
+        self._player_cache.clear()
+        self._display_rects = None
+
+    def _get_sprites(self) -> Dict[str, Any]:
+        """Returns the static sprites decoded for the "numpy" backend.
+
+        The sprites are read-only, so they're decoded once per process and
+        shared by every renderer drawing the same assets in the same mode.
+        """
+        key = (
+            tuple(sorted(self._images_args.items())),
+            (self._frame_width, self._frame_height),
+            self.grayscale,
+        )
+        sprites = _SPRITES_CACHE.get(key)
+        if sprites is not None:
+            return sprites
+
+        sprites = {
+            name: self._decode_sprite(self.images[name])
+            for name in ("background", "base")
+            if self.images[name] is not None
+        }
+        if "background" not in sprites:
+            # copying a solid frame is much faster than broadcasting a color
+            background = np.empty(
+                (self._frame_width, self._frame_height, 3), dtype=np.uint8
+            )
+            background[...] = FILL_BACKGROUND_COLOR
+            sprites["background"] = self._decode_array(background)
+        sprites["numbers"] = tuple(
+            self._decode_sprite(img) for img in self.images["numbers"]
+        )
+        sprites["pipe"] = tuple(self._decode_sprite(img) for img in self.images["pipe"])
+
+        _SPRITES_CACHE[key] = sprites
+        return sprites
+
+    def _decode_sprite(self, surface: pygame.Surface) -> rasterizer.Sprite:
+        """Decodes a sprite for the "numpy" backend, in the frames' color mode."""
+        sprite = rasterizer.decode_sprite(surface)
+        return sprite.to_grayscale() if self.grayscale else sprite
+
+    def _decode_array(self, rgb: np.ndarray) -> rasterizer.Sprite:
+        """Makes an opaque sprite, in the frames' color mode, from RGB values."""
+        if self.grayscale:
+            rgb = rasterizer.to_grayscale(rgb)
+        return rasterizer.Sprite(rgb)
+
+    def _pos(self, x: float, y: float) -> Tuple[float, float]:
+        """Maps a position in the game to a position in the frame."""
+        if self._scale is None:
+            return x, y
+        return x * self._scale[0], y * self._scale[1]
+
+    def _make_player_surface(
+        self, player_idx: int, visible_rot: int, color: Optional[tuple]
+    ) -> pygame.Surface:
+        """Returns a new surface with the player's sprite rotated and tinted."""
+        player_surface = pygame.transform.rotate(
+            self.images["player"][player_idx],
+            visible_rot,
+        )
+
+        if color is not None:
+            player_surface.fill(color, special_flags=pygame.BLEND_RGBA_ADD)
+
+        return player_surface
+
+    def _get_player_key(self) -> tuple:
+        """Returns the animation frame, visible rotation and tint of the player."""
+        # Getting player's rotation
+        visible_rot = PLAYER_ROT_THR
+        if self.game.player_rot <= PLAYER_ROT_THR:
+            visible_rot = self.game.player_rot
+
+        color = None if self._color is None else tuple(self._color)
+        return self.game.player_idx, visible_rot, color
+
+    def _get_player_sprite(self) -> Union[pygame.Surface, rasterizer.Sprite]:
+        """Returns the player's current sprite, rotated and tinted.
+
+        The sprites are cached by animation frame, visible rotation and tint,
+        so they're only rotated (and decoded, with the "numpy" backend) the
+        first time they're drawn. The least recently used sprites are dropped
+        when the cache has more than :data:`PLAYER_CACHE_SIZE` sprites.
+        """
+        key = self._get_player_key()
+        sprite = self._player_cache.get(key)
+        if sprite is not None:
+            self._player_cache.move_to_end(key)
+            return sprite
+
+        sprite = self._make_player_surface(*key)
+        if self.render_backend == "numpy":
+            sprite = self._decode_sprite(sprite)
+
+        self._player_cache[key] = sprite
+        if len(self._player_cache) > PLAYER_CACHE_SIZE:
+            self._player_cache.popitem(last=False)
+        return sprite
+
+    def _get_objects(self, show_score: bool) -> List[tuple]:
+        """Returns the objects drawn over the background in the current frame.
+
+        Each object is represented by its rectangle in the frame, as a
+        `(x, y, width, height)` tuple (or `None` if not drawn), followed by
+        anything that changes its appearance.
+        """
+        if self.render_backend == "numpy":
+            pipe_size = (
+                self._sprites["pipe"][0].width,
+                self._sprites["pipe"][0].height,
+            )
+            base_size = (self._sprites["base"].width, self._sprites["base"].height)
+            number_sizes = [(n.width, n.height) for n in self._sprites["numbers"]]
+            player = self._get_player_sprite()
+            player_size = (player.width, player.height)
+        else:
+            pipe_size = self.images["pipe"][0].get_size()
+            base_size = self.images["base"].get_size()
+            number_sizes = [n.get_size() for n in self.images["numbers"]]
+            player_size = self._get_player_sprite().get_size()
+
+        def rect(position, size):
+            x, y = self._pos(*position)
+            return int(x), int(y), size[0], size[1]
+
+        objects = []
+        pipes = zip(self.game.pipes_x, self.game.upper_pipes_y, self.game.lower_pipes_y)
+        for pipe_x, up_y, low_y in pipes:
+            objects.append((rect((pipe_x, up_y), pipe_size),))
+            objects.append((rect((pipe_x, low_y), pipe_size),))
+        objects.append((rect((self.game.base_x, self.game.base_y), base_size),))
+
+        score_rect = None
+        if show_score:
+            sizes = [number_sizes[int(x)] for x in str(self.game.score)]
+            total_width = sum(w for w, _ in sizes)
+            x_offset = (self._frame_width - total_width) / 2
+            # digits are drawn at fractional offsets, so one extra column
+            score_rect = (
+                int(x_offset),
+                int(self._frame_height * 0.1),
+                total_width + 1,
+                max(h for _, h in sizes),
+            )
+        objects.append((score_rect, self.game.score))
+
+        objects.append(
+            (
+                rect((self.game.player_x, self.game.player_y), player_size),
+                self._get_player_key(),
+            )
         )
-        for name, value in self.images.items():
-            if value is None:
+        return objects
+
+    def _get_dirty_rects(self, show_score: bool) -> Optional[List[tuple]]:
+        """Returns the areas of the frame that changed since the last frame.
+
+        Returns `None` if the whole frame must be redrawn.
+        """
+        objects = self._get_objects(show_score)
+        drawn_objects, self._drawn_objects = self._drawn_objects, objects
+        if (
+            self._drawn_game is not self.game
+            or drawn_objects is None
+            or len(drawn_objects) != len(objects)
+        ):
+            self._drawn_game = self.game
+            return None
+
+        rects = []
+        for before, now in zip(drawn_objects, objects):
+            if before == now:
                 continue
 
-            if type(value) in (tuple, list):
-                self.images[name] = tuple([img.convert_alpha() for img in value])
-            else:
-                self.images[name] = (
-                    value.convert() if name == "background" else value.convert_alpha()
-                )
+            for rect in (before[0], now[0]):
+                if rect is None:
+                    continue
+                x0, y0 = max(rect[0], 0), max(rect[1], 0)
+                x1 = min(rect[0] + rect[2], self._frame_width)
+                y1 = min(rect[1] + rect[3], self._frame_height)
+                if x0 < x1 and y0 < y1:
+                    rects.append((x0, y0, x1 - x0, y1 - y0))
+        return rects
 
     def _draw_score(self) -> None:
         """Draws the score in the center of the surface."""
@@ -112,11 +410,11 @@ class FlappyBirdRenderer:
         for digit in score_digits:
             total_width += self.images["numbers"][digit].get_width()
 
-        x_offset = (self._screen_width - total_width) / 2
+        x_offset = (self._frame_width - total_width) / 2
 
         for digit in score_digits:
             self.surface.blit(
-                self.images["numbers"][digit], (x_offset, self._screen_height * 0.1)
+                self.images["numbers"][digit], (x_offset, self._frame_height * 0.1)
             )
             x_offset += self.images["numbers"][digit].get_width()
 
@@ -132,6 +430,30 @@ class FlappyBirdRenderer:
         if self.game is None:
             raise ValueError("A game logic must be assigned to the renderer!")
 
+        rects = self._get_dirty_rects(show_score) if self.incremental else None
+        if rects is None:
+            self._display_rects = None
+            if self.render_backend == "numpy":
+                self._rasterize(self.frame, show_score)
+            else:
+                self._draw_scene(show_score)
+            return
+
+        for rect in rects:
+            if self.render_backend == "numpy":
+                x0, y0, x1, y1 = rect[0], rect[1], rect[0] + rect[2], rect[1] + rect[3]
+                self._rasterize(self.frame[x0:x1, y0:y1], show_score, (x0, y0))
+            else:
+                self.surface.set_clip(rect)
+                self._draw_scene(show_score)
+        if self.render_backend == "pygame":
+            self.surface.set_clip(None)
+
+        if self._display_rects is not None:
+            self._display_rects.extend(rects)
+
+    def _draw_scene(self, show_score: bool) -> None:
+        """Draws the game on the renderer's surface (within its clip area)."""
         # Background
         if self.images["background"] is not None:
             self.surface.blit(self.images["background"], (0, 0))
@@ -139,33 +461,163 @@ class FlappyBirdRenderer:
             self.surface.fill(FILL_BACKGROUND_COLOR)
 
         # Pipes
-        for up_pipe, low_pipe in zip(self.game.upper_pipes, self.game.lower_pipes):
-            self.surface.blit(self.images["pipe"][0], (up_pipe["x"], up_pipe["y"]))
-            self.surface.blit(self.images["pipe"][1], (low_pipe["x"], low_pipe["y"]))
+        pipes = zip(self.game.pipes_x, self.game.upper_pipes_y, self.game.lower_pipes_y)
+        for pipe_x, up_y, low_y in pipes:
+            self.surface.blit(self.images["pipe"][0], self._pos(pipe_x, up_y))
+            self.surface.blit(self.images["pipe"][1], self._pos(pipe_x, low_y))
 
         # Base (ground)
-        self.surface.blit(self.images["base"], (self.game.base_x, self.game.base_y))
+        self.surface.blit(
+            self.images["base"], self._pos(self.game.base_x, self.game.base_y)
+        )
 
         # Score
         # (must be drawn before the player, so the player overlaps it)
         if show_score:
             self._draw_score()
 
-        # Getting player's rotation
-        visible_rot = PLAYER_ROT_THR
-        if self.game.player_rot <= PLAYER_ROT_THR:
-            visible_rot = self.game.player_rot
+        # Player
+        player_surface = self._get_player_sprite()
+        self.surface.blit(
+            player_surface, self._pos(self.game.player_x, self.game.player_y)
+        )
+
+    def _rasterize(
+        self,
+        frame: np.ndarray,
+        show_score: bool,
+        origin: Tuple[int, int] = (0, 0),
+    ) -> None:
+        """Draws the game on a `(width, height, channels)` array with the NumPy
+        rasterizer.
+
+        Follows the same drawing order as the pygame backend, so both produce
+        the same pixels. If `origin` is given, `frame` is the area of the full
+        frame whose top-left corner is at `origin`.
+        """
+        # Background
+        rasterizer.blit(frame, self._sprites["background"], (0, 0), origin)
+
+        # Pipes
+        up_pipe_sprite, low_pipe_sprite = self._sprites["pipe"]
+        pipes = zip(self.game.pipes_x, self.game.upper_pipes_y, self.game.lower_pipes_y)
+        for pipe_x, up_y, low_y in pipes:
+            rasterizer.blit(frame, up_pipe_sprite, self._pos(pipe_x, up_y), origin)
+            rasterizer.blit(frame, low_pipe_sprite, self._pos(pipe_x, low_y), origin)
+
+        # Base (ground)
+        rasterizer.blit(
+            frame,
+            self._sprites["base"],
+            self._pos(self.game.base_x, self.game.base_y),
+            origin,
+        )
+
+        # Score
+        if show_score:
+            numbers = self._sprites["numbers"]
+            score_digits = [int(x) for x in list(str(self.game.score))]
+            total_width = sum(numbers[digit].width for digit in score_digits)
+            x_offset = (self._frame_width - total_width) / 2
+
+            for digit in score_digits:
+                rasterizer.blit(
+                    frame,
+                    numbers[digit],
+                    (x_offset, self._frame_height * 0.1),
+                    origin,
+                )
+                x_offset += numbers[digit].width
 
         # Player
-        player_surface = pygame.transform.rotate(
-            self.images["player"][self.game.player_idx],
-            visible_rot,
+        rasterizer.blit(
+            frame,
+            self._get_player_sprite(),
+            self._pos(self.game.player_x, self.game.player_y),
+            origin,
+        )
+
+    def _check_frame_buffer(self, out: np.ndarray, layout: str) -> None:
+        """Raises an error if `out` can't hold a frame with the given layout."""
+        shape = frame_shape(
+            (self._frame_width, self._frame_height), layout, self._channels
         )
+        if out.shape != shape or out.dtype != np.uint8:
+            raise ValueError(
+                f"A frame buffer with the {layout} layout must be an uint8 array "
+                f"with shape {shape}, but got a {out.dtype} array with shape "
+                f"{out.shape}!"
+            )
+
+    def get_frame(
+        self, out: Optional[np.ndarray] = None, layout: str = "WHC"
+    ) -> np.ndarray:
+        """Returns the last drawn frame as an array.
+
+        Args:
+            out (Optional[np.ndarray]): Preallocated `uint8` array in which the
+                frame is written. If `None`, a new array is created.
+            layout (str): Memory layout of the returned array (see
+                :data:`FRAME_LAYOUTS`). The default one, "WHC", matches
+                `pygame.surfarray.array3d()`.
+
+        Returns:
+            An array with the RGB (or grayscale) values of the frame. If `out`
+            was given, it is returned.
+        """
+        if out is None:
+            pygame_whc = layout == "WHC" and self.render_backend == "pygame"
+            if pygame_whc and not self.grayscale:
+                return pygame.surfarray.array3d(self.surface)
+            out = np.empty(
+                frame_shape(
+                    (self._frame_width, self._frame_height), layout, self._channels
+                ),
+                dtype=np.uint8,
+            )
+        else:
+            self._check_frame_buffer(out, layout)
+
+        if self.render_backend == "numpy":
+            np.copyto(_whc_view(out, layout), self.frame)
+        else:
+            # a view of the surface's pixels (it locks the surface while alive)
+            pixels = pygame.surfarray.pixels3d(self.surface)
+            if self.grayscale:
+                rasterizer.to_grayscale(pixels, out=_whc_view(out, layout))
+            else:
+                np.copyto(_whc_view(out, layout), pixels)
+            del pixels
+        return out
 
-        if self._color is not None:
-            player_surface.fill(self._color, special_flags=pygame.BLEND_RGBA_ADD)
+    def draw_frame(
+        self, out: np.ndarray, layout: str = "WHC", show_score: bool = True
+    ) -> np.ndarray:
+        """Draws the current state of the game into a preallocated array.
 
-        self.surface.blit(player_surface, (self.game.player_x, self.game.player_y))
+        With the "numpy" backend, the game is rasterized straight into `out`,
+        without touching the renderer's own :attr:`frame`. With the "pygame"
+        backend, this is the same as :meth:`.draw_surface()` followed by
+        :meth:`.get_frame()`.
+
+        Args:
+            out (np.ndarray): The `uint8` array in which the frame is drawn.
+            layout (str): Memory layout of `out` (see :data:`FRAME_LAYOUTS`).
+            show_score (bool): Whether to draw the player's score or not.
+
+        Returns:
+            The array `out`.
+        """
+        if self.render_backend == "pygame":
+            self.draw_surface(show_score=show_score)
+            return self.get_frame(out, layout)
+
+        if self.game is None:
+            raise ValueError("A game logic must be assigned to the renderer!")
+
+        self._check_frame_buffer(out, layout)
+        self._rasterize(_whc_view(out, layout), show_score)
+        return out
 
     def update_display(self) -> None:
         """Updates the display with the current surface of the renderer.
@@ -182,8 +634,33 @@ class FlappyBirdRenderer:
                 "call the `make_display()` method."
             )
 
-        self.display.blit(self.surface, [0, 0])
-        pygame.display.update()
+        if self.async_display:
+            self._present()
+            return
+
+        rects = self._display_rects
+        if not self.incremental or rects is None:
+            if self.render_backend == "numpy":
+                frame = self.frame
+                if self.grayscale:
+                    frame = np.repeat(frame, 3, axis=2)
+                pygame.surfarray.blit_array(self.display, frame)
+            else:
+                self.display.blit(self.surface, [0, 0])
+            pygame.display.update()
+        else:
+            if self.render_backend == "numpy":
+                # a view of the display's pixels (it locks the display while alive)
+                pixels = pygame.surfarray.pixels3d(self.display)
+                for x, y, width, height in rects:
+                    area = (slice(x, x + width), slice(y, y + height))
+                    pixels[area] = self.frame[area]
+                del pixels
+            else:
+                for rect in rects:
+                    self.display.blit(self.surface, rect, rect)
+            pygame.display.update(rects)
+        self._display_rects = []
 
         # Sounds:
         if self.audio_on and self.game.sound_cache is not None:
@@ -191,5 +668,93 @@ class FlappyBirdRenderer:
             if sound_name in self.sounds:
                 self.sounds[sound_name].play()
 
+    def _present(self) -> None:
+        """Hands the current frame (and sound) to the display's thread."""
+        sound = None
+        if self.audio_on:
+            sound = self.game.sound_cache
+
+        if self.render_backend == "numpy":
+            frame = self.frame
+            if self.grayscale:
+                frame = np.broadcast_to(frame, (*frame.shape[:2], 3))
+            self.display.submit(frame, sound)
+        else:
+            # a view of the surface's pixels (it locks the surface while alive)
+            pixels = pygame.surfarray.pixels3d(self.surface)
+            self.display.submit(pixels, sound)
+            del pixels
+        self._display_rects = []
+
+    def close_display(self) -> None:
+        """Closes the display (stopping its thread, with `async_display`)."""
+        display, self.display = self.display, None
+        if isinstance(display, DisplayPresenter):
+            display.close()
+
+    def start_recording(self, path: str, **kwargs) -> VideoWriter:
+        """Starts streaming the recorded frames to a video file.
+
+        The frames are passed by :meth:`.record_frame()` and written by a
+        :class:`.VideoWriter` (stored as :attr:`recorder`), from its own thread.
+
+        Args:
+            path (str): Path of the video file.
+            **kwargs: Arguments of the :class:`.VideoWriter` (e.g. `fps`,
+                `stride` or `container`).
+
+        Returns:
+            The video writer.
+        """
+        self.stop_recording()
+        self.recorder = VideoWriter(
+            path,
+            (self._frame_width, self._frame_height),
+            channels=self._channels,
+            **kwargs,
+        )
+        return self.recorder
+
+    def record_frame(
+        self, frame: Optional[np.ndarray] = None, layout: str = "WHC"
+    ) -> None:
+        """Passes a frame to the video writer, if recording.
+
+        Args:
+            frame (Optional[np.ndarray]): The frame to record, e.g. one returned
+                by :meth:`.draw_frame()`. If `None`, the last frame drawn by
+                :meth:`.draw_surface()` is recorded.
+            layout (str): Memory layout of `frame` (see :data:`FRAME_LAYOUTS`).
+        """
+        if self.recorder is None:
+            return
+
+        if frame is not None:
+            self.recorder.submit(_whc_view(frame, layout))
+        elif self.render_backend == "numpy":
+            self.recorder.submit(self.frame)
+        elif self.grayscale:
+            self.recorder.submit(self.get_frame())
+        else:
+            # a view of the surface's pixels (it locks the surface while alive)
+            pixels = pygame.surfarray.pixels3d(self.surface)
+            self.recorder.submit(pixels)
+            del pixels
+
+    def stop_recording(self) -> None:
+        """Finishes writing the recorded frames and closes the video."""
+        if self.recorder is not None:
+            recorder, self.recorder = self.recorder, None
+            recorder.close()
+
+    def close(self) -> None:
+        """Finishes the recording (if any) and closes the display, even if the
+        former fails.
+        """
+        try:
+            self.stop_recording()
+        finally:
+            self.close_display()
+
     def set_color(self, color):
         self._color = color
@@ -32,13 +32,17 @@ released under the MIT license.
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pygame
 from pygame import Rect
 from pygame import image as pyg_image
 from pygame import mixer as pyg_mixer
 from pygame.transform import flip as img_flip
+from pygame.transform import scale as img_scale
+
+from flappy_bird_gymnasium.envs.hitmasks import masks_overlap
 
 _BASE_DIR = Path(os.path.dirname(os.path.realpath(__file__))).parent
 
@@ -46,34 +50,34 @@ SPRITES_PATH = str(_BASE_DIR / "assets/sprites")
 AUDIO_PATH = str(_BASE_DIR / "assets/audio")
 MODEL_PATH = str(_BASE_DIR / "assets/model")
 
+# Images returned by `get_images()`, shared by the whole process:
+_IMAGES_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
 
 def pixel_collision(
-    rect1: Rect, rect2: Rect, hitmask1: List[List[bool]], hitmask2: List[List[bool]]
+    rect1: Rect, rect2: Rect, hitmask1: np.ndarray, hitmask2: np.ndarray
 ) -> bool:
-    """Checks if two objects collide and not just their rects."""
-    rect = rect1.clip(rect2)
+    """Checks if two objects collide and not just their rects.
 
-    if rect.width == 0 or rect.height == 0:
-        return False
+    The hitmasks (see :func:`get_hitmask`) are compared with a single
+    vectorized AND over the rects' intersection.
+    """
+    return masks_overlap(hitmask1, rect1.topleft, hitmask2, rect2.topleft)
 
-    x1, y1 = rect.x - rect1.x, rect.y - rect1.y
-    x2, y2 = rect.x - rect2.x, rect.y - rect2.y
 
-    for x in range(rect.width):
-        for y in range(rect.height):
-            if hitmask1[x1 + x][y1 + y] and hitmask2[x2 + x][y2 + y]:
-                return True
-    return False
+def get_hitmask(image: pygame.Surface) -> np.ndarray:
+    """Returns a hitmask using an image's alpha (or color key).
 
-
-def get_hitmask(image) -> List[List[bool]]:
-    """Returns a hitmask using an image's alpha."""
-    mask = []
-    for x in range(image.get_width()):
-        mask.append([])
-        for y in range(image.get_height()):
-            mask[x].append(bool(image.get_at((x, y))[3]))
-    return mask
+    The hitmask is a boolean array indexed by `[x, y]`, like the arrays of
+    `pygame.surfarray`.
+    """
+    if image.get_colorkey() is not None:
+        alpha = pygame.surfarray.array_colorkey(image)
+    elif image.get_flags() & pygame.SRCALPHA:
+        alpha = pygame.surfarray.array_alpha(image)
+    else:
+        return np.ones(image.get_size(), dtype=bool)
+    return alpha > 0
 
 
 def _load_sprite(filename, convert, alpha=True):
@@ -83,13 +87,26 @@ def _load_sprite(filename, convert, alpha=True):
     )
 
 
+def _scale_sprite(img, scale):
+    # nearest-neighbour scaling keeps the palette and the color key
+    width, height = img.get_size()
+    return img_scale(
+        img, (max(1, round(width * scale[0])), max(1, round(height * scale[1])))
+    )
+
+
 def load_images(
     convert: bool = True,
     bg_type: Optional[str] = "day",
     bird_color: str = "yellow",
     pipe_color: str = "green",
+    scale: Optional[Tuple[float, float]] = None,
 ) -> Dict[str, Any]:
-    """Loads and returns the image assets of the game."""
+    """Loads and returns the image assets of the game.
+
+    If `scale` is given, every sprite is resized once by the given horizontal
+    and vertical factors.
+    """
     images = {}
 
     try:
@@ -133,9 +150,80 @@ def load_images(
             f" directory: {SPRITES_PATH}"
         ) from ex
 
+    if scale is not None:
+        for name, value in images.items():
+            if type(value) is tuple:
+                images[name] = tuple([_scale_sprite(img, scale) for img in value])
+            elif value is not None:
+                images[name] = _scale_sprite(value, scale)
+
     return images
 
 
+def convert_images(images: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns copies of the given images in the display's pixel format.
+
+    The background is converted without per-pixel alpha and every other sprite
+    with it. A display must have been created with `pygame.display.set_mode()`.
+    """
+    converted = {}
+    for name, value in images.items():
+        if value is None:
+            converted[name] = None
+        elif type(value) in (tuple, list):
+            converted[name] = tuple([img.convert_alpha() for img in value])
+        else:
+            converted[name] = (
+                value.convert() if name == "background" else value.convert_alpha()
+            )
+    return converted
+
+
+def get_images(
+    bg_type: Optional[str] = "day",
+    bird_color: str = "yellow",
+    pipe_color: str = "green",
+    scale: Optional[Tuple[float, float]] = None,
+    converted: bool = False,
+) -> Dict[str, Any]:
+    """Returns the image assets of the game, loading them once per process.
+
+    The images are loaded by :func:`load_images` (without conversion) and, if
+    `converted` is `True`, converted by :func:`convert_images`. Both versions
+    are cached, so every caller asking for the same assets gets the same
+    sprites. Processes forked afterwards inherit the cache, sharing the
+    sprites' pixels copy-on-write.
+
+    The sprites must be treated as read-only. The returned dictionary is a new
+    one on every call, though, so its items can be replaced.
+    """
+    if scale is not None:
+        scale = tuple(scale)
+    key = (bg_type, bird_color, pipe_color, scale, converted)
+
+    images = _IMAGES_CACHE.get(key)
+    if images is None:
+        if converted:
+            images = convert_images(
+                get_images(bg_type, bird_color, pipe_color, scale, converted=False)
+            )
+        else:
+            images = load_images(
+                convert=False,
+                bg_type=bg_type,
+                bird_color=bird_color,
+                pipe_color=pipe_color,
+                scale=scale,
+            )
+        _IMAGES_CACHE[key] = images
+    return dict(images)
+
+
+def clear_images_cache() -> None:
+    """Drops the images cached by :func:`get_images`."""
+    _IMAGES_CACHE.clear()
+
+
 def load_sounds() -> Dict[str, pyg_mixer.Sound]:
     """Loads and returns the audio assets of the game."""
     sounds = {}
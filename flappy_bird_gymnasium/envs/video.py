@@ -0,0 +1,275 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Streams rendered frames to video files, from a background thread.
+
+The frames are written uncompressed, so no encoder is needed, in one of two
+containers:
+
+* "y4m": a YUV4MPEG2 stream (playable by most video players and readable by
+  `ffmpeg`), with full resolution chroma ("C444") for RGB frames and a single
+  luma plane ("Cmono") for grayscale ones, both in the limited (16-235) range
+  of BT.601 luma.
+* "raw": the frames' pixels, row by row (i.e. `(height, width, channels)`
+  arrays), one after the other, with a JSON index file (`<path>.json`) holding
+  their size and number. They can be memory-mapped back with
+  :func:`load_raw_video()`.
+"""
+
+import json
+import os
+import threading
+from typing import Tuple
+
+import numpy as np
+
+#: Available video containers.
+VIDEO_CONTAINERS = ("y4m", "raw")
+
+#: Version of the index of the raw videos.
+VERSION = 1
+
+
+def _index_path(path: str) -> str:
+    return path + ".json"
+
+
+def _rgb_to_yuv(rgb: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Converts `(height, width, 3)` RGB pixels to `(3, height, width)` YUV
+    planes, with the (limited range) BT.601 integer approximation that's
+    assumed by the decoders of YUV4MPEG2 streams.
+    """
+    r, g, b = (rgb[..., i].astype(np.int32) for i in range(3))
+    out[0] = ((66 * r + 129 * g + 25 * b + 128) >> 8) + 16
+    out[1] = ((-38 * r - 74 * g + 112 * b + 128) >> 8) + 128
+    out[2] = ((112 * r - 94 * g - 18 * b + 128) >> 8) + 128
+    return out
+
+
+def _gray_to_luma(gray: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Scales grayscale pixels to the limited range of BT.601 luma, like the
+    luma of :func:`_rgb_to_yuv()`.
+    """
+    out[...] = 16 + gray.astype(np.int32) * 219 // 255
+    return out
+
+
+class VideoWriter:
+    """Writes frames to a video file from a dedicated thread.
+
+    :meth:`.submit()` copies a frame into a bounded ring of preallocated
+    buffers and returns, while the writer's thread converts and writes the
+    buffered frames. When all the buffers are full (i.e. the disk can't keep
+    up), :meth:`.submit()` waits for one to be written, so no frames are lost
+    and the memory used doesn't grow with the video's length.
+
+    Args:
+        path (str): Path of the video file.
+        frame_size (Tuple[int, int]): Width and height of the frames.
+        channels (int): Number of channels of the frames: 3 for RGB and 1 for
+            grayscale.
+        fps (int): Frame rate stored in the video (the "y4m" container) or in
+            its index (the "raw" container).
+        stride (int): Only every `stride`-th submitted frame is written (the
+            first one included), to thin long episodes.
+        container (str): Container of the video (see :data:`VIDEO_CONTAINERS`).
+        buffer_size (int): Number of frames that can be waiting to be written.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        frame_size: Tuple[int, int],
+        channels: int = 3,
+        fps: int = 30,
+        stride: int = 1,
+        container: str = "y4m",
+        buffer_size: int = 32,
+    ) -> None:
+        if container not in VIDEO_CONTAINERS:
+            raise ValueError(
+                f'Invalid video container "{container}"! The available containers '
+                f"are: {VIDEO_CONTAINERS}."
+            )
+        if channels not in (1, 3):
+            raise ValueError(f"The frames must have 1 or 3 channels, not {channels}!")
+        if stride < 1:
+            raise ValueError(f"The stride must be at least 1, not {stride}!")
+        if buffer_size < 1:
+            raise ValueError(f"The buffer size must be at least 1, not {buffer_size}!")
+
+        self.path = path
+        self.frame_size = tuple(frame_size)
+        self.channels = channels
+        self.fps = fps
+        self.stride = stride
+        self.container = container
+
+        width, height = self.frame_size
+        self._buffers = np.zeros((buffer_size, height, width, channels), np.uint8)
+        self._yuv = np.empty((3, height, width), dtype=np.uint8)
+        self._filled = 0  # number of frames copied to the buffers
+        self._written = 0  # number of frames written to the file
+        self._error = None
+
+        self.frames_submitted = 0
+        self._file = open(path, "wb")
+        if container == "y4m":
+            chroma = "C444" if channels == 3 else "Cmono"
+            self._file.write(
+                f"YUV4MPEG2 W{width} H{height} F{fps}:1 Ip A1:1 {chroma}\n".encode()
+            )
+
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="flappy-bird-video", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "VideoWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def frames_written(self) -> int:
+        """Number of frames written to the file so far."""
+        with self._condition:
+            return self._written
+
+    def submit(self, frame: np.ndarray) -> bool:
+        """Queues a frame to be written (if it isn't skipped by the stride).
+
+        Args:
+            frame (np.ndarray): `uint8` frame, with shape `(width, height,
+                channels)` (the layout of `pygame.surfarray`). It's copied, so
+                it can be modified once this method returns.
+
+        Returns:
+            Whether the frame was queued.
+        """
+        if self._closed:
+            raise ValueError("The video writer is closed!")
+
+        index = self.frames_submitted
+        self.frames_submitted += 1
+        if index % self.stride:
+            return False
+
+        with self._condition:
+            while self._filled - self._written == len(self._buffers):
+                if self._error is not None:
+                    break
+                self._condition.wait()
+            if self._error is not None:
+                raise RuntimeError("The video writer failed!") from self._error
+
+        # (the writer's thread doesn't touch the buffers that aren't filled)
+        buffer = self._buffers[self._filled % len(self._buffers)]
+        np.copyto(buffer.transpose(1, 0, 2), frame)
+        with self._condition:
+            self._filled += 1
+            self._condition.notify_all()
+        return True
+
+    def close(self) -> None:
+        """Writes the queued frames and closes the video (and writes its index,
+        for the "raw" container).
+        """
+        if self._closed:
+            return
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._file.close()
+        if self._error is not None:
+            raise RuntimeError("The video writer failed!") from self._error
+
+        if self.container == "raw":
+            width, height = self.frame_size
+            index = {
+                "version": VERSION,
+                "width": width,
+                "height": height,
+                "channels": self.channels,
+                "fps": self.fps,
+                "stride": self.stride,
+                "num_frames": self._written,
+            }
+            path = _index_path(self.path)
+            with open(path + ".tmp", "w") as file:
+                json.dump(index, file, indent=2)
+            os.replace(path + ".tmp", path)
+
+    def _write(self, frame: np.ndarray) -> None:
+        if self.container == "raw":
+            self._file.write(frame.data)
+            return
+
+        self._file.write(b"FRAME\n")
+        if self.channels == 1:
+            self._file.write(_gray_to_luma(frame[..., 0], out=self._yuv[0]).data)
+        else:
+            self._file.write(_rgb_to_yuv(frame, out=self._yuv).data)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._written == self._filled and not self._closed:
+                    self._condition.wait()
+                if self._written == self._filled:
+                    return
+                frame = self._buffers[self._written % len(self._buffers)]
+
+            try:
+                self._write(frame)
+            except Exception as error:
+                with self._condition:
+                    self._error = error
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                self._written += 1
+                self._condition.notify_all()
+
+
+def load_raw_video(path: str) -> np.ndarray:
+    """Memory-maps the frames of a video written with the "raw" container.
+
+    Args:
+        path (str): Path of the video file (not of its index).
+
+    Returns:
+        A read-only array with shape `(num_frames, height, width, channels)`.
+    """
+    with open(_index_path(path)) as file:
+        index = json.load(file)
+    shape = (index["num_frames"], index["height"], index["width"], index["channels"])
+    if shape[0] == 0:
+        return np.empty(shape, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r", shape=shape)
@@ -0,0 +1,166 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Game loops run by the command line interface.
+
+Each function plays one episode of the Flappy Bird environment on a window,
+controlled either by a human player, by a random agent or by the bundled Deep Q
+Network agent. pygame (and the agent) are only imported when an episode is
+played, so loading the command line interface doesn't import them.
+"""
+
+import time
+
+import gymnasium
+
+
+def play_human(fps: int = 15, audio_on: bool = True) -> float:
+    """Plays an episode controlled with the keyboard (space or up arrow).
+
+    Returns:
+        The total reward obtained in the episode.
+    """
+    import pygame
+
+    env = gymnasium.make("FlappyBird-v0", audio_on=audio_on, render_mode="human")
+
+    clock = pygame.time.Clock()
+    score = 0
+
+    obs, _ = env.reset()
+    while True:
+        env.render()
+
+        # Getting action:
+        action = 0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                env.close()
+                return score
+            if event.type == pygame.KEYDOWN and (
+                event.key == pygame.K_SPACE or event.key == pygame.K_UP
+            ):
+                action = 1
+
+        # Processing:
+        obs, reward, done, _, info = env.step(action)
+
+        score += reward
+        print(f"Obs: {obs}\n" f"Action: {action}\n" f"Score: {score}\n")
+
+        clock.tick(fps)
+
+        if done:
+            env.render()
+            time.sleep(0.6)
+            break
+
+    env.close()
+    return score
+
+
+def play_random(fps: int = 30, audio_on: bool = True, seed: int = 123) -> float:
+    """Plays an episode with a random agent.
+
+    Returns:
+        The total reward obtained in the episode.
+    """
+    import pygame
+
+    env = gymnasium.make("FlappyBird-v0", audio_on=audio_on, render_mode="human")
+    env.action_space.seed(seed)
+
+    score = 0
+    obs, _ = env.reset(seed=seed)
+    while True:
+        env.render()
+
+        # Getting random action:
+        action = env.action_space.sample()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                env.close()
+                return score
+
+        # Processing:
+        obs, reward, done, _, info = env.step(action)
+
+        score += reward
+        print(f"Obs: {obs}\n" f"Score: {score}\n")
+
+        time.sleep(1 / fps)
+
+        if done:
+            env.render()
+            time.sleep(0.5)
+            break
+
+    env.close()
+    return score
+
+
+def play_dqn(fps: int = 30, audio_on: bool = True, seed: int = 123) -> float:
+    """Plays an episode with the bundled Deep Q Network agent (see
+    :class:`.DuelingDQN`).
+
+    Returns:
+        The total reward obtained in the episode.
+    """
+    import pygame
+
+    from flappy_bird_gymnasium.dqn import DuelingDQN
+
+    env = gymnasium.make("FlappyBird-v0", audio_on=audio_on, render_mode="human")
+    agent = DuelingDQN()
+
+    score = 0
+    obs, _ = env.reset(seed=seed)
+    while True:
+        env.render()
+
+        # Getting the agent's action:
+        q_values = agent.q_values(obs)
+        action = int(q_values.argmax())
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                env.close()
+                return score
+
+        # Processing:
+        obs, reward, done, _, info = env.step(action)
+
+        score += reward
+        print(f"Q-values: {q_values}\n" f"Action: {action}\n" f"Score: {score}\n")
+
+        time.sleep(1 / fps)
+
+        if done:
+            env.render()
+            time.sleep(0.5)
+            break
+
+    env.close()
+    return score
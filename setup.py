@@ -38,7 +38,7 @@ short_description = "A Gymnasium environment for the Flappy Bird game."
 # The compatible release operator (`~=`) is used to match any candidate version
 # that is expected to be compatible with the specified version.
 REQUIRED_PACKAGES = [
-    "gymnasium",
+    "gymnasium>=1.0",
     "numpy",
     "pygame",
 ]
@@ -64,7 +64,7 @@ setuptools.setup(
     },
     download_url="https://github.com/markub3327/flappy-bird-gymnasium/releases",
     # Contained modules and scripts:
-    packages=setuptools.find_packages(include=['flappy_bird_gymnasium', 'flappy_bird_gymnasium.*', 'tests', 'tests.*']),
+    packages=setuptools.find_packages(include=['flappy_bird_gymnasium', 'flappy_bird_gymnasium.*']),
     package_data={
         "flappy_bird_gymnasium": [
             "assets/sprites/*",
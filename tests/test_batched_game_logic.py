@@ -0,0 +1,96 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests that the batched game logic matches the single game logic."""
+
+import numpy as np
+
+from flappy_bird_gymnasium.envs.batched_game_logic import BatchedFlappyBirdLogic
+from flappy_bird_gymnasium.envs.game_logic import FlappyBirdLogic
+from flappy_bird_gymnasium.envs.hitmasks import get_hitmasks
+
+
+def play(num_games=32, max_steps=1000, hitmasks=None):
+    batch = BatchedFlappyBirdLogic(
+        [np.random.default_rng(seed) for seed in range(num_games)],
+        screen_size=(288, 512),
+        gap_buffer_size=4,
+        hitmasks=hitmasks,
+    )
+    games = [
+        FlappyBirdLogic(
+            np.random.default_rng(seed), screen_size=(288, 512), hitmasks=hitmasks
+        )
+        for seed in range(num_games)
+    ]
+    noise = np.random.default_rng(0)
+
+    for _ in range(max_steps):
+        # Flapping when the bird is below the gap of the next pipe:
+        next_pipe = np.where(
+            batch.pipes_x + 52 >= batch.player_x, batch.pipes_x, np.inf
+        ).argmin(axis=1)
+        low_y = batch.lower_pipes_y[np.arange(num_games), next_pipe]
+        actions = batch.player_y + 32 + noise.integers(-10, 10, num_games) > low_y
+        actions = actions.astype(np.int64)
+
+        was_alive = batch.alive.copy()
+        rewards, alive = batch.update_state(actions)
+
+        for i, game in enumerate(games):
+            if not was_alive[i]:
+                assert rewards[i] == 0
+                continue
+
+            reward, game_alive = game.update_state(actions[i])
+            assert reward == rewards[i]
+            assert game_alive == alive[i]
+            assert game.player_y == batch.player_y[i]
+            assert game.player_vel_y == batch.player_vel_y[i]
+            assert game.player_rot == batch.player_rot[i]
+            assert game.player_idx == batch.player_idx[i]
+            assert game.base_x == batch.base_x[i]
+            assert game.score == batch.score[i]
+            assert game.pipes_x == list(batch.pipes_x[i])
+            assert game.upper_pipes_y == list(batch.upper_pipes_y[i])
+            assert game.lower_pipes_y == list(batch.lower_pipes_y[i])
+
+        if not alive.any():
+            break
+
+    return batch
+
+
+def test_play():
+    batch = play()
+    assert batch.score.max() > 2
+
+
+def test_play_precise_collision():
+    batch = play(hitmasks=get_hitmasks())
+    assert batch.score.max() > 2
+
+
+if __name__ == "__main__":
+    play()
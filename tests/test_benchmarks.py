@@ -0,0 +1,76 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the benchmark suite."""
+
+import copy
+import json
+
+from flappy_bird_gymnasium import benchmarks
+
+
+def play(output="benchmarks.json"):
+    benchmarks.bench(output=output, quick=True)
+
+
+def test_run_benchmarks(tmp_path):
+    results = benchmarks.run_benchmarks(
+        scale=0.001, screen_sizes=[(288, 512)], num_envs=[1, 2]
+    )
+    names = [result["name"] for result in results["results"]]
+    assert len(set(names)) == len(names)
+    assert "step FlappyBird-v0 screen_size=288x512" in names
+    assert "vector_step FlappyBird-v0 num_envs=2" in names
+    for result in results["results"]:
+        if "steps_per_sec" in result:
+            assert result["steps_per_sec"] > 0
+            assert 0 < result["p50_us"] <= result["p99_us"]
+        else:
+            assert result["bytes_per_env"] > 0
+
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps(results))
+    assert benchmarks.compare(results, json.loads(path.read_text())) == []
+
+
+def test_compare():
+    baseline = {
+        "results": [
+            {"name": "a", "steps_per_sec": 1000, "p50_us": 1, "p99_us": 2},
+            {"name": "b", "steps_per_sec": 1000, "p50_us": 1, "p99_us": 2},
+            {"name": "c", "bytes_per_env": 1000},
+        ]
+    }
+    results = copy.deepcopy(baseline)
+    results["results"][0]["steps_per_sec"] = 700  # slower
+    results["results"][1]["steps_per_sec"] = 900  # within the tolerance
+    results["results"][2]["bytes_per_env"] = 1500  # more memory
+    results["results"].append({"name": "d", "bytes_per_env": 1})  # new
+
+    regressions = benchmarks.compare(results, baseline, tolerance=0.2)
+    assert [r.split(":")[0] for r in regressions] == ["a", "c"]
+
+
+if __name__ == "__main__":
+    play()
@@ -0,0 +1,111 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the pipe gap buffers and the fixed courses."""
+
+import time
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium  # noqa: F401
+from flappy_bird_gymnasium.envs.courses import (
+    generate_courses,
+    load_courses,
+    save_courses,
+)
+from flappy_bird_gymnasium.envs.game_logic import PIPE_HEIGHT, FlappyBirdLogic
+
+
+def play_episode(env, seed=None, options=None, actions_seed=0):
+    obs, _ = env.reset(seed=seed, options=options)
+    rng = np.random.default_rng(actions_seed)
+    observations = [obs]
+    terminated = False
+    while not terminated:
+        obs, _, terminated, _, _ = env.step(int(rng.random() < 0.09))
+        observations.append(obs)
+    return np.array(observations)
+
+
+def play(num_resets=20000, course_file="courses.npy"):
+    save_courses(course_file, generate_courses(100))
+    for kwargs in ({}, {"course_file": course_file}):
+        env = gymnasium.make("FlappyBird-v0", **kwargs).unwrapped
+        env.reset(seed=0)
+        start = time.perf_counter()
+        for _ in range(num_resets):
+            env.reset()
+        elapsed = time.perf_counter() - start
+        print(f"{kwargs}: {elapsed / num_resets * 1e6:.2f} us/reset")
+
+
+def test_gap_buffer():
+    games = [
+        FlappyBirdLogic(np.random.default_rng(5), (288, 512), gap_buffer_size=size)
+        for size in (1, 4, 64)
+    ]
+    for _ in range(2000):
+        for game in games:
+            game.update_state(FlappyBirdLogic.Actions.IDLE)
+            game.player_y = 200  # keeps it alive
+        assert games[0].upper_pipes_y == games[1].upper_pipes_y
+        assert games[0].lower_pipes_y == games[2].lower_pipes_y
+
+
+def test_courses(tmp_path):
+    path = tmp_path / "courses.npy"
+    save_courses(path, generate_courses(4, num_pipes=32, seed=10))
+    courses = load_courses(path)
+    assert courses.shape == (4, 32)
+    assert load_courses(path) is courses
+
+    env = gymnasium.make("FlappyBird-v0", course_file=str(path))
+    course_env = gymnasium.make("FlappyBird-v0")
+    for i in (0, 1, 3):
+        # the courses match the games seeded with `seed + i`
+        expected = play_episode(course_env, seed=10 + i)
+        rng_state = env.unwrapped.np_random.bit_generator.state
+        observations = play_episode(env, options={"course": i})
+        np.testing.assert_array_equal(observations, expected)
+        assert env.unwrapped.np_random.bit_generator.state == rng_state
+
+    # by default, the next course is played
+    np.testing.assert_array_equal(
+        play_episode(env, actions_seed=1), play_episode(course_env, 10, None, 1)
+    )
+
+
+def test_course_repeats():
+    course = [150, 160, 170, 180]
+    game = FlappyBirdLogic(np.random.default_rng(0), (288, 512), course=course)
+    assert [y + PIPE_HEIGHT for y in game.upper_pipes_y] == course[:3]
+    assert game.gap_buffer is None
+
+    gaps = [game._get_random_pipe()[1] - 100 for _ in range(6)]
+    assert gaps == [180, 150, 160, 170, 180, 150]
+
+
+if __name__ == "__main__":
+    play()
@@ -0,0 +1,154 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the streaming of transitions to memory-mapped datasets."""
+
+import os
+import tempfile
+import time
+
+import gymnasium
+import numpy as np
+import pytest
+
+import flappy_bird_gymnasium  # noqa: F401
+from flappy_bird_gymnasium.dataset import TrajectoryReader, TrajectoryWriter
+
+
+def resident_memory():
+    """Returns the resident memory of this process, in MiB (Linux only)."""
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def collect(writer, num_envs, num_steps, seed=0):
+    """Plays a vector environment with random actions, adding its transitions
+    to `writer` (if given), and returns the added transitions.
+    """
+    envs = gymnasium.make_vec("FlappyBird-v0", num_envs=num_envs)
+    obs, _ = envs.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    autoreset = np.zeros(num_envs, dtype=bool)
+    transitions = []
+    for _ in range(num_steps):
+        actions = (rng.random(num_envs) < 0.1).astype(np.int64)
+        next_obs, rewards, terminated, truncated, _ = envs.step(actions)
+        if writer is not None:
+            writer.add_batch(obs, actions, rewards, terminated, truncated, ~autoreset)
+            transitions.append((obs[~autoreset], actions[~autoreset], terminated))
+        autoreset = terminated | truncated
+        obs = next_obs
+    envs.close()
+    return transitions
+
+
+def play(num_envs=1024, num_steps=2000):
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        collect(None, num_envs, num_steps)
+        env_rate = num_envs * num_steps / (time.perf_counter() - start)
+
+        memory = resident_memory()
+        start = time.perf_counter()
+        with TrajectoryWriter(directory, num_envs=num_envs) as writer:
+            envs = gymnasium.make_vec("FlappyBird-v0", num_envs=num_envs)
+            obs, _ = envs.reset(seed=0)
+            autoreset = np.zeros(num_envs, dtype=bool)
+            for _ in range(num_steps):
+                actions = np.zeros(num_envs, dtype=np.int64)
+                next_obs, rewards, terminated, truncated, _ = envs.step(actions)
+                writer.add_batch(
+                    obs, actions, rewards, terminated, truncated, ~autoreset
+                )
+                autoreset = terminated | truncated
+                obs = next_obs
+        rate = writer.num_transitions / (time.perf_counter() - start)
+
+        print(f"Vector env alone: {env_rate:,.0f} transitions/s")
+        print(f"Vector env + writer: {rate:,.0f} transitions/s")
+        print(f"Transitions written: {writer.num_transitions:,}")
+        print(f"Resident memory growth: {resident_memory() - memory:.1f} MiB")
+
+
+def test_write_and_read(tmp_path):
+    num_envs = 16
+    with TrajectoryWriter(
+        tmp_path, num_envs=num_envs, shard_size=1000, chunk_size=300
+    ) as writer:
+        transitions = collect(writer, num_envs, num_steps=300)
+    obs = np.concatenate([t[0] for t in transitions])
+    actions = np.concatenate([t[1] for t in transitions])
+
+    dataset = TrajectoryReader(tmp_path)
+    assert len(dataset) == len(obs) == writer.num_transitions
+    assert len(dataset.fields["actions"]) == -(-len(obs) // 1000)
+
+    data = dataset[:]
+    np.testing.assert_array_equal(data["observations"], obs)
+    np.testing.assert_array_equal(data["actions"], actions)
+
+    # slices within a shard are views, the chunks of slices across shards too
+    assert not dataset[1010:1020]["observations"].flags.owndata
+    chunks = list(dataset.chunks(990, 2010))
+    assert [len(chunk["actions"]) for chunk in chunks] == [10, 1000, 10]
+    assert not any(chunk["actions"].flags.owndata for chunk in chunks)
+    np.testing.assert_array_equal(dataset[990:2010]["observations"], obs[990:2010])
+    np.testing.assert_array_equal(dataset[-1]["observations"], obs[-1])
+
+    # each episode ends with its only termination, and its ids are increasing
+    episode_ids = data["episode_ids"]
+    ends = np.flatnonzero(data["terminated"])
+    assert len(np.unique(episode_ids[ends])) == len(ends)
+    for episode_id in np.unique(episode_ids)[:50]:
+        rows = np.flatnonzero(episode_ids == episode_id)
+        terminated = data["terminated"][rows]
+        assert not terminated[:-1].any()
+        # (starting with the initial, normalized, vertical position of the bird)
+        assert data["observations"][rows[0], 9] == 244 / 512
+
+    with pytest.raises(ValueError):
+        dataset[::2]
+
+
+def test_single_env(tmp_path):
+    env = gymnasium.make("FlappyBird-v0")
+    obs, _ = env.reset(seed=1)
+    with TrajectoryWriter(tmp_path) as writer:
+        for _ in range(3):
+            terminated = False
+            while not terminated:
+                next_obs, reward, terminated, truncated, _ = env.step(0)
+                writer.add(obs, 0, reward, terminated, truncated)
+                obs = next_obs
+            obs, _ = env.reset()
+    env.close()
+
+    data = TrajectoryReader(tmp_path)[:]
+    assert data["terminated"].sum() == 3
+    assert list(np.unique(data["episode_ids"])) == [0, 1, 2]
+    assert list(data["rewards"][data["terminated"]]) == [-1, -1, -1]
+
+
+if __name__ == "__main__":
+    play()
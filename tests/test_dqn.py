@@ -0,0 +1,89 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the NumPy version of the bundled Deep Q Network agent."""
+
+import time
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium  # noqa: F401
+from flappy_bird_gymnasium.dqn import DuelingDQN, evaluate
+
+
+def play(num_episodes=1024, max_steps=1000):
+    agent = DuelingDQN()
+    start = time.perf_counter()
+    scores = evaluate(agent, num_episodes=num_episodes, max_steps=max_steps)
+    print(
+        f"{num_episodes} episodes in {time.perf_counter() - start:.2f} s: "
+        f"mean score {scores.mean():.2f}, min {scores.min()}, max {scores.max()}"
+    )
+    return scores
+
+
+def test_q_values():
+    agent = DuelingDQN()
+    obs = np.random.default_rng(0).random((10, 12))
+
+    q_values = agent.q_values(obs)
+    assert q_values.shape == (10, 2)
+    assert q_values.dtype == np.float32
+    np.testing.assert_allclose(agent.q_values(obs[3]), q_values[3], rtol=1e-5)
+    np.testing.assert_array_equal(agent(obs), q_values.argmax(axis=1))
+
+
+def test_play():
+    agent = DuelingDQN()
+    env = gymnasium.make("FlappyBird-v0", audio_on=False)
+    obs, _ = env.reset(seed=123)
+    score = 0
+    while True:
+        obs, reward, terminated, _, info = env.step(int(agent(obs)))
+        score += reward
+        if terminated:
+            break
+    env.close()
+
+    assert info["score"] > 0
+    assert score > 10.999999999999977
+
+
+def test_evaluate():
+    agent = DuelingDQN()
+    scores = evaluate(agent, num_episodes=12, num_envs=5, max_steps=300)
+    assert scores.shape == (12,)
+    assert (scores > 0).all()
+    # the scores of the seeded episodes don't depend on the number of envs
+    np.testing.assert_array_equal(
+        scores, evaluate(agent, num_episodes=12, num_envs=12, max_steps=300)
+    )
+    np.testing.assert_array_equal(
+        scores[2:4], evaluate(agent, num_episodes=2, seed=2, max_steps=300)
+    )
+
+
+if __name__ == "__main__":
+    play()
@@ -0,0 +1,132 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the frame skipping of the Flappy Bird environments against
+environments stepped once per frame.
+"""
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium  # noqa: F401
+from flappy_bird_gymnasium.envs.recording import EpisodeRecorder, EpisodeReplayer
+
+
+def play(
+    env_id="FlappyBird-rgb-v0",
+    frame_skip=4,
+    max_pool_frames=False,
+    frame_stack=1,
+    **kwargs,
+):
+    kwargs.update(audio_on=False)
+    if env_id == "FlappyBird-rgb-v0":
+        kwargs.update(render_backend="numpy")
+        env = gymnasium.make(
+            env_id,
+            frame_skip=frame_skip,
+            max_pool_frames=max_pool_frames,
+            frame_stack=frame_stack,
+            **kwargs,
+        )
+    else:
+        env = gymnasium.make(env_id, frame_skip=frame_skip, **kwargs)
+    reference = gymnasium.make(env_id, **kwargs)
+
+    obs, _ = env.reset(seed=3)
+    reference_obs, _ = reference.reset(seed=3)
+    np.testing.assert_array_equal(obs[-1] if frame_stack > 1 else obs, reference_obs)
+
+    num_steps = 0
+    while True:
+        action = int(num_steps % 3 == 0)
+        obs, reward, terminated, _, info = env.step(action)
+        num_steps += 1
+        if frame_stack > 1:
+            obs = obs[-1]
+
+        # The same ticks, one per step:
+        total_reward = 0
+        frames = []
+        for _ in range(frame_skip):
+            reference_obs, tick_reward, reference_terminated, _, _ = reference.step(
+                action
+            )
+            total_reward += tick_reward
+            frames.append(np.copy(reference_obs))
+            if reference_terminated:
+                break
+
+        if max_pool_frames and len(frames) > 1:
+            np.testing.assert_array_equal(obs, np.maximum(frames[-2], frames[-1]))
+        else:
+            np.testing.assert_array_equal(obs, frames[-1])
+        assert reward == total_reward
+        assert terminated == reference_terminated
+        if terminated:
+            break
+
+    env.close()
+    reference.close()
+    return num_steps, info["score"]
+
+
+def test_simple_env():
+    num_steps, _ = play("FlappyBird-v0", frame_skip=3)
+    assert num_steps > 1
+
+
+def test_rgb_env():
+    play(frame_skip=2)
+    play(frame_skip=4, max_pool_frames=True)
+    play(frame_skip=3, max_pool_frames=True, frame_stack=3)
+    play(frame_skip=3, max_pool_frames=True, obs_size=(84, 84), grayscale_obs=True)
+
+
+def test_invalid_frame_skip():
+    for env_id in ("FlappyBird-v0", "FlappyBird-rgb-v0"):
+        try:
+            gymnasium.make(env_id, frame_skip=0)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("A frame skip of 0 was accepted!")
+
+
+def test_replay(tmp_path):
+    env = EpisodeRecorder(
+        gymnasium.make("FlappyBird-v0", audio_on=False, frame_skip=4), tmp_path
+    )
+    env.reset(seed=5)
+    terminated = False
+    while not terminated:
+        _, _, terminated, _, info = env.step(int(env.unwrapped._game.player_y > 280))
+    env.close()
+
+    assert env.last_record.env_kwargs["frame_skip"] == 4
+    assert EpisodeReplayer(env.last_record).verify() == info["score"]
+
+
+if __name__ == "__main__":
+    print(play(max_pool_frames=True))
@@ -0,0 +1,75 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests and benchmarks the game logic's step."""
+
+import numpy as np
+import pytest
+
+from flappy_bird_gymnasium import benchmarks
+from flappy_bird_gymnasium.envs.game_logic import PIPE_HEIGHT, FlappyBirdLogic
+
+#: Maximum median time, in microseconds, of a step of the game's logic. The
+#: step took 7.8 us before the logic was slotted and pygame-free, and 4.6 us
+#: after, on a single core of the machine that measured them.
+STEP_TIME_BUDGET_US = 20
+
+
+def play(num_steps=100000):
+    """Benchmarks :meth:`.FlappyBirdLogic.update_state` (see
+    :func:`.benchmarks.bench_game_logic`).
+    """
+    return benchmarks.bench_game_logic(num_steps, screen_size=(288, 512))
+
+
+def test_play():
+    result = play(num_steps=10000)
+    assert result["calls"] == 10000
+    assert result["p50_us"] < STEP_TIME_BUDGET_US
+
+
+def test_slots():
+    game = FlappyBirdLogic(np.random.default_rng(0), screen_size=(288, 512))
+    with pytest.raises(AttributeError):
+        game.pipes = []
+
+
+def test_pipe_views():
+    game = FlappyBirdLogic(np.random.default_rng(0), screen_size=(288, 512))
+    for _ in range(100):
+        game.update_state(FlappyBirdLogic.Actions.IDLE)
+        for up_pipe, low_pipe, x, up_y, low_y in zip(
+            game.upper_pipes,
+            game.lower_pipes,
+            game.pipes_x,
+            game.upper_pipes_y,
+            game.lower_pipes_y,
+        ):
+            assert up_pipe == {"x": x, "y": up_y}
+            assert low_pipe == {"x": x, "y": low_y}
+            assert low_y - (up_y + PIPE_HEIGHT) == 100
+
+
+if __name__ == "__main__":
+    play()
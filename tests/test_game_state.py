@@ -0,0 +1,120 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests that restoring a snapshot of a game's state reproduces the game."""
+
+import time
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium  # noqa: F401
+
+
+def policy(game):
+    # Flapping when the bird is below the gap of the next pipe:
+    next_pipe = min(
+        (i for i, x in enumerate(game.pipes_x) if x + 52 >= game.player_x),
+        key=game.pipes_x.__getitem__,
+    )
+    return int(game.player_y + 36 > game.lower_pipes_y[next_pipe])
+
+
+def rollout(env, num_steps):
+    results = []
+    for _ in range(num_steps):
+        obs, reward, terminated, _, info = env.step(policy(env.unwrapped._game))
+        results.append((np.copy(obs), reward, terminated, info["score"]))
+        if terminated:
+            break
+    return results
+
+
+def check_branches(env, num_steps=300):
+    env.reset(seed=7)
+    rollout(env, 50)
+
+    state = env.unwrapped.get_state()
+    results = rollout(env, num_steps)
+    env.unwrapped.set_state(state)
+    assert env.unwrapped.get_state() == state
+
+    for expected, result in zip(results, rollout(env, num_steps)):
+        np.testing.assert_array_equal(expected[0], result[0])
+        assert expected[1:] == result[1:]
+
+
+def play(num_branches=1000, depth=30):
+    env = gymnasium.make("FlappyBird-v0", audio_on=False)
+    env.reset(seed=0)
+    game = env.unwrapped._game
+    state = env.unwrapped.get_state()
+
+    start = time.perf_counter()
+    for _ in range(num_branches):
+        env.unwrapped.set_state(state)
+        for _ in range(depth):
+            if env.step(policy(game))[2]:
+                break
+    elapsed = time.perf_counter() - start
+    print(f"{num_branches / elapsed:.0f} branches/s ({depth} steps each)")
+    env.close()
+
+
+def test_simple_env():
+    env = gymnasium.make("FlappyBird-v0", audio_on=False)
+    check_branches(env)
+    env.close()
+
+
+def test_rgb_env():
+    env = gymnasium.make(
+        "FlappyBird-rgb-v0",
+        audio_on=False,
+        render_backend="numpy",
+        obs_size=(84, 84),
+        grayscale_obs=True,
+        frame_stack=2,
+    )
+    check_branches(env, num_steps=100)
+    env.close()
+
+
+def test_restore_in_new_env():
+    envs = [gymnasium.make("FlappyBird-v0", audio_on=False) for _ in range(2)]
+    envs[0].reset(seed=3)
+    envs[1].reset(seed=4)
+    rollout(envs[0], 20)
+
+    envs[1].unwrapped.set_state(envs[0].unwrapped.get_state())
+    for expected, result in zip(rollout(envs[0], 200), rollout(envs[1], 200)):
+        np.testing.assert_array_equal(expected[0], result[0])
+        assert expected[1:] == result[1:]
+
+    for env in envs:
+        env.close()
+
+
+if __name__ == "__main__":
+    play()
@@ -0,0 +1,121 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the hitmasks used by the pixel-perfect collision detection."""
+
+import numpy as np
+import pygame
+
+from flappy_bird_gymnasium.envs import rasterizer, utils
+from flappy_bird_gymnasium.envs.game_logic import (
+    PIPE_HEIGHT,
+    PLAYER_ROT_THR,
+    FlappyBirdLogic,
+)
+from flappy_bird_gymnasium.envs.hitmasks import (
+    PLAYER_MIN_ROT,
+    PLAYER_ROTATIONS,
+    Hitmasks,
+    get_hitmasks,
+    masks_overlap,
+)
+
+
+def play():
+    hitmasks = get_hitmasks()
+    images = utils.get_images()
+
+    # The hitmasks match the opaque pixels of the drawn sprites:
+    for idx, image in enumerate(images["player"]):
+        for rot in (20, 0, -45, -90):
+            sprite = rasterizer.decode_sprite(pygame.transform.rotate(image, rot))
+            np.testing.assert_array_equal(
+                hitmasks.player(idx, rot), sprite.alpha[..., 0] > 0
+            )
+    for image, mask in zip(images["pipe"], hitmasks.pipe):
+        sprite = rasterizer.decode_sprite(image)
+        np.testing.assert_array_equal(mask, sprite.alpha[..., 0] > 0)
+
+    return hitmasks
+
+
+def test_hitmasks():
+    hitmasks = play()
+    assert hitmasks is get_hitmasks()
+    assert hitmasks.player_sizes().shape == (3, 111, 2)
+    assert tuple(hitmasks.player_sizes()[0, 90]) == hitmasks.player(0, 0).shape
+
+
+def test_reachable_rotations():
+    hitmasks = Hitmasks()
+    sizes = hitmasks.player_sizes()
+
+    # only the rotations the player can have are masked
+    assert len(PLAYER_ROTATIONS) == 38
+    assert len(hitmasks._player) == 3 * len(PLAYER_ROTATIONS)
+
+    # the other rotations get sizes that bound their hitmasks
+    for idx in range(3):
+        for rot in range(PLAYER_MIN_ROT, PLAYER_ROT_THR + 1):
+            shape = hitmasks.player(idx, rot).shape
+            size = sizes[idx, rot - PLAYER_MIN_ROT]
+            if rot in PLAYER_ROTATIONS:
+                assert tuple(size) == shape
+            else:
+                assert np.all(size >= shape)
+
+
+def test_masks_overlap():
+    mask = np.zeros((4, 4), dtype=bool)
+    mask[1:3, 1:3] = True
+    assert masks_overlap(mask, (0, 0), mask, (1, 1))
+    assert not masks_overlap(mask, (0, 0), mask, (2, 2))
+    assert not masks_overlap(mask, (0, 0), mask, (4, 0))
+
+    rect1, rect2 = pygame.Rect(0, 0, 4, 4), pygame.Rect(-1, 1, 4, 4)
+    assert utils.pixel_collision(rect1, rect2, mask, mask)
+
+
+def test_transparent_corner():
+    games = [
+        FlappyBirdLogic(np.random.default_rng(0), (288, 512), hitmasks=hitmasks)
+        for hitmasks in (None, get_hitmasks())
+    ]
+    for game in games:
+        game.player_y, game.player_rot, game.player_idx = 200, 0, 0
+        # the lower pipe's top-left pixel covers the bird's bottom-right pixel
+        game.pipes_x[0] = game.player_x + 33
+        game.lower_pipes_y[0] = game.player_y + 23
+        game.upper_pipes_y[0] = -PIPE_HEIGHT
+
+    assert games[0].check_crash()
+    assert not games[1].check_crash()
+
+    games[1].pipes_x[0] = games[1].player_x + 20
+    games[1].lower_pipes_y[0] = games[1].player_y + 12
+    assert games[1].check_crash()
+
+
+if __name__ == "__main__":
+    play()
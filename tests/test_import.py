@@ -0,0 +1,92 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests that importing the package is fast and doesn't load the environments."""
+
+import subprocess
+import sys
+
+#: Maximum time, in milliseconds, spent importing the package's own modules
+#: (its dependencies, like gymnasium, aren't counted).
+IMPORT_TIME_BUDGET_MS = 50
+
+
+def measure_import(statement):
+    """Runs an import in a new interpreter and returns the loaded modules and
+    the time, in milliseconds, spent importing each of them.
+    """
+    code = f"{statement}; import sys; print(' '.join(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    self_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.split(":", 1)[1].split("|")
+        self_times[name.strip()] = int(self_us) / 1000
+    return set(result.stdout.split()), self_times
+
+
+def play():
+    modules, self_times = measure_import("import flappy_bird_gymnasium")
+    package_time = sum(
+        t for name, t in self_times.items() if name.startswith("flappy_bird_gymnasium")
+    )
+    print(f"Package import time: {package_time:.2f} ms")
+    print(f"Total import time: {sum(self_times.values()):.2f} ms")
+    return modules, package_time
+
+
+def test_lazy_import():
+    modules, package_time = play()
+    assert "pygame" not in modules
+    assert not any(name.startswith("flappy_bird_gymnasium.envs.") for name in modules)
+    assert package_time < IMPORT_TIME_BUDGET_MS
+
+
+def test_cli_import():
+    modules, _ = measure_import("import flappy_bird_gymnasium.cli")
+    assert "pygame" not in modules
+    assert "flappy_bird_gymnasium.dqn" not in modules
+    assert not any(name == "tests" or name.startswith("tests.") for name in modules)
+
+
+def test_simple_env_without_pygame():
+    # makes importing pygame fail
+    code = (
+        "import sys; sys.modules['pygame'] = None; "
+        "import gymnasium, flappy_bird_gymnasium; "
+        "env = gymnasium.make('FlappyBird-v0'); env.reset(seed=0); "
+        "[env.step(env.action_space.sample()) for _ in range(100)]; env.close()"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+if __name__ == "__main__":
+    play()
@@ -0,0 +1,114 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the ray-cast (LIDAR) observations against ray marching."""
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium  # noqa: F401
+from flappy_bird_gymnasium.envs.game_logic import (
+    PIPE_HEIGHT,
+    PIPE_WIDTH,
+    PLAYER_HEIGHT,
+    PLAYER_WIDTH,
+    FlappyBirdLogic,
+)
+from flappy_bird_gymnasium.envs.lidar import Lidar
+
+
+def march(game, lidar, fov=180, step=0.01):
+    # Moves along each ray, in small steps, until it's inside an obstacle:
+    center_x = game.player_x + PLAYER_WIDTH / 2
+    center_y = game.player_y + PLAYER_HEIGHT / 2
+    rects = [
+        (x, y, x + PIPE_WIDTH, y + PIPE_HEIGHT)
+        for x, upper_y, lower_y in zip(
+            game.pipes_x, game.upper_pipes_y, game.lower_pipes_y
+        )
+        for y in (upper_y, lower_y)
+    ]
+    distances = np.full(lidar.num_rays, float(lidar.max_distance))
+    ts = np.arange(0, lidar.max_distance, step)
+    angles = np.radians(np.linspace(-fov / 2, fov / 2, lidar.num_rays))
+    for i, angle in enumerate(angles):
+        xs = center_x + ts * np.cos(angle)
+        ys = center_y + ts * np.sin(angle)
+        hits = (ys <= 0) | (ys >= game.base_y)
+        for left, top, right, bottom in rects:
+            hits |= (xs >= left) & (xs <= right) & (ys >= top) & (ys <= bottom)
+        if hits.any():
+            distances[i] = ts[hits.argmax()]
+    return distances
+
+
+def play(num_rays=36):
+    env = gymnasium.make("FlappyBird-v0", use_lidar=True, lidar_rays=num_rays)
+    obs, _ = env.reset(seed=42)
+    while True:
+        print(np.array2string(obs, precision=2, max_line_width=120))
+        obs, _, terminated, _, _ = env.step(int(obs[-1] < 0.35))
+        if terminated:
+            break
+    env.close()
+
+
+def test_scan():
+    for num_rays, fov in ((45, 180), (31, 120)):
+        game = FlappyBirdLogic(np.random.default_rng(0), screen_size=(288, 512))
+        lidar = Lidar(num_rays=num_rays, max_distance=288, fov=fov)
+        for i in range(150):
+            if i % 15 == 0:
+                distances = lidar.scan(game)
+                np.testing.assert_allclose(
+                    distances, march(game, lidar, fov), rtol=0, atol=0.02
+                )
+            if not game.update_state(int(game.player_y > 250))[1]:
+                break
+
+
+def test_env():
+    env = gymnasium.make(
+        "FlappyBird-v0",
+        use_lidar=True,
+        lidar_rays=90,
+        obs_dtype=np.float32,
+        preallocate_obs=True,
+    )
+    assert env.observation_space.shape == (90,)
+    obs, _ = env.reset(seed=1)
+    buffer = obs
+    for _ in range(30):
+        assert obs is buffer
+        assert obs.dtype == np.float32
+        assert env.observation_space.contains(obs)
+        np.testing.assert_allclose(
+            obs * 288, env.unwrapped._lidar.scan(env.unwrapped._game), rtol=1e-6
+        )
+        obs, _, _, _, _ = env.step(0)
+    env.close()
+
+
+if __name__ == "__main__":
+    play()
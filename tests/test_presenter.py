@@ -0,0 +1,158 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the presentation of the frames of the human render mode from a
+separate thread.
+"""
+
+import time
+
+import gymnasium
+import numpy as np
+import pygame
+import pytest
+
+import flappy_bird_gymnasium  # noqa: F401
+from flappy_bird_gymnasium.envs.presenter import DisplayPresenter
+
+
+def play():
+    env = gymnasium.make(
+        "FlappyBird-rgb-v0",
+        render_mode="human",
+        render_backend="numpy",
+        async_display=True,
+    )
+    env.reset(seed=42)
+    while True:
+        env.render()
+        _, _, terminated, _, _ = env.step(env.action_space.sample())
+        if terminated:
+            break
+
+    print(env.unwrapped.get_display_stats())
+    env.close()
+
+
+def test_submit_drops_stale_frames(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+
+    class Sound:
+        plays = 0
+
+        def play(self):
+            Sound.plays += 1
+
+    presenter = DisplayPresenter((64, 32), sounds={"point": Sound()})
+    frames = np.zeros((100, 64, 32, 3), dtype=np.uint8)
+    frames[:] = np.arange(100, dtype=np.uint8)[:, None, None, None]
+
+    for frame in frames:
+        presenter.submit(frame, sound="point")
+        frame[:] = 255  # the frames are copied
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        stats = presenter.stats()
+        if stats["presented"] + stats["dropped"] == stats["submitted"]:
+            break
+        time.sleep(0.01)
+    presenter.close()
+
+    stats = presenter.stats()
+    assert stats["submitted"] == 100
+    assert stats["presented"] + stats["dropped"] == 100
+    assert stats["presented"] >= 1
+    # the last frame is always shown
+    assert np.all(presenter._front == 99)
+    # the sounds are dropped with their frames
+    assert Sound.plays == stats["presented"]
+    pygame.quit()
+
+
+def test_display_error(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+
+    def blit_array(surface, array):
+        raise pygame.error("blit failed")
+
+    monkeypatch.setattr(pygame.surfarray, "blit_array", blit_array)
+    presenter = DisplayPresenter((64, 32))
+    presenter.submit(np.zeros((64, 32, 3), dtype=np.uint8))
+    presenter._thread.join(timeout=5)
+
+    # the thread's exception is raised instead of being lost
+    with pytest.raises(RuntimeError) as info:
+        presenter.submit(np.zeros((64, 32, 3), dtype=np.uint8))
+    assert isinstance(info.value.__cause__, pygame.error)
+    with pytest.raises(RuntimeError):
+        presenter.close()
+    pygame.quit()
+
+    # the environments still quit pygame
+    env = gymnasium.make(
+        "FlappyBird-v0", render_mode="human", async_display=True, audio_on=False
+    )
+    env.reset(seed=42)
+    env.render()
+    env.unwrapped.renderer.display._thread.join(timeout=5)
+    with pytest.raises(RuntimeError):
+        env.close()
+    assert not pygame.get_init()
+
+
+def test_async_display(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    for env_id in ("FlappyBird-v0", "FlappyBird-rgb-v0"):
+        for render_backend in ("pygame", "numpy"):
+            env = gymnasium.make(
+                env_id,
+                render_mode="human",
+                render_backend=render_backend,
+                async_display=True,
+                audio_on=False,
+            )
+            env.reset(seed=42)
+            for _ in range(20):
+                env.render()
+                env.step(0)
+
+            display = env.unwrapped.renderer.display
+            assert isinstance(display, DisplayPresenter)
+            stats = env.unwrapped.get_display_stats()
+            assert stats["submitted"] == 20
+            assert stats["presented"] + stats["dropped"] <= 20
+
+            env.close()
+            assert not display._thread.is_alive()
+
+    env = gymnasium.make("FlappyBird-v0", render_mode="human", audio_on=False)
+    assert env.unwrapped.get_display_stats() == {}
+    env.close()
+
+
+if __name__ == "__main__":
+    play()
@@ -0,0 +1,107 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the profiling of the phases of the environments' steps."""
+
+import gymnasium
+
+import flappy_bird_gymnasium  # noqa: F401
+from flappy_bird_gymnasium.envs.game_logic import FlappyBirdLogic
+
+
+def play_episode(env, seed=0):
+    env.reset(seed=seed)
+    num_steps = 0
+    while True:
+        _, _, terminated, _, info = env.step(num_steps % 18 == 0)
+        num_steps += 1
+        if terminated:
+            return num_steps, info
+
+
+def play():
+    env = gymnasium.make("FlappyBird-rgb-v0", render_backend="numpy", profile=True)
+    num_steps, info = play_episode(env)
+    print(f"{num_steps} steps:")
+    for phase, stats in info["profile"].items():
+        print(
+            f"  {phase:>22}: {stats['calls']:6d} calls, "
+            f"{stats['total_ms']:8.2f} ms, {stats['mean_us']:8.2f} us/call"
+        )
+    env.close()
+
+
+def test_simple_env_profile():
+    env = gymnasium.make("FlappyBird-v0", profile=True)
+    num_steps, info = play_episode(env)
+
+    profile = info["profile"]
+    assert profile == env.unwrapped.get_profile()
+    assert profile["logic.update_state"]["calls"] == num_steps
+    assert profile["logic.check_crash"]["calls"] == num_steps
+    # (one of the observations is the reset's one)
+    assert profile["get_observation"]["calls"] == num_steps + 1
+    assert all(stats["total_ms"] > 0 for stats in profile.values())
+    assert (
+        profile["logic.update_state"]["total_ms"]
+        >= profile["logic.check_crash"]["total_ms"]
+    )
+
+    # the measurements are restarted in each episode:
+    env.reset(seed=1)
+    assert env.unwrapped.get_profile()["logic.update_state"]["calls"] == 0
+    assert env.unwrapped.get_profile()["get_observation"]["calls"] == 1
+    env.step(0)
+    assert env.unwrapped.get_profile()["logic.update_state"]["calls"] == 1
+    env.close()
+
+
+def test_rgb_env_profile():
+    for render_backend in ("pygame", "numpy"):
+        env = gymnasium.make(
+            "FlappyBird-rgb-v0", render_backend=render_backend, profile=True
+        )
+        num_steps, info = play_episode(env)
+        profile = info["profile"]
+        assert profile["logic.update_state"]["calls"] == num_steps
+        assert profile["get_observation"]["calls"] == num_steps + 1
+        assert profile["renderer.draw_surface"]["calls"] == num_steps + 1
+        assert profile["renderer.get_frame"]["calls"] == num_steps + 1
+        assert profile["renderer.update_display"]["calls"] == 0
+        env.close()
+
+
+def test_profile_disabled():
+    for env_id in ("FlappyBird-v0", "FlappyBird-rgb-v0"):
+        env = gymnasium.make(env_id)
+        _, info = play_episode(env)
+        assert "profile" not in info
+        assert env.unwrapped.get_profile() == {}
+        assert type(env.unwrapped._game) is FlappyBirdLogic
+        assert "_get_observation" not in vars(env.unwrapped)
+        env.close()
+
+
+if __name__ == "__main__":
+    play()
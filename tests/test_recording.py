@@ -0,0 +1,165 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the recording and replaying of episodes."""
+
+import os
+import time
+
+import gymnasium
+import numpy as np
+import pytest
+
+import flappy_bird_gymnasium  # noqa: F401
+from flappy_bird_gymnasium.envs.courses import generate_courses, save_courses
+from flappy_bird_gymnasium.envs.recording import (
+    EpisodeRecorder,
+    EpisodeReplayer,
+    ReplayDivergenceError,
+    load_episode,
+)
+
+
+def policy(game, noise):
+    # Flapping when the bird is below the gap of the next pipe:
+    next_pipe = min(
+        (i for i, x in enumerate(game.pipes_x) if x + 52 >= game.player_x),
+        key=game.pipes_x.__getitem__,
+    )
+    return int(
+        game.player_y + 32 + noise.integers(-10, 10) > game.lower_pipes_y[next_pipe]
+    )
+
+
+def record_episodes(directory, num_episodes=3, seed=42, **kwargs):
+    env = EpisodeRecorder(gymnasium.make("FlappyBird-v0", **kwargs), directory)
+    noise = np.random.default_rng(seed)
+    scores = []
+    for i in range(num_episodes):
+        env.reset(seed=seed if i == 0 else None)
+        terminated = False
+        while not terminated:
+            action = policy(env.unwrapped._game, noise)
+            _, _, terminated, _, info = env.step(action)
+        scores.append(info["score"])
+    env.close()
+    return scores
+
+
+def play(directory="episodes"):
+    scores = record_episodes(directory, num_episodes=10, audio_on=False)
+    for i, score in enumerate(scores):
+        record = load_episode(os.path.join(directory, f"episode-{i}.fbep"))
+        size = len(record.to_bytes())
+
+        start = time.perf_counter()
+        assert EpisodeReplayer(record).verify() == score
+        elapsed = time.perf_counter() - start
+        print(
+            f"Episode {i}: {len(record.actions)} steps, score {score}, "
+            f"{size} bytes, replayed in {elapsed * 1000:.1f} ms"
+        )
+
+
+def test_replay(tmp_path):
+    scores = record_episodes(tmp_path, audio_on=False, precise_collision=True)
+    for i, score in enumerate(scores):
+        record = load_episode(tmp_path / f"episode-{i}.fbep")
+        assert record.env_id == "FlappyBird-v0"
+        assert record.env_kwargs["precise_collision"]
+        assert record.env_kwargs["background"] == "day"
+        assert record.terminated
+        assert len(record.score_steps) == score
+        assert EpisodeReplayer(record).verify() == score
+
+    # the seeds of the episodes depend on the first one
+    assert record_episodes(tmp_path, audio_on=False, precise_collision=True) == scores
+
+
+def test_divergence(tmp_path):
+    record_episodes(tmp_path, num_episodes=1, audio_on=False)
+    record = load_episode(tmp_path / "episode-0.fbep")
+
+    actions = record.actions.copy()
+    actions[-20:] = 0  # falls to the ground earlier
+    with pytest.raises(ReplayDivergenceError):
+        EpisodeReplayer(record._replace(actions=actions)).verify()
+
+    score_steps = record.score_steps + 1
+    with pytest.raises(ReplayDivergenceError):
+        EpisodeReplayer(record._replace(score_steps=score_steps)).verify()
+
+
+def test_courses(tmp_path):
+    course_file = str(tmp_path / "courses.npy")
+    save_courses(course_file, generate_courses(5, seed=100))
+    scores = record_episodes(
+        tmp_path, num_episodes=3, audio_on=False, course_file=course_file
+    )
+    for i, score in enumerate(scores):
+        record = load_episode(tmp_path / f"episode-{i}.fbep")
+        assert record.course == i
+        assert record.env_kwargs["course_file"] == course_file
+        assert EpisodeReplayer(record).verify() == score
+
+        # the random pipes of the seed aren't the course's
+        with pytest.raises(ReplayDivergenceError):
+            EpisodeReplayer(record._replace(course=None)).verify()
+
+
+def test_invalid_seed(tmp_path):
+    env = EpisodeRecorder(gymnasium.make("FlappyBird-v0"), tmp_path)
+    for seed in (-1, 2**64):
+        with pytest.raises(ValueError):
+            env.reset(seed=seed)
+    env.close()
+
+
+def test_frames(tmp_path):
+    env = gymnasium.make(
+        "FlappyBird-rgb-v0",
+        audio_on=False,
+        render_mode="rgb_array",
+        render_backend="numpy",
+    )
+    env = EpisodeRecorder(env, tmp_path)
+    env.reset(seed=5)
+    frames = [env.render()]
+    for action in [0, 1, 0, 0, 0, 1, 0, 0] * 5:
+        env.step(action)
+        frames.append(env.render())
+    env.close()
+
+    record = env.last_record
+    # (the default background of FlappyBird-rgb-v0 is None)
+    assert record.env_kwargs["background"] is None
+    assert tuple(record.env_kwargs["screen_size"]) == (288, 512)
+    assert not record.terminated
+    replayed = EpisodeReplayer(record).frames(layout="WHC")
+    for frame, replayed_frame in zip(frames, replayed, strict=True):
+        np.testing.assert_array_equal(frame, replayed_frame)
+
+
+if __name__ == "__main__":
+    play()
@@ -0,0 +1,194 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests that the NumPy render backend draws the same pixels as the pygame one."""
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium
+from flappy_bird_gymnasium.envs.renderer import FlappyBirdRenderer
+
+
+def play(background="day", color=None, steps=200):
+    envs = [
+        gymnasium.make(
+            "FlappyBird-rgb-v0",
+            audio_on=False,
+            background=background,
+            render_mode="rgb_array",
+            render_backend=backend,
+        )
+        for backend in ("pygame", "numpy")
+    ]
+    for env in envs:
+        env.unwrapped.renderer.set_color(color)
+
+    observations = [env.reset(seed=42)[0] for env in envs]
+    np.testing.assert_array_equal(observations[0], observations[1])
+
+    game = envs[0].unwrapped._game
+    for _ in range(steps):
+        # Flapping when the bird is below the gap of the next pipe:
+        next_pipe = min(
+            (p for p in game.lower_pipes if p["x"] + 52 >= game.player_x),
+            key=lambda p: p["x"],
+        )
+        action = int(game.player_y + 36 > next_pipe["y"])
+        results = [env.step(action) for env in envs]
+        np.testing.assert_array_equal(results[0][0], results[1][0])
+
+        frames = [env.render() for env in envs]
+        np.testing.assert_array_equal(frames[0], frames[1])
+
+        if results[0][2]:
+            break
+
+    for env in envs:
+        env.close()
+
+    return game.score
+
+
+def check_frame_buffers(backend):
+    reference = gymnasium.make(
+        "FlappyBird-rgb-v0", audio_on=False, render_backend=backend
+    )
+
+    for layout, to_whc in (
+        ("WHC", lambda obs: obs),
+        ("HWC", lambda obs: obs.transpose(1, 0, 2)),
+        ("CHW", lambda obs: obs.transpose(2, 1, 0)),
+    ):
+        env = gymnasium.make(
+            "FlappyBird-rgb-v0",
+            audio_on=False,
+            render_backend=backend,
+            obs_layout=layout,
+            preallocate_obs=True,
+        )
+        expected, _ = reference.reset(seed=42)
+        obs, _ = env.reset(seed=42)
+        assert env.observation_space.contains(obs)
+        assert obs.dtype == env.observation_space.dtype
+        np.testing.assert_array_equal(to_whc(obs), expected)
+
+        next_obs, _, _, _, _ = env.step(0)
+        assert next_obs is obs
+        np.testing.assert_array_equal(to_whc(next_obs), reference.step(0)[0])
+        env.close()
+
+    reference.close()
+
+
+def check_low_resolution_obs(obs_size, grayscale_obs):
+    envs = [
+        gymnasium.make(
+            "FlappyBird-rgb-v0",
+            audio_on=False,
+            background="day",
+            render_backend=backend,
+            obs_size=obs_size,
+            grayscale_obs=grayscale_obs,
+        )
+        for backend in ("pygame", "numpy")
+    ]
+    shape = (*obs_size, 1 if grayscale_obs else 3)
+
+    observations = [env.reset(seed=42)[0] for env in envs]
+    for _ in range(50):
+        assert observations[0].shape == observations[1].shape == shape
+        np.testing.assert_array_equal(observations[0], observations[1])
+        observations = [env.step(0)[0] for env in envs]
+
+    for env in envs:
+        env.close()
+
+
+def check_incremental_render(backend):
+    envs = [
+        gymnasium.make(
+            "FlappyBird-rgb-v0",
+            audio_on=False,
+            render_mode="rgb_array",
+            render_backend=backend,
+            incremental_render=incremental,
+        )
+        for incremental in (False, True)
+    ]
+
+    for seed in (1, 2):
+        observations = [env.reset(seed=seed)[0] for env in envs]
+        for step in range(100):
+            np.testing.assert_array_equal(observations[0], observations[1])
+            if step % 3 == 0:
+                frames = [env.render() for env in envs]
+                np.testing.assert_array_equal(frames[0], frames[1])
+
+            results = [env.step(int(step % 8 == 0)) for env in envs]
+            observations = [r[0] for r in results]
+            if results[0][2]:
+                break
+
+    for env in envs:
+        env.close()
+
+
+def test_play():
+    assert play(background="day") > 0
+    assert play(background=None, color=(255, 0, 0)) > 0
+
+
+def test_frame_buffers():
+    check_frame_buffers("pygame")
+    check_frame_buffers("numpy")
+
+
+def test_low_resolution_obs():
+    check_low_resolution_obs((84, 84), grayscale_obs=True)
+    check_low_resolution_obs((144, 256), grayscale_obs=False)
+
+
+def test_incremental_render():
+    check_incremental_render("pygame")
+    check_incremental_render("numpy")
+
+
+def test_shared_sprites():
+    renderers = [
+        FlappyBirdRenderer(audio_on=False, render_backend=backend)
+        for backend in ("pygame", "numpy", "numpy")
+    ]
+    assert renderers[0].images is not renderers[1].images
+    for name in ("background", "base", "pipe", "player", "numbers"):
+        assert renderers[0].images[name] is renderers[1].images[name]
+    assert renderers[1]._sprites is renderers[2]._sprites
+
+    other = FlappyBirdRenderer(audio_on=False, bird_color="red", grayscale=True)
+    assert other.images["player"] is not renderers[0].images["player"]
+    assert other.images["base"] is not renderers[0].images["base"]
+
+
+if __name__ == "__main__":
+    play()
@@ -0,0 +1,94 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the frame stacking of the RGB-observations version of the Flappy Bird
+environment against stacks of single frames.
+"""
+
+from collections import deque
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium
+
+
+def play(frame_stack=4, steps=100, **kwargs):
+    env = gymnasium.make(
+        "FlappyBird-rgb-v0",
+        audio_on=False,
+        render_backend="numpy",
+        frame_stack=frame_stack,
+        **kwargs,
+    )
+    reference = gymnasium.make(
+        "FlappyBird-rgb-v0", audio_on=False, render_backend="numpy", **kwargs
+    )
+    assert env.observation_space.shape == (
+        frame_stack,
+        *reference.observation_space.shape,
+    )
+
+    for seed in (0, 1):
+        obs, _ = env.reset(seed=seed)
+        frame, _ = reference.reset(seed=seed)
+        frames = deque([frame.copy()] * frame_stack, maxlen=frame_stack)
+        np.testing.assert_array_equal(obs, np.stack(frames))
+
+        for step in range(steps):
+            action = int(step % 9 == 0)
+            obs, _, done, _, _ = env.step(action)
+            frame, _, _, _, _ = reference.step(action)
+            frames.append(frame.copy())
+            assert env.observation_space.contains(obs)
+            assert obs.dtype == env.observation_space.dtype
+            np.testing.assert_array_equal(obs, np.stack(frames))
+            if done:
+                break
+
+    env.close()
+    reference.close()
+
+
+def test_frame_stack():
+    play(frame_stack=4)
+    play(frame_stack=3, obs_size=(84, 84), grayscale_obs=True, obs_layout="CHW")
+
+
+def test_frame_stack_buffer():
+    env = gymnasium.make(
+        "FlappyBird-rgb-v0", audio_on=False, frame_stack=2, preallocate_obs=True
+    )
+    obs, _ = env.reset(seed=0)
+    np.testing.assert_array_equal(obs[0], obs[1])
+
+    next_obs, _, _, _, _ = env.step(0)
+    assert next_obs is obs
+    env.close()
+
+    play(frame_stack=2, preallocate_obs=True)
+
+
+if __name__ == "__main__":
+    play()
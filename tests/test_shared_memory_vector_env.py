@@ -0,0 +1,113 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the shared-memory multiprocess vectorized version of the
+RGB-observations Flappy Bird environment against the non-vectorized one.
+"""
+
+import os
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium
+from flappy_bird_gymnasium import FlappyBirdSharedMemoryVectorEnv
+
+
+def play(num_envs=4, num_workers=2, steps=150, **kwargs):
+    envs = gymnasium.make_vec(
+        "FlappyBird-rgb-shared-v0",
+        num_envs=num_envs,
+        num_workers=num_workers,
+        **kwargs,
+    )
+    single_envs = [
+        gymnasium.make(
+            "FlappyBird-rgb-v0", audio_on=False, render_backend="numpy", **kwargs
+        )
+        for _ in range(num_envs)
+    ]
+    assert isinstance(envs.unwrapped, FlappyBirdSharedMemoryVectorEnv)
+    assert envs.observation_space.shape == (
+        num_envs,
+        *single_envs[0].observation_space.shape,
+    )
+
+    obs, info = envs.reset(seed=123)
+    for i, env in enumerate(single_envs):
+        single_obs, _ = env.reset(seed=123 + i)
+        np.testing.assert_array_equal(obs[i], single_obs)
+
+    rng = np.random.default_rng(123)
+    autoreset = np.zeros(num_envs, dtype=bool)
+    num_episodes = 0
+    for _ in range(steps):
+        actions = (rng.random(num_envs) < 0.1).astype(np.int64)
+        obs, rewards, terminated, truncated, info = envs.step(actions)
+        assert obs.shape == envs.observation_space.shape
+
+        for i, env in enumerate(single_envs):
+            if autoreset[i]:
+                single_obs, single_info = env.reset()
+                single_reward, single_done = 0, False
+            else:
+                single_obs, single_reward, single_done, _, single_info = env.step(
+                    actions[i]
+                )
+
+            np.testing.assert_array_equal(obs[i], single_obs)
+            assert rewards[i] == single_reward
+            assert terminated[i] == single_done
+            assert info["score"][i] == single_info["score"]
+
+        assert not truncated.any()
+        autoreset = terminated
+        num_episodes += terminated.sum()
+
+    envs.close()
+    for env in single_envs:
+        env.close()
+
+    return num_episodes
+
+
+def test_play():
+    assert play(obs_size=(72, 128)) > 0
+    assert play(num_envs=3, num_workers=3, obs_size=(36, 64), grayscale_obs=True) > 0
+
+
+def test_opt_in():
+    # FlappyBird-rgb-v0 itself is vectorized in the same process
+    envs = gymnasium.make_vec("FlappyBird-rgb-v0", num_envs=2, render_backend="numpy")
+    assert isinstance(envs, gymnasium.vector.SyncVectorEnv)
+    envs.close()
+
+    envs = gymnasium.make_vec("FlappyBird-rgb-shared-v0", num_envs=2)
+    assert envs.unwrapped.num_workers == min(2, os.cpu_count())
+    assert envs.single_observation_space.dtype == np.uint8
+    envs.close()
+
+
+if __name__ == "__main__":
+    play()
@@ -76,5 +76,29 @@ def test_play():
     play(audio_on=False, render=False)
 
 
+def test_float32_obs_buffer():
+    env = gymnasium.make("FlappyBird-v0", audio_on=False)
+    env32 = gymnasium.make(
+        "FlappyBird-v0", audio_on=False, obs_dtype=np.float32, preallocate_obs=True
+    )
+    assert env32.observation_space.dtype == np.float32
+
+    obs, _ = env.reset(seed=42)
+    obs32, _ = env32.reset(seed=42)
+    buffer = obs32
+    env.action_space.seed(42)
+    done = False
+    while not done:
+        np.testing.assert_array_equal(obs32, obs.astype(np.float32))
+        action = env.action_space.sample()
+        obs, _, done, _, _ = env.step(action)
+        obs32, _, done32, _, _ = env32.step(action)
+        assert obs32 is buffer
+        assert done32 == done
+
+    env.close()
+    env32.close()
+
+
 if __name__ == "__main__":
     play()
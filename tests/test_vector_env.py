@@ -0,0 +1,94 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+""" Tests the vectorized version of the simple-observations Flappy Bird
+environment against the non-vectorized one.
+"""
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium
+from flappy_bird_gymnasium import FlappyBirdVectorEnv
+
+
+def play(num_envs=8, steps=300, obs_dtype=np.float64):
+    envs = gymnasium.make_vec(
+        "FlappyBird-v0", num_envs=num_envs, audio_on=False, obs_dtype=obs_dtype
+    )
+    single_envs = [
+        gymnasium.make("FlappyBird-v0", audio_on=False, obs_dtype=obs_dtype)
+        for _ in range(num_envs)
+    ]
+    assert isinstance(envs.unwrapped, FlappyBirdVectorEnv)
+
+    obs, info = envs.reset(seed=123)
+    for i, env in enumerate(single_envs):
+        single_obs, _ = env.reset(seed=123 + i)
+        np.testing.assert_array_equal(obs[i], single_obs)
+
+    envs.action_space.seed(123)
+    autoreset = np.zeros(num_envs, dtype=bool)
+    num_episodes = 0
+    for _ in range(steps):
+        # Flapping when the bird is below the gap of the next pipe:
+        actions = (obs[:, 9] > obs[:, 5] - 0.08).astype(np.int64)
+        actions[envs.action_space.sample() == 1] = 0
+
+        obs, rewards, terminated, truncated, info = envs.step(actions)
+        assert obs.shape == (num_envs, 12)
+        assert obs.dtype == obs_dtype
+
+        for i, env in enumerate(single_envs):
+            if autoreset[i]:
+                single_obs, _ = env.reset()
+                single_reward, single_done = 0, False
+            else:
+                single_obs, single_reward, single_done, _, _ = env.step(actions[i])
+
+            np.testing.assert_array_equal(obs[i], single_obs)
+            assert rewards[i] == single_reward
+            assert terminated[i] == single_done
+
+        assert not truncated.any()
+        autoreset = terminated
+        num_episodes += terminated.sum()
+
+    envs.close()
+    for env in single_envs:
+        env.close()
+
+    return num_episodes
+
+
+def test_play():
+    assert play() > 0
+
+
+def test_play_float32():
+    assert play(obs_dtype=np.float32) > 0
+
+
+if __name__ == "__main__":
+    play()
@@ -0,0 +1,141 @@
+# MIT License
+#
+# Copyright (c) 2020 Gabriel Nogueira (Talendar)
+# Copyright (c) 2023 Martin Kubovcik
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""Tests the streaming of rendered frames to video files."""
+
+import gymnasium
+import numpy as np
+
+import flappy_bird_gymnasium  # noqa: F401
+from flappy_bird_gymnasium.envs.video import VideoWriter, load_raw_video
+
+
+def play():
+    env = gymnasium.make("FlappyBird-rgb-v0", render_mode="rgb_array")
+    recorder = env.unwrapped.renderer.start_recording("episode.y4m", stride=2)
+    env.reset(seed=42)
+    while True:
+        env.render()
+        _, _, terminated, _, _ = env.step(env.action_space.sample())
+        if terminated:
+            break
+
+    env.close()
+    print(f"{recorder.frames_written} frames written to episode.y4m")
+
+
+def _play_episode(env, steps=60):
+    env.reset(seed=42)
+    frames = []
+    for i in range(steps):
+        frames.append(env.render().copy())
+        env.step(i % 11 == 0)
+    return frames
+
+
+def test_raw_video(tmp_path):
+    for render_backend in ("pygame", "numpy"):
+        env = gymnasium.make(
+            "FlappyBird-rgb-v0", render_mode="rgb_array", render_backend=render_backend
+        )
+        path = str(tmp_path / f"{render_backend}.rgb")
+        env.unwrapped.renderer.start_recording(
+            path, container="raw", stride=3, buffer_size=2
+        )
+        frames = _play_episode(env)
+        env.close()
+
+        video = load_raw_video(path)
+        assert video.shape == (20, 512, 288, 3)
+        expected = np.stack(frames[::3]).transpose(0, 2, 1, 3)
+        np.testing.assert_array_equal(video, expected)
+
+
+def test_render_buffer(tmp_path):
+    env = gymnasium.make(
+        "FlappyBird-v0",
+        render_mode="rgb_array",
+        render_backend="numpy",
+        render_layout="HWC",
+        preallocate_render=True,
+    )
+    path = str(tmp_path / "episode.rgb")
+    env.unwrapped.renderer.start_recording(path, container="raw")
+    frames = _play_episode(env)
+    env.close()
+
+    np.testing.assert_array_equal(load_raw_video(path), np.stack(frames))
+
+
+def test_y4m(tmp_path):
+    frames = np.random.default_rng(42).integers(0, 256, (10, 32, 16, 3), dtype=np.uint8)
+    path = tmp_path / "video.y4m"
+    with VideoWriter(str(path), (32, 16), fps=30, buffer_size=3) as writer:
+        for frame in frames:
+            writer.submit(frame)
+    assert writer.frames_written == 10
+
+    data = path.read_bytes()
+    header, data = data.split(b"\n", 1)
+    assert header == b"YUV4MPEG2 W32 H16 F30:1 Ip A1:1 C444"
+    frame_size = len(b"FRAME\n") + 3 * 32 * 16
+    assert len(data) == 10 * frame_size
+
+    last = np.frombuffer(data[slice(-3 * 32 * 16, None)], dtype=np.uint8).reshape(
+        3, 16, 32
+    )
+    r, g, b = frames[-1].transpose(2, 1, 0).astype(np.float64)
+    np.testing.assert_allclose(
+        last[0], 16 + (65.481 * r + 128.553 * g + 24.966 * b) / 255, atol=1
+    )
+    np.testing.assert_allclose(
+        last[1], 128 + (-37.797 * r - 74.203 * g + 112.0 * b) / 255, atol=1
+    )
+    np.testing.assert_allclose(
+        last[2], 128 + (112.0 * r - 93.786 * g - 18.214 * b) / 255, atol=1
+    )
+
+
+def test_y4m_grayscale(tmp_path):
+    frames = np.random.default_rng(42).integers(0, 256, (3, 32, 16, 1), np.uint8)
+    frames[0] = 0
+    frames[1] = 255
+    path = tmp_path / "video.y4m"
+    with VideoWriter(str(path), (32, 16), channels=1) as writer:
+        for frame in frames:
+            writer.submit(frame)
+
+    header, data = path.read_bytes().split(b"\n", 1)
+    assert header.endswith(b" Cmono")
+    luma = np.frombuffer(data, dtype=np.uint8).reshape(3, -1)
+    luma = luma[:, slice(len(b"FRAME\n"), None)].reshape(3, 16, 32)
+
+    # the same (limited) range as the luma of the RGB frames
+    assert np.all(luma[0] == 16) and np.all(luma[1] == 235)
+    gray = frames[2, ..., 0].T.astype(np.float64)
+    np.testing.assert_allclose(luma[2], 16 + gray * 219 / 255, atol=1)
+
+
+if __name__ == "__main__":
+    play()